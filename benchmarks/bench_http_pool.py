@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled HTTP clients vs. a fresh client per request
+
+Pages through a synthetic bucket and fetches VPSA volumes against the local
+stand-in backend, once opening a new connection for every request (the old
+behaviour) and once reusing the pooled ZadaraClient connections. Reports
+the number of TCP handshakes seen by the server and p50/p99 latency.
+
+Usage: python benchmarks/bench_http_pool.py [--requests N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backends import FakeBackend  # noqa: E402
+from server import ZadaraClient  # noqa: E402
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of samples (milliseconds)"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index] * 1000
+
+
+async def run(backend: FakeBackend, requests: int, pooled: bool) -> dict:
+    """Issue alternating S3 listing and VPSA requests, timing each one"""
+    client = ZadaraClient()
+    client.vpsa_base_url = backend.url
+    client.vpsa_api_key = "bench"
+    client.object_storage_url = backend.url
+    client.object_access_key = "bench-access"
+    client.object_secret_key = "bench-secret"
+
+    backend.state.reset_counters()
+    latencies = []
+    try:
+        for i in range(requests):
+            started = time.perf_counter()
+            if i % 2:
+                # Drop cached responses so every VPSA GET reaches the backend
+                client.vpsa_cache.invalidate()
+                await client.vpsa_request("GET", "volumes.json")
+            else:
+                params = {"list-type": "2", "max-keys": "1000"}
+                await client.object_storage_request("GET", "/bench", params=params)
+            latencies.append(time.perf_counter() - started)
+            if not pooled:
+                # Equivalent to the previous `async with httpx.AsyncClient()` per request
+                await client.close()
+    finally:
+        await client.close()
+
+    # Every request must reach the server, and without pooling each one opens its own connection
+    assert backend.state.requests == requests, f"{backend.state.requests} of {requests} requests reached the backend"
+    if not pooled:
+        assert backend.state.connections == requests, (
+            f"{backend.state.connections} handshakes for {requests} requests without pooling"
+        )
+
+    return {
+        "mode": "pooled" if pooled else "per-request",
+        "requests": requests,
+        "handshakes": backend.state.connections,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0, help="Server-side latency per request")
+    args = parser.parse_args()
+
+    with FakeBackend(latency=args.latency) as backend:
+        backend.state.add_synthetic_bucket("bench", 100000)
+        results = [
+            await run(backend, args.requests, pooled=False),
+            await run(backend, args.requests, pooled=True),
+        ]
+
+    print(f"{'mode':<12} {'requests':>8} {'handshakes':>10} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for r in results:
+        print(
+            f"{r['mode']:<12} {r['requests']:>8} {r['handshakes']:>10} "
+            f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['mean_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
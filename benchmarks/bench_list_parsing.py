@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: ListObjectsV2 page parsing
+
+Compares the previous call_tool parse path (buffer the whole response, then
+ET.fromstring plus namespace/non-namespace findall passes) with the
+incremental ListObjectsParser fed in network-sized chunks. Reports time per
+page and peak memory (tracemalloc) while parsing one page.
+
+Usage: python benchmarks/bench_list_parsing.py [--keys N] [--pages N] [--chunk BYTES]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import ListObjectsParser  # noqa: E402
+
+S3_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+def build_page(keys: int) -> bytes:
+    """Build a ListObjectsV2 response with `keys` entries"""
+    items = "".join(
+        f"<Contents><Key>logs/2026/10/17/host-{i:06d}.log.gz</Key>"
+        f"<LastModified>2026-10-17T12:00:00.000Z</LastModified>"
+        f"<ETag>&quot;{i:032x}&quot;</ETag><Size>{i * 37}</Size>"
+        f"<StorageClass>STANDARD</StorageClass></Contents>"
+        for i in range(keys)
+    )
+    return (
+        f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        f"<ListBucketResult xmlns=\"{S3_NAMESPACE}\"><Name>bench</Name><Prefix></Prefix>"
+        f"<KeyCount>{keys}</KeyCount><MaxKeys>{keys}</MaxKeys><IsTruncated>true</IsTruncated>"
+        f"<NextContinuationToken>token</NextContinuationToken>{items}</ListBucketResult>"
+    ).encode()
+
+
+def parse_legacy(body: bytes):
+    """The parse path previously used by call_tool (response.text + ET.fromstring)"""
+    root = ET.fromstring(body.decode("utf-8"))
+    namespace = {'s3': S3_NAMESPACE}
+    contents = root.findall('.//s3:Contents', namespace)
+    if not contents:
+        contents = root.findall('.//Contents')
+    records = []
+    for content in contents:
+        key_elem = size_elem = modified_elem = etag_elem = None
+        for child in content:
+            tag = child.tag.split('}')[-1]
+            if tag == 'Key':
+                key_elem = child
+            elif tag == 'Size':
+                size_elem = child
+            elif tag == 'LastModified':
+                modified_elem = child
+            elif tag == 'ETag':
+                etag_elem = child
+        if key_elem is not None and key_elem.text:
+            records.append((
+                key_elem.text,
+                int(size_elem.text) if size_elem is not None and size_elem.text else 0,
+                modified_elem.text if modified_elem is not None else "",
+                etag_elem.text if etag_elem is not None else ""
+            ))
+    is_truncated = root.find('.//s3:IsTruncated', namespace)
+    if is_truncated is None:
+        is_truncated = root.find('.//IsTruncated')
+    next_token = root.find('.//s3:NextContinuationToken', namespace)
+    if next_token is None:
+        next_token = root.find('.//NextContinuationToken')
+    return records
+
+
+def parse_streaming(body: bytes, chunk_size: int):
+    """Feed the response to ListObjectsParser in chunks, as aiter_bytes() would"""
+    parser = ListObjectsParser()
+    records = []
+    for offset in range(0, len(body), chunk_size):
+        records.extend(parser.feed(body[offset:offset + chunk_size]))
+    records.extend(parser.close())
+    return records
+
+
+def sum_streaming(body: bytes, chunk_size: int):
+    """Aggregate sizes while streaming without keeping the records (the size calculator case)"""
+    parser = ListObjectsParser()
+    total = count = 0
+    for offset in range(0, len(body), chunk_size):
+        records = parser.feed(body[offset:offset + chunk_size])
+        total += sum(r.size for r in records)
+        count += len(records)
+    records = parser.close()
+    return [total + sum(r.size for r in records), count + len(records)]
+
+
+def measure(label: str, func, body: bytes, pages: int) -> None:
+    assert len(func(body)) > 0
+    started = time.perf_counter()
+    for _ in range(pages):
+        func(body)
+    elapsed = (time.perf_counter() - started) / pages
+
+    # Peak memory for a single page; the response body itself is excluded
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<26} {elapsed * 1000:>10.3f} {peak / 1024:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1000, help="Keys per page")
+    parser.add_argument("--pages", type=int, default=200, help="Pages parsed per measurement")
+    parser.add_argument("--chunk", type=int, default=16384, help="Streaming chunk size in bytes")
+    args = parser.parse_args()
+
+    body = build_page(args.keys)
+    print(f"Page: {args.keys} keys, {len(body) / 1024:.1f} KB")
+    print(f"{'parser':<26} {'ms/page':>10} {'peak KB':>12}")
+    measure("legacy (fromstring)", parse_legacy, body, args.pages)
+    measure("streaming (records)", lambda b: parse_streaming(b, args.chunk), body, args.pages)
+    measure("streaming (aggregate)", lambda b: sum_streaming(b, args.chunk), body, args.pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Load test: many overlapping tool calls to server.py over MCP stdio
+
+Starts the local stand-in VPSA/S3 backend and server.py as separate
+processes (so neither competes with the load generator for the GIL), connects to it over stdio with the MCP client, and keeps
+--concurrency tool calls in flight for --duration seconds, picking each
+call from a weighted mix of tools. Reports end-to-end latency per tool
+(p50/p95/p99/max), throughput and errors, and samples the server's event
+loop lag and RSS over time through its server_stats tool.
+
+Usage:
+    python benchmarks/bench_stdio_load.py [--concurrency N] [--duration S] [--latency S]
+        [--mix "vpsa_list_volumes=4,object_list_objects=3,object_read_range=2"]
+        [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from fake_backends import FakeBackend
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server.py")
+
+# Arguments used for each tool in the mix
+TOOL_ARGUMENTS = {
+    "vpsa_list_volumes": {},
+    "vpsa_list_pools": {},
+    "vpsa_get_volume": {"volume_id": "volume-001"},
+    "object_list_buckets": {},
+    "object_list_objects": {"bucket_name": "load", "max_keys": 1000},
+    "object_read_range": {"bucket_name": "load-data", "object_key": "blob.bin", "length": 1024 * 1024},
+    "object_download": {"bucket_name": "load-data", "object_key": "blob.bin"},
+    "object_get_bucket_sizes": {"bucket_names": ["load"]},
+    "server_stats": {},
+}
+
+DEFAULT_MIX = (
+    "vpsa_list_volumes=4,vpsa_list_pools=1,object_list_objects=3,"
+    "object_read_range=2,object_download=1,object_get_bucket_sizes=1"
+)
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of samples (milliseconds)"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index] * 1000
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in TOOL_ARGUMENTS:
+            raise SystemExit(f"No arguments defined for tool {name!r}; choose from {', '.join(TOOL_ARGUMENTS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def serve_backend(connection, args):
+    """Child process: run the stand-in backend and report its URL until told to stop"""
+    with FakeBackend(latency=args.latency) as backend:
+        backend.state.capacity = args.capacity
+        backend.state.add_synthetic_bucket("load", args.keys)
+        backend.state.add_bucket("load-data")
+        backend.state.buckets["load-data"].put("blob.bin", os.urandom(args.object_mb * 1024 * 1024))
+        connection.send(backend.url)
+        connection.recv()
+        connection.send({"requests": backend.state.requests, "throttled": backend.state.throttled})
+
+
+async def worker(session: ClientSession, weights: dict, deadline: float, latencies: dict, errors: dict):
+    names = list(weights)
+    cumulative = list(weights.values())
+    while time.perf_counter() < deadline:
+        name = random.choices(names, cumulative)[0]
+        started = time.perf_counter()
+        try:
+            result = await session.call_tool(name, TOOL_ARGUMENTS[name])
+            failed = result.isError or result.content[0].text.startswith("Error:")
+        except Exception:
+            failed = True
+        latencies.setdefault(name, []).append(time.perf_counter() - started)
+        if failed:
+            errors[name] = errors.get(name, 0) + 1
+
+
+async def sample_server(session: ClientSession, interval: float, started: float, samples: list, stop: asyncio.Event):
+    """Record event loop lag and RSS reported by server_stats every `interval` seconds"""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        result = await session.call_tool("server_stats", {"fields": ["event_loop", "process"], "output": "compact"})
+        stats = json.loads(result.content[0].text)
+        samples.append({
+            "t": round(time.perf_counter() - started, 1),
+            "rss_mb": (stats["process"]["rss_bytes"] or 0) / 1e6,
+            "lag_last_ms": stats["event_loop"]["lag_last_ms"],
+            "lag_max_ms": stats["event_loop"]["lag"]["max_ms"],
+        })
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32, help="Tool calls kept in flight")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted tools: name=weight,...")
+    parser.add_argument("--latency", type=float, default=0.005, help="Server-side latency per backend request")
+    parser.add_argument("--capacity", type=int, help="Backend requests in flight before it throttles (503 SlowDown)")
+    parser.add_argument("--keys", type=int, default=20000, help="Keys in the synthetic bucket")
+    parser.add_argument("--object-mb", type=int, default=4, help="Size of the object read by range/download calls")
+    parser.add_argument("--sample-interval", type=float, default=2.0, help="Seconds between server samples")
+    parser.add_argument("--output", metavar="PATH", help="Write latencies summary and samples as JSON")
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+
+    connection, child_connection = multiprocessing.Pipe()
+    backend = multiprocessing.Process(target=serve_backend, args=(child_connection, args), daemon=True)
+    backend.start()
+    try:
+        backend_url = connection.recv()
+        env = dict(
+            os.environ,
+            ZADARA_VPSA_URL=backend_url,
+            ZADARA_VPSA_API_KEY="load",
+            ZADARA_OBJECT_STORAGE_URL=backend_url,
+            ZADARA_OBJECT_ACCESS_KEY="load-access",
+            ZADARA_OBJECT_SECRET_KEY="load-secret",
+            ZADARA_LOOP_LAG_INTERVAL="0.1",
+        )
+        params = StdioServerParameters(command=sys.executable, args=[SERVER], env=env)
+        latencies, errors, samples = {}, {}, []
+        async with stdio_client(params, errlog=open(os.devnull, "w")) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                started = time.perf_counter()
+                stop = asyncio.Event()
+                sampler = asyncio.ensure_future(sample_server(session, args.sample_interval, started, samples, stop))
+                deadline = started + args.duration
+                await asyncio.gather(*(
+                    worker(session, weights, deadline, latencies, errors) for _ in range(args.concurrency)
+                ))
+                elapsed = time.perf_counter() - started
+                stop.set()
+                await sampler
+        connection.send("stop")
+        backend_counters = connection.recv()
+    finally:
+        backend.join(timeout=5)
+        if backend.is_alive():
+            backend.terminate()
+
+    total = sum(len(samples_) for samples_ in latencies.values())
+    print(f"{total} calls in {elapsed:.1f}s at concurrency {args.concurrency}: {total / elapsed:.1f} calls/s")
+    print(f"backend: {backend_counters['requests']} requests, {backend_counters['throttled']} throttled")
+    print()
+    print(f"{'tool':<26} {'calls':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    summary = {}
+    for name, values in sorted(latencies.items()):
+        summary[name] = {
+            "calls": len(values),
+            "errors": errors.get(name, 0),
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "max_ms": max(values) * 1000,
+        }
+        s = summary[name]
+        print(
+            f"{name:<26} {s['calls']:>6} {s['errors']:>6} {s['p50_ms']:>9.1f} "
+            f"{s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}"
+        )
+
+    print()
+    print(f"{'t s':>6} {'rss MB':>8} {'loop lag ms':>12} {'max lag ms':>11}")
+    for sample in samples:
+        print(f"{sample['t']:>6} {sample['rss_mb']:>8.1f} {sample['lag_last_ms']:>12.2f} {sample['lag_max_ms']:>11.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "parameters": vars(args),
+                "elapsed_seconds": elapsed,
+                "backend": backend_counters,
+                "tools": summary,
+                "samples": samples,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: tool handlers end to end against the local stand-in backends
+
+Runs the call_tool handlers (and with them ZadaraClient) against the
+stand-in VPSA/S3 server for the common workloads: object listing, filtered
+listing, bucket sizing, top-N, upload, download and VPSA reads. Reports
+throughput and p50/p99 latency per scenario. Results can be saved as a
+baseline and later runs compared against it, failing when throughput drops
+or p99 grows by more than the tolerance - so regressions are caught
+offline, without a cluster.
+
+Usage:
+    python benchmarks/bench_suite.py [--scenarios list,filter,sizing,...] [--keys N] [--latency S]
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json [--tolerance 0.25]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+from fake_backends import FakeBackend  # noqa: E402
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of samples (milliseconds)"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index] * 1000
+
+
+async def call(name: str, arguments: dict) -> str:
+    """Call a tool through call_tool and fail loudly on error results"""
+    text = (await server.call_tool(name, arguments))[0].text
+    if text.startswith(("Error:", "Unknown tool:")):
+        raise RuntimeError(f"{name}: {text[:200]}")
+    return text
+
+
+async def scenario_list(args) -> tuple:
+    """object_list_objects with prefix-sharded listing of the whole bucket"""
+    await call("object_list_objects", {
+        "bucket_name": "suite",
+        "parallel": True,
+        "max_keys": args.keys,
+        "output": "compact"
+    })
+    return args.keys, "keys"
+
+
+async def scenario_filter(args) -> tuple:
+    """object_list_objects with a key filter, stopping at the 100th match (1 key in 100 matches)"""
+    result = await call("object_list_objects", {
+        "bucket_name": "suite",
+        "key_regex": r"00$",
+        "limit": 100,
+        "output": "compact"
+    })
+    return json.loads(result)["Scanned"], "keys"
+
+
+async def scenario_sizing(args) -> tuple:
+    """object_get_bucket_sizes for one synthetic bucket"""
+    await call("object_get_bucket_sizes", {"bucket_names": ["suite"], "output": "compact"})
+    return args.keys, "keys"
+
+
+async def scenario_top_n(args) -> tuple:
+    """object_top_n: the 100 largest objects of the synthetic bucket"""
+    await call("object_top_n", {"bucket_names": ["suite"], "n": 100, "output": "compact"})
+    return args.keys, "keys"
+
+
+async def scenario_upload(args) -> tuple:
+    """object_upload of a base64 body (multipart above ZADARA_MULTIPART_THRESHOLD)"""
+    await call("object_upload", {
+        "bucket_name": "suite-data",
+        "object_key": "upload.bin",
+        "content_base64": args.payload_base64
+    })
+    return args.object_mb, "MB"
+
+
+async def scenario_download(args) -> tuple:
+    """object_download of the uploaded object (ranged above ZADARA_DOWNLOAD_PART_SIZE)"""
+    await call("object_download", {"bucket_name": "suite-data", "object_key": "download.bin", "output": "compact"})
+    return args.object_mb, "MB"
+
+
+async def scenario_vpsa_read(args) -> tuple:
+    """vpsa_list_volumes with the response cache dropped, so every call reaches the backend"""
+    server.client.vpsa_cache.invalidate()
+    await call("vpsa_list_volumes", {"output": "compact"})
+    return 1, "calls"
+
+
+# Scenario and calls per iteration: cheap calls are repeated for enough latency samples
+SCENARIOS = {
+    "list": (scenario_list, 1),
+    "filter": (scenario_filter, 1),
+    "sizing": (scenario_sizing, 1),
+    "top_n": (scenario_top_n, 1),
+    "upload": (scenario_upload, 1),
+    "download": (scenario_download, 1),
+    "vpsa_read": (scenario_vpsa_read, 100),
+}
+
+
+async def run_scenario(name: str, args) -> dict:
+    scenario, repeat = SCENARIOS[name]
+    await scenario(args)  # warm-up: connections, imports, first-call caches
+    latencies = []
+    work = 0
+    unit = ""
+    for _ in range(args.iterations * repeat):
+        started = time.perf_counter()
+        amount, unit = await scenario(args)
+        latencies.append(time.perf_counter() - started)
+        work += amount
+    return {
+        "calls": len(latencies),
+        "throughput": work / sum(latencies),
+        "unit": f"{unit}/s",
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return a line per scenario whose throughput or p99 regressed beyond tolerance"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput']:.1f} {result['unit']} "
+                f"vs baseline {base['throughput']:.1f}"
+            )
+        if result["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result['p99_ms']:.1f} ms vs baseline {base['p99_ms']:.1f} ms")
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--keys", type=int, default=100000, help="Keys in the synthetic bucket (list, sizing)")
+    parser.add_argument("--object-mb", type=int, default=32, help="Object size for upload/download")
+    parser.add_argument("--iterations", type=int, default=5, help="Measured runs per scenario (after one warm-up)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server-side latency per request")
+    parser.add_argument("--capacity", type=int, help="Requests in flight before the backend throttles (503 SlowDown)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a baseline JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare with a baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default 0.25)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    # Retry warnings from throttled runs would drown the results
+    logging.getLogger("zadara-mcp").setLevel(logging.ERROR)
+
+    payload = os.urandom(args.object_mb * 1024 * 1024)
+    args.payload_base64 = base64.b64encode(payload).decode()
+
+    client = server.client
+    results = {}
+    with FakeBackend(latency=args.latency) as backend:
+        backend.state.capacity = args.capacity
+        backend.state.add_synthetic_bucket("suite", args.keys)
+        backend.state.add_bucket("suite-data")
+        backend.state.buckets["suite-data"].put("download.bin", payload)
+        client.vpsa_base_url = backend.url
+        client.vpsa_api_key = "bench"
+        client.object_storage_url = backend.url
+        client.object_access_key = "bench-access"
+        client.object_secret_key = "bench-secret"
+        try:
+            for name in names:
+                results[name] = await run_scenario(name, args)
+        finally:
+            await client.close()
+
+    parameters = {
+        "keys": args.keys,
+        "object_mb": args.object_mb,
+        "iterations": args.iterations,
+        "latency": args.latency,
+        "capacity": args.capacity,
+    }
+    print(f"{'scenario':<10} {'calls':>5} {'throughput':>14} {'unit':<8} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<10} {r['calls']:>5} {r['throughput']:>14.1f} {r['unit']:<8} "
+            f"{r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f}"
+        )
+
+    if args.save_baseline:
+        baseline = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "parameters": parameters,
+            "results": results,
+        }
+        with open(args.save_baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("parameters") != parameters:
+            print(f"\nWarning: baseline was recorded with different parameters: {baseline.get('parameters')}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: retries and adaptive concurrency against a throttling backend
+
+Deletes every object of a synthetic bucket (listing pipelined into
+multi-object deletes) against the local stand-in backend configured to
+answer 503 SlowDown once more than --capacity requests are in flight.
+Runs once with a fixed concurrency limit and once with the adaptive (AIMD)
+limit, and reports elapsed time, throttled responses and the final limit.
+
+Usage: python benchmarks/bench_throttling.py [--keys N] [--capacity N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backends import FakeBackend  # noqa: E402
+from server import HTTP_MAX_CONNECTIONS, AdaptiveLimiter, ZadaraClient  # noqa: E402
+
+
+async def run(backend: FakeBackend, keys: int, concurrency: int, adaptive: bool) -> dict:
+    client = ZadaraClient()
+    client.object_storage_url = backend.url
+    client.object_access_key = "bench-access"
+    client.object_secret_key = "bench-secret"
+    if not adaptive:
+        # min == max: the limit never shrinks, as before adaptive concurrency
+        client.limiters["object"] = AdaptiveLimiter(HTTP_MAX_CONNECTIONS, min_limit=HTTP_MAX_CONNECTIONS)
+
+    backend.state.add_synthetic_bucket("bench", keys)
+    backend.state.reset_counters()
+    started = time.perf_counter()
+    try:
+        result = await client.delete_prefix("bench", "", concurrency=concurrency)
+        error = None
+    except Exception as e:
+        result, error = {}, f"{type(e).__name__}: {e}"
+    finally:
+        await client.close()
+    return {
+        "mode": "adaptive" if adaptive else "fixed",
+        "elapsed": time.perf_counter() - started,
+        "deleted": result.get("deleted", 0),
+        "requests": backend.state.requests,
+        "throttled": backend.state.throttled,
+        "peak": backend.state.peak_in_flight,
+        "limit": client.limiters["object"].stats()["limit"],
+        "error": error,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=50000)
+    parser.add_argument("--capacity", type=int, default=4, help="Requests in flight before the backend throttles")
+    parser.add_argument("--concurrency", type=int, default=16, help="Delete requests in flight requested by the caller")
+    parser.add_argument("--latency", type=float, default=0.01, help="Server-side latency per request")
+    args = parser.parse_args()
+
+    # Retry warnings would drown the results
+    logging.getLogger("zadara-mcp").setLevel(logging.ERROR)
+
+    with FakeBackend(latency=args.latency) as backend:
+        backend.state.capacity = args.capacity
+        results = [
+            await run(backend, args.keys, args.concurrency, adaptive=False),
+            await run(backend, args.keys, args.concurrency, adaptive=True),
+        ]
+
+    print(f"{'mode':<9} {'elapsed s':>9} {'deleted':>8} {'requests':>8} {'throttled':>9} {'peak':>5} {'limit':>5}")
+    for r in results:
+        print(
+            f"{r['mode']:<9} {r['elapsed']:>9.2f} {r['deleted']:>8} {r['requests']:>8} "
+            f"{r['throttled']:>9} {r['peak']:>5} {r['limit']:>5}"
+        )
+        if r["error"]:
+            print(f"  failed: {r['error'][:120]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
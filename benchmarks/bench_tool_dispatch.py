@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: tool dispatch and list_tools cost
+
+Compares the previous call_tool/list_tools shape (an if/elif chain on the
+tool name, and every Tool object with its schema dict rebuilt per call) with
+the tool registry (dict lookup, Tool list built once at import). The legacy
+versions are generated from the registry itself so both sides cover exactly
+the same tools and schemas.
+
+Usage: python benchmarks/bench_tool_dispatch.py [--calls N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import TOOL_REGISTRY, list_tools  # noqa: E402
+
+
+def build_legacy_list_tools():
+    """Source-generate a list_tools that rebuilds every Tool literal per call"""
+    entries = ",\n".join(
+        f"        Tool(name={spec.tool.name!r}, description={spec.tool.description!r}, "
+        f"inputSchema={spec.tool.inputSchema!r})"
+        for spec in TOOL_REGISTRY.values()
+    )
+    namespace = {}
+    exec(  # nosec - benchmark code generated from the local registry
+        f"from mcp.types import Tool\n"
+        f"def legacy_list_tools():\n    return [\n{entries}\n    ]\n",
+        namespace
+    )
+    return namespace["legacy_list_tools"]
+
+
+def build_legacy_dispatch():
+    """Source-generate an if/elif chain on the tool name, in registration order"""
+    branches = "\n".join(
+        f"    {'if' if i == 0 else 'elif'} name == {name!r}:\n        return {i}"
+        for i, name in enumerate(TOOL_REGISTRY)
+    )
+    namespace = {}
+    exec(  # nosec - benchmark code generated from the local registry
+        f"def legacy_dispatch(name):\n{branches}\n    else:\n        return None\n",
+        namespace
+    )
+    return namespace["legacy_dispatch"]
+
+
+def timed(func, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    names = list(TOOL_REGISTRY)
+    legacy_list_tools = build_legacy_list_tools()
+    legacy_dispatch = build_legacy_dispatch()
+    registry_get = TOOL_REGISTRY.get
+    loop = asyncio.new_event_loop()
+
+    print(f"{len(names)} tools")
+    print(f"{'measurement':<36} {'us/call':>10}")
+
+    def dispatch_all(dispatch):
+        for name in names:
+            dispatch(name)
+
+    per_name = args.calls // 10 or 1
+    for label, func in (
+        ("dispatch if/elif (mean over tools)", lambda: dispatch_all(legacy_dispatch)),
+        ("dispatch registry (mean over tools)", lambda: dispatch_all(registry_get)),
+    ):
+        print(f"{label:<36} {timed(func, per_name) / len(names) * 1e6:>10.3f}")
+
+    last = names[-1]
+    for label, func in (
+        ("dispatch if/elif (last tool)", lambda: legacy_dispatch(last)),
+        ("dispatch registry (last tool)", lambda: registry_get(last)),
+    ):
+        print(f"{label:<36} {timed(func, args.calls) * 1e6:>10.3f}")
+
+    calls = max(1, args.calls // 20)
+    for label, func in (
+        ("list_tools rebuilt per call", legacy_list_tools),
+        ("list_tools prebuilt", lambda: loop.run_until_complete(list_tools())),
+        ("  (event loop overhead only)", lambda: loop.run_until_complete(asyncio.sleep(0))),
+    ):
+        print(f"{label:<36} {timed(func, calls) * 1e6:>10.1f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Local stand-in VPSA and S3 backends for benchmarks
+
+Serves just enough of the VPSA REST API and the S3 API for ZadaraClient to
+run against it without credentials or network access. Buckets can be
+synthetic (keys generated on the fly, so millions of keys cost no memory)
+or regular in-memory buckets populated through PUT.
+"""
+
+import bisect
+import collections
+import hashlib
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.sax.saxutils import escape
+
+S3_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+LAST_MODIFIED = "2026-01-01T00:00:00.000Z"
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every key starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _decode_aws_chunked(body: bytes) -> bytes:
+    """Strip aws-chunked framing (signatures are not verified)"""
+    data = []
+    offset = 0
+    while offset < len(body):
+        header_end = body.index(b"\r\n", offset)
+        size = int(body[offset:header_end].split(b";")[0], 16)
+        start = header_end + 2
+        data.append(body[start:start + size])
+        offset = start + size + 2
+        if size == 0:
+            break
+    return b"".join(data)
+
+
+class SyntheticKeys:
+    """Sorted, virtual key sequence: d00000/obj-000000000, d00000/obj-000000001, ..."""
+
+    def __init__(self, count: int, keys_per_dir: int = 10000, object_size: int = 1024):
+        self.count = count
+        self.keys_per_dir = keys_per_dir
+        self.object_size = object_size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return f"d{index // self.keys_per_dir:05d}/obj-{index:09d}"
+
+    def size(self, index: int) -> int:
+        return self.object_size
+
+    def data(self, index: int) -> bytes:
+        return b"x" * self.object_size
+
+
+class MemoryKeys:
+    """Sorted key sequence backed by real object data"""
+
+    def __init__(self):
+        self.keys = []
+        self.objects = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index: int) -> str:
+        return self.keys[index]
+
+    def size(self, index: int) -> int:
+        return len(self.objects[self.keys[index]])
+
+    def data(self, index: int) -> bytes:
+        return self.objects[self.keys[index]]
+
+    def put(self, key: str, data: bytes):
+        if key not in self.objects:
+            bisect.insort(self.keys, key)
+        self.objects[key] = data
+
+    def delete(self, key: str) -> bool:
+        if key not in self.objects:
+            return False
+        del self.objects[key]
+        self.keys.pop(bisect.bisect_left(self.keys, key))
+        return True
+
+
+class FakeBackendState:
+    """Shared state and counters for one stand-in server"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.buckets = {}
+        self.volumes = [
+            {"name": f"volume-{i:03d}", "capacity": 100 + i, "status": "Available", "pool": "pool-1"}
+            for i in range(50)
+        ]
+        self.uploads = {}
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        # Throttling: requests beyond `capacity` in flight get 503 SlowDown (None = unlimited)
+        self.capacity = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.throttled = 0
+        # Faults injected into the next requests: HTTP status codes or "reset"
+        self.faults = collections.deque()
+
+    def add_synthetic_bucket(self, name: str, count: int, **kwargs):
+        self.buckets[name] = SyntheticKeys(count, **kwargs)
+
+    def add_bucket(self, name: str):
+        self.buckets.setdefault(name, MemoryKeys())
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def inject_faults(self, *faults):
+        """Fail the next requests, one per fault: a status code or "reset" (connection dropped)"""
+        with self.lock:
+            self.faults.extend(faults)
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.peak_in_flight = 0
+            self.throttled = 0
+
+
+class FakeBackendHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the VPSA and S3 subsets"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self) -> FakeBackendState:
+        return self.server.state
+
+    # Response helpers
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/xml", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload):
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _send_error_xml(self, status: int, code: str):
+        body = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><Error><Code>{code}</Code></Error>"
+        self._send(status, body.encode())
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if "aws-chunked" in self.headers.get("Content-Encoding", ""):
+            body = _decode_aws_chunked(body)
+        return body
+
+    def _prepare(self):
+        self.state.count_request()
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+        return unquote(parsed.path), query
+
+    # Dispatch
+
+    def _handle(self):
+        state = self.state
+        with state.lock:
+            state.in_flight += 1
+            state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+            fault = state.faults.popleft() if state.faults else None
+            overloaded = state.capacity is not None and state.in_flight > state.capacity
+            if overloaded:
+                state.throttled += 1
+        try:
+            path, query = self._prepare()
+            if fault == "reset":
+                self.close_connection = True
+                return
+            if fault is not None or overloaded:
+                self._read_body()
+                return self._send_error_xml(fault or 503, "SlowDown")
+            if path.startswith("/api/"):
+                return self._handle_vpsa(path[len("/api/"):], query)
+            return self._handle_s3(path, query)
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+    do_GET = do_PUT = do_POST = do_DELETE = do_HEAD = _handle
+
+    # VPSA
+
+    def _handle_vpsa(self, endpoint: str, query: dict):
+        self._read_body()
+        if self.command != "GET":
+            return self._send_json(200, {"response": {"status": 0}})
+        if endpoint == "volumes.json":
+            return self._send_json(200, {"response": {"volumes": self.state.volumes, "count": len(self.state.volumes)}})
+        if endpoint.startswith("volumes/"):
+            name = endpoint[len("volumes/"):-len(".json")]
+            for volume in self.state.volumes:
+                if volume["name"] == name:
+                    return self._send_json(200, {"response": {"volume": volume}})
+            return self._send_json(404, {"response": {"status": 1, "message": "not found"}})
+        collection = endpoint.rsplit(".", 1)[0]
+        return self._send_json(200, {"response": {collection: [], "count": 0}})
+
+    # S3
+
+    def _handle_s3(self, path: str, query: dict):
+        parts = path.lstrip("/").split("/", 1)
+        bucket_name = parts[0]
+        key = parts[1] if len(parts) > 1 else ""
+        body = self._read_body()
+
+        if not bucket_name:
+            return self._list_buckets()
+        bucket = self.state.buckets.get(bucket_name)
+
+        if not key:
+            if self.command == "PUT":
+                self.state.add_bucket(bucket_name)
+                return self._send(200)
+            if bucket is None:
+                return self._send_error_xml(404, "NoSuchBucket")
+            if self.command == "GET":
+                return self._list_objects(bucket_name, bucket, query)
+            if self.command == "POST" and "delete" in query:
+                return self._delete_objects(bucket, body)
+            if self.command == "DELETE":
+                del self.state.buckets[bucket_name]
+                return self._send(204)
+            return self._send_error_xml(405, "MethodNotAllowed")
+
+        if bucket is None:
+            return self._send_error_xml(404, "NoSuchBucket")
+        if "uploads" in query or "uploadId" in query:
+            return self._handle_multipart(bucket_name, bucket, key, query, body)
+        if self.command == "PUT":
+            bucket.put(key, body)
+            etag = hashlib.md5(body).hexdigest()  # nosec - S3 ETag semantics
+            return self._send(200, headers={"ETag": f"\"{etag}\""})
+        if self.command == "DELETE":
+            if hasattr(bucket, "delete"):
+                bucket.delete(key)
+            return self._send(204)
+        if self.command in ("GET", "HEAD"):
+            index = bisect.bisect_left(bucket, key)
+            if index >= len(bucket) or bucket[index] != key:
+                return self._send_error_xml(404, "NoSuchKey")
+            return self._send_object(bucket.data(index))
+        return self._send_error_xml(405, "MethodNotAllowed")
+
+    def _send_object(self, data: bytes):
+        etag = f"\"{hashlib.md5(data).hexdigest()}\""  # nosec - S3 ETag semantics
+        if_match = self.headers.get("If-Match")
+        if if_match and if_match != etag:
+            return self._send_error_xml(412, "PreconditionFailed")
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        range_header = self.headers.get("Range", "")
+        if not range_header.startswith("bytes="):
+            return self._send(200, data, "application/octet-stream", headers)
+        first, _, last = range_header[len("bytes="):].partition("-")
+        start = int(first) if first else max(0, len(data) - int(last))
+        end = min(int(last), len(data) - 1) if first and last else len(data) - 1
+        if start >= len(data):
+            return self._send_error_xml(416, "InvalidRange")
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        return self._send(206, data[start:end + 1], "application/octet-stream", headers)
+
+    def _delete_objects(self, bucket, body: bytes):
+        if not self.headers.get("Content-MD5"):
+            return self._send_error_xml(400, "InvalidRequest")
+        keys = [
+            element.text or ""
+            for element in ET.fromstring(body).iter()
+            if element.tag.split("}")[-1] == "Key"
+        ]
+        if len(keys) > 1000:
+            return self._send_error_xml(400, "MalformedXML")
+        with self.state.lock:
+            for key in keys:
+                # Synthetic buckets are generated, so their deletes are no-ops
+                if hasattr(bucket, "delete"):
+                    bucket.delete(key)
+        result = (
+            f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            f"<DeleteResult xmlns=\"{S3_NAMESPACE}\"></DeleteResult>"
+        )
+        return self._send(200, result.encode())
+
+    def _handle_multipart(self, bucket_name: str, bucket, key: str, query: dict, body: bytes):
+        state = self.state
+        if self.command == "POST" and "uploads" in query:
+            upload_id = hashlib.md5(f"{bucket_name}/{key}/{time.time()}".encode()).hexdigest()  # nosec
+            with state.lock:
+                state.uploads[upload_id] = {}
+            result = (
+                f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+                f"<InitiateMultipartUploadResult xmlns=\"{S3_NAMESPACE}\"><Bucket>{escape(bucket_name)}</Bucket>"
+                f"<Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            )
+            return self._send(200, result.encode())
+
+        parts = state.uploads.get(query["uploadId"])
+        if parts is None:
+            return self._send_error_xml(404, "NoSuchUpload")
+        if self.command == "PUT":
+            etag = hashlib.md5(body).hexdigest()  # nosec - S3 ETag semantics
+            with state.lock:
+                parts[int(query["partNumber"])] = (etag, body)
+            return self._send(200, headers={"ETag": f"\"{etag}\""})
+        if self.command == "DELETE":
+            with state.lock:
+                state.uploads.pop(query["uploadId"], None)
+            return self._send(204)
+        if self.command == "POST":
+            with state.lock:
+                state.uploads.pop(query["uploadId"], None)
+            bucket.put(key, b"".join(parts[number][1] for number in sorted(parts)))
+            result = (
+                f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+                f"<CompleteMultipartUploadResult xmlns=\"{S3_NAMESPACE}\"><Bucket>{escape(bucket_name)}</Bucket>"
+                f"<Key>{escape(key)}</Key><ETag>\"{len(parts)}\"</ETag></CompleteMultipartUploadResult>"
+            )
+            return self._send(200, result.encode())
+        return self._send_error_xml(405, "MethodNotAllowed")
+
+    def _list_buckets(self):
+        entries = "".join(
+            f"<Bucket><Name>{escape(name)}</Name><CreationDate>{LAST_MODIFIED}</CreationDate></Bucket>"
+            for name in sorted(self.state.buckets)
+        )
+        body = (
+            f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            f"<ListAllMyBucketsResult xmlns=\"{S3_NAMESPACE}\"><Buckets>{entries}</Buckets></ListAllMyBucketsResult>"
+        )
+        self._send(200, body.encode())
+
+    def _list_objects(self, bucket_name: str, bucket, query: dict):
+        prefix = query.get("prefix", "")
+        delimiter = query.get("delimiter", "")
+        max_keys = min(int(query.get("max-keys", "1000")), 1000)
+        token = query.get("continuation-token", "")
+        start = token or query.get("start-after") or query.get("marker") or ""
+
+        if token and delimiter and token.endswith(delimiter):
+            # Resuming after a common prefix: skip every key below it
+            index = bisect.bisect_left(bucket, _prefix_upper_bound(token))
+        else:
+            index = bisect.bisect_right(bucket, start) if start else 0
+        index = max(index, bisect.bisect_left(bucket, prefix))
+
+        contents = []
+        common_prefixes = []
+        last_item = None
+        while index < len(bucket) and len(contents) + len(common_prefixes) < max_keys:
+            key = bucket[index]
+            if not key.startswith(prefix):
+                break
+            if delimiter:
+                pos = key.find(delimiter, len(prefix))
+                if pos != -1:
+                    common_prefix = key[:pos + len(delimiter)]
+                    common_prefixes.append(common_prefix)
+                    last_item = common_prefix
+                    # Skip every key sharing this common prefix
+                    index = bisect.bisect_left(bucket, _prefix_upper_bound(common_prefix))
+                    continue
+            contents.append((key, bucket.size(index)))
+            last_item = key
+            index += 1
+
+        is_truncated = index < len(bucket) and bucket[index].startswith(prefix)
+        items = "".join(
+            f"<Contents><Key>{escape(key)}</Key><LastModified>{LAST_MODIFIED}</LastModified>"
+            f"<ETag>&quot;{hashlib.md5(key.encode()).hexdigest()}&quot;</ETag>"  # nosec
+            f"<Size>{size}</Size><StorageClass>STANDARD</StorageClass></Contents>"
+            for key, size in contents
+        )
+        items += "".join(
+            f"<CommonPrefixes><Prefix>{escape(p)}</Prefix></CommonPrefixes>" for p in common_prefixes
+        )
+        token_xml = ""
+        if is_truncated and last_item is not None:
+            # Continuation tokens are opaque to clients; the last returned
+            # key (or common prefix) is enough to resume the listing.
+            token_xml = f"<NextContinuationToken>{escape(last_item)}</NextContinuationToken>"
+        body = (
+            f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            f"<ListBucketResult xmlns=\"{S3_NAMESPACE}\"><Name>{escape(bucket_name)}</Name>"
+            f"<Prefix>{escape(prefix)}</Prefix><KeyCount>{len(contents) + len(common_prefixes)}</KeyCount>"
+            f"<MaxKeys>{max_keys}</MaxKeys><IsTruncated>{'true' if is_truncated else 'false'}</IsTruncated>"
+            f"{token_xml}{items}</ListBucketResult>"
+        )
+        self._send(200, body.encode())
+
+
+class FakeBackendServer(ThreadingHTTPServer):
+    """Threaded HTTP server that counts accepted connections (TCP handshakes)"""
+
+    daemon_threads = True
+
+    def __init__(self, state: FakeBackendState, host: str = "127.0.0.1", port: int = 0):
+        self.state = state
+        super().__init__((host, port), FakeBackendHandler)
+
+    def handle_error(self, request, client_address):
+        # Clients closing connections mid-response (aborted ranges) are expected
+        pass
+
+    def get_request(self):
+        request = super().get_request()
+        with self.state.lock:
+            self.state.connections += 1
+        return request
+
+
+class FakeBackend:
+    """Run a FakeBackendServer on a background thread"""
+
+    def __init__(self, latency: float = 0.0):
+        self.state = FakeBackendState(latency=latency)
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBackend":
+        self.server = FakeBackendServer(self.state)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
@@ -9,15 +9,48 @@ This MCP server provides access to Zadara Storage APIs:
 
 import asyncio
 import base64
+import bisect
+import cProfile
+import fnmatch
 import hashlib
+import heapq
 import hmac
+import io
 import json
+import logging
 import os
-from datetime import datetime
-from typing import Any, Optional
-from urllib.parse import urljoin, urlparse
+import pstats
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+from urllib.parse import parse_qsl, quote, unquote, urljoin, urlparse, urlunparse
+from xml.sax.saxutils import escape
 
 import httpx
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import orjson  # optional: faster encoding of large tool results
+except ImportError:
+    orjson = None
+
+try:
+    import jsonschema  # installed with mcp >= 1.10, which validates tool arguments
+except ImportError:
+    jsonschema = None
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -39,1066 +72,4547 @@ OBJECT_STORAGE_URL = os.getenv("ZADARA_OBJECT_STORAGE_URL", "")
 OBJECT_STORAGE_ACCESS_KEY = os.getenv("ZADARA_OBJECT_ACCESS_KEY", "")
 OBJECT_STORAGE_SECRET_KEY = os.getenv("ZADARA_OBJECT_SECRET_KEY", "")
 
+# AWS Signature V4 settings for Object Storage
+OBJECT_STORAGE_REGION = os.getenv("ZADARA_OBJECT_REGION", "us-east-1")
+# Payload signing for uploads: "signed" (SHA-256 of the body), "unsigned"
+# (UNSIGNED-PAYLOAD, relies on TLS) or "streaming" (aws-chunked, hashed per chunk)
+S3_PAYLOAD_SIGNING = os.getenv("ZADARA_S3_PAYLOAD_SIGNING", "signed").lower()
+S3_STREAMING_CHUNK_SIZE = int(os.getenv("ZADARA_S3_STREAMING_CHUNK_SIZE", str(64 * 1024)))
 
-class ZadaraClient:
-    """Client for Zadara Storage APIs"""
+# Multipart upload: objects at or above the threshold are uploaded in parts
+MULTIPART_THRESHOLD = int(os.getenv("ZADARA_MULTIPART_THRESHOLD", str(16 * 1024 * 1024)))
+MULTIPART_PART_SIZE = max(5 * 1024 * 1024, int(os.getenv("ZADARA_MULTIPART_PART_SIZE", str(8 * 1024 * 1024))))
+MULTIPART_CONCURRENCY = int(os.getenv("ZADARA_MULTIPART_CONCURRENCY", "4"))
+MULTIPART_PART_RETRIES = int(os.getenv("ZADARA_MULTIPART_PART_RETRIES", "3"))
+# S3 limit on the parts of one multipart upload
+MULTIPART_MAX_PARTS = 10000
+
+# Ranged download: objects larger than one part are fetched as concurrent byte ranges
+DOWNLOAD_PART_SIZE = int(os.getenv("ZADARA_DOWNLOAD_PART_SIZE", str(8 * 1024 * 1024)))
+DOWNLOAD_CONCURRENCY = int(os.getenv("ZADARA_DOWNLOAD_CONCURRENCY", "4"))
+DOWNLOAD_RANGE_RETRIES = int(os.getenv("ZADARA_DOWNLOAD_RANGE_RETRIES", "3"))
+
+# Windowed reads (object_read_range): default and maximum window size returned over MCP
+READ_WINDOW_SIZE = int(os.getenv("ZADARA_READ_WINDOW_SIZE", str(1024 * 1024)))
+READ_WINDOW_MAX_SIZE = int(os.getenv("ZADARA_READ_WINDOW_MAX_SIZE", str(8 * 1024 * 1024)))
+
+# Presigned URLs: default and maximum lifetime in seconds (SigV4 allows at most 7 days)
+PRESIGN_DEFAULT_EXPIRY = int(os.getenv("ZADARA_PRESIGN_DEFAULT_EXPIRY", "3600"))
+PRESIGN_MAX_EXPIRY = min(604800, int(os.getenv("ZADARA_PRESIGN_MAX_EXPIRY", "604800")))
+
+# Multi-object delete: keys per POST ?delete request (S3 maximum 1000) and requests in flight
+DELETE_BATCH_SIZE = min(1000, int(os.getenv("ZADARA_DELETE_BATCH_SIZE", "1000")))
+DELETE_CONCURRENCY = int(os.getenv("ZADARA_DELETE_CONCURRENCY", "4"))
+
+# Local file transfers: file paths must be inside this directory; the file tools are disabled while unset
+FILE_TRANSFER_ROOT = os.getenv("ZADARA_FILE_TRANSFER_ROOT", "")
+# Upload bodies are handed to the HTTP client in pieces of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# HTTP connection pool configuration (shared by all requests to an endpoint)
+HTTP_MAX_CONNECTIONS = int(os.getenv("ZADARA_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ZADARA_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("ZADARA_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("ZADARA_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Retries for idempotent backend requests: total attempts, and backoff base/cap in seconds
+RETRY_MAX_ATTEMPTS = max(1, int(os.getenv("ZADARA_RETRY_MAX_ATTEMPTS", "4")))
+RETRY_BASE_DELAY = float(os.getenv("ZADARA_RETRY_BASE_DELAY", "0.25"))
+RETRY_MAX_DELAY = float(os.getenv("ZADARA_RETRY_MAX_DELAY", "20"))
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+# Responses that mean "slow down" (S3 SlowDown is a 503)
+THROTTLE_STATUS = frozenset({429, 503})
+# Responses that count as circuit breaker failures (a 503 is throttling, not an outage)
+CIRCUIT_FAILURE_STATUS = frozenset({500, 502, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+# Adaptive concurrency per endpoint (AIMD): requests in flight start at the connection
+# pool size, halve when the backend throttles and grow back by one per round of successes
+ADAPTIVE_MIN_CONCURRENCY = max(1, int(os.getenv("ZADARA_ADAPTIVE_MIN_CONCURRENCY", "1")))
+
+# Client-side rate limit per endpoint: requests per second (0 = unlimited) and burst size
+VPSA_RATE_LIMIT = float(os.getenv("ZADARA_VPSA_RATE_LIMIT", "0"))
+VPSA_RATE_BURST = int(os.getenv("ZADARA_VPSA_RATE_BURST", "10"))
+OBJECT_RATE_LIMIT = float(os.getenv("ZADARA_OBJECT_RATE_LIMIT", "0"))
+OBJECT_RATE_BURST = int(os.getenv("ZADARA_OBJECT_RATE_BURST", "50"))
+
+# Circuit breaker per endpoint: consecutive failures before calls fail fast, and
+# seconds before a single probe request is let through (0 threshold disables)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("ZADARA_CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("ZADARA_CIRCUIT_RESET_TIMEOUT", "30"))
+
+# Number of buckets object_get_bucket_sizes and object_top_n scan concurrently
+BUCKET_SCAN_CONCURRENCY = int(os.getenv("ZADARA_BUCKET_SCAN_CONCURRENCY", "8"))
+# Largest n accepted by object_top_n
+TOP_N_MAX = int(os.getenv("ZADARA_TOP_N_MAX", "10000"))
+
+# Prefix-sharded listing: shards listed in parallel per bucket, and max shards per bucket
+LIST_SHARD_CONCURRENCY = int(os.getenv("ZADARA_LIST_SHARD_CONCURRENCY", "8"))
+LIST_MAX_SHARDS = int(os.getenv("ZADARA_LIST_MAX_SHARDS", "32"))
+# Pages listed serially before a listing is sharded; smaller buckets never pay for sharding
+LIST_SHARD_AFTER_PAGES = max(1, int(os.getenv("ZADARA_LIST_SHARD_AFTER_PAGES", "4")))
+
+# Default key budget of object_list_objects with auto_paginate
+LIST_PAGINATE_MAX_KEYS = int(os.getenv("ZADARA_LIST_PAGINATE_MAX_KEYS", "10000"))
+
+# Tool results: "pretty" (indented JSON) or "compact"; the per-call `output` argument overrides it
+OUTPUT_FORMAT = os.getenv("ZADARA_OUTPUT_FORMAT", "pretty").lower()
+
+# Metrics: optional Prometheus text file, rewritten every METRICS_EXPORT_INTERVAL seconds
+METRICS_PROMETHEUS_FILE = os.getenv("ZADARA_METRICS_PROMETHEUS_FILE", "")
+METRICS_EXPORT_INTERVAL = float(os.getenv("ZADARA_METRICS_EXPORT_INTERVAL", "15"))
+
+# Seconds between event loop lag samples (the delay of a sleep beyond its interval)
+LOOP_LAG_INTERVAL = float(os.getenv("ZADARA_LOOP_LAG_INTERVAL", "0.5"))
+
+# Latency histogram bucket upper bounds in seconds (percentiles are interpolated within a bucket)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Profiling: tools whose calls are always profiled ("all" or comma-separated names; empty = off),
+# where the reports are written, and how many hotspots/allocation sites they list
+PROFILE_TOOLS = {name.strip() for name in os.getenv("ZADARA_PROFILE", "").split(",") if name.strip()}
+PROFILE_DIR = os.getenv("ZADARA_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "zadara-mcp-profiles"))
+PROFILE_TOP_N = int(os.getenv("ZADARA_PROFILE_TOP_N", "20"))
+
+# Batch tools: default concurrent operations per batch, and limits per call
+BATCH_CONCURRENCY = int(os.getenv("ZADARA_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("ZADARA_BATCH_MAX_CONCURRENCY", "32"))
+BATCH_MAX_OPERATIONS = int(os.getenv("ZADARA_BATCH_MAX_OPERATIONS", "1000"))
+
+# VPSA response cache: TTL in seconds per resource family ("family=seconds,..."; 0 disables)
+# and the maximum number of cached responses
+VPSA_CACHE_TTLS = {
+    family: float(ttl)
+    for family, _, ttl in (
+        item.partition("=") for item in os.getenv(
+            "ZADARA_VPSA_CACHE_TTLS",
+            "volumes=15,snapshots=15,pools=60,servers=60,vcontrollers=60"
+        ).split(",") if "=" in item
+    )
+}
+VPSA_CACHE_MAX_ENTRIES = int(os.getenv("ZADARA_VPSA_CACHE_MAX_ENTRIES", "256"))
+# Writes to one family also invalidate the families whose listings they change
+VPSA_CACHE_RELATED = {
+    "volumes": ("snapshots", "pools"),
+    "snapshots": ("volumes",),
+    "pools": ("volumes",),
+}
+
+# Log to stderr only - stdout carries the MCP protocol
+logger = logging.getLogger("zadara-mcp")
+
+
+class ObjectRecord(NamedTuple):
+    """One entry of an S3 object listing"""
+    key: str
+    size: int
+    last_modified: str
+    etag: str
+    storage_class: str = ""
+    
+    def to_dict(self) -> dict:
+        return {
+            "Key": self.key,
+            "Size": self.size,
+            "LastModified": self.last_modified,
+            "ETag": self.etag,
+            "StorageClass": self.storage_class
+        }
+
+
+class _ListObjectsTarget:
+    """ElementTree parser target collecting ListObjects entries without building a tree"""
+    
+    # Elements whose text is needed; everything else is skipped
+    _FIELDS = frozenset((
+        'Key', 'Size', 'LastModified', 'ETag', 'StorageClass', 'Prefix',
+        'IsTruncated', 'NextContinuationToken', 'NextMarker'
+    ))
+    
+    def __init__(self):
+        self.records = []
+        self.common_prefixes = []
+        self.is_truncated = False
+        self.next_token = None
+        self._local_names = {}
+        self._depth = 0
+        self._text = None
+        self._entry = {}
+    
+    def _local_name(self, tag: str) -> str:
+        # Remove namespace if present; cached because tags repeat for every entry
+        name = self._local_names.get(tag)
+        if name is None:
+            name = self._local_names[tag] = tag.rpartition('}')[2]
+        return name
+    
+    def start(self, tag, attrib):
+        self._depth += 1
+        self._text = [] if self._local_name(tag) in self._FIELDS else None
+    
+    def data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+    
+    def end(self, tag):
+        depth = self._depth
+        self._depth -= 1
+        name = self._local_name(tag)
+        text = "".join(self._text) if self._text is not None else None
+        self._text = None
+        
+        if depth == 3:
+            # Field of a <Contents> or <CommonPrefixes> entry
+            if text is not None:
+                self._entry[name] = text
+        elif depth == 2:
+            entry, self._entry = self._entry, {}
+            if name == 'Contents':
+                if entry.get('Key'):
+                    self.records.append(ObjectRecord(
+                        entry['Key'],
+                        int(entry.get('Size') or 0),
+                        entry.get('LastModified', ""),
+                        entry.get('ETag', "").strip('"'),
+                        entry.get('StorageClass', "")
+                    ))
+            elif name == 'CommonPrefixes':
+                if entry.get('Prefix'):
+                    self.common_prefixes.append(entry['Prefix'])
+            elif name == 'IsTruncated':
+                self.is_truncated = text == 'true'
+            elif name in ('NextContinuationToken', 'NextMarker') and text:
+                self.next_token = text
+    
+    def close(self):
+        return None
+
+
+class ListObjectsParser:
+    """Incremental parser for ListObjects/ListObjectsV2 responses.
+    
+    Bytes are fed as they arrive from the network and expat reports each
+    element to a parser target that only keeps the fields of the current
+    entry, so no element tree is built and memory stays flat however large
+    the page is. Works with and without the S3 namespace.
+    """
+    
+    def __init__(self):
+        self._target = _ListObjectsTarget()
+        self._parser = ET.XMLParser(target=self._target)
+    
+    @property
+    def common_prefixes(self) -> list:
+        return self._target.common_prefixes
+    
+    @property
+    def is_truncated(self) -> bool:
+        return self._target.is_truncated
+    
+    @property
+    def next_token(self) -> Optional[str]:
+        return self._target.next_token
+    
+    def feed(self, data: bytes) -> list:
+        """Feed a chunk of the response; return the records it completed"""
+        self._parser.feed(data)
+        return self._take_records()
+    
+    def close(self) -> list:
+        """Finish parsing; return any remaining records"""
+        self._parser.close()
+        return self._take_records()
+    
+    def page(self, objects: list) -> dict:
+        """Build a listing page dict from the parsed metadata"""
+        return {
+            "objects": objects,
+            "common_prefixes": self.common_prefixes,
+            "is_truncated": self.is_truncated,
+            "next_token": self.next_token
+        }
+    
+    def _take_records(self) -> list:
+        records = self._target.records
+        self._target.records = []
+        return records
+
+
+def record_json_size(record: ObjectRecord) -> int:
+    """Approximate size of a listing record in the compact JSON tool result"""
+    return (
+        len(record.key) + len(record.last_modified) + len(record.etag) + len(record.storage_class)
+        + len(str(record.size)) + 64
+    )
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp such as S3's LastModified; naive values are taken as UTC"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# Object filter arguments shared by listing tools (see build_object_filter)
+OBJECT_FILTER_PROPERTIES = {
+    "key_glob": {
+        "type": "string",
+        "description": "Only keys matching this shell-style pattern; * also matches '/' (e.g. 'logs/*.gz')"
+    },
+    "key_regex": {
+        "type": "string",
+        "description": "Only keys containing a match for this regular expression"
+    },
+    "min_size": {
+        "type": "integer",
+        "minimum": 0,
+        "description": "Only objects of at least this many bytes"
+    },
+    "max_size": {
+        "type": "integer",
+        "minimum": 0,
+        "description": "Only objects of at most this many bytes"
+    },
+    "modified_after": {
+        "type": "string",
+        "description": "Only objects last modified at or after this ISO 8601 time (UTC unless an offset is given)"
+    },
+    "modified_before": {
+        "type": "string",
+        "description": "Only objects last modified before this ISO 8601 time (UTC unless an offset is given)"
+    },
+    "storage_class": {
+        "type": "string",
+        "description": "Only objects of this storage class (e.g. STANDARD)"
+    }
+}
+
+
+def build_object_filter(arguments: dict) -> Optional[Callable[[ObjectRecord], bool]]:
+    """Predicate for the object filter arguments of a listing tool; None when none are given.
+    
+    Cheap comparisons come first so most records are rejected before the
+    timestamp is parsed or a pattern is matched.
+    """
+    checks = []
+    if "min_size" in arguments:
+        min_size = arguments["min_size"]
+        checks.append(lambda o: o.size >= min_size)
+    if "max_size" in arguments:
+        max_size = arguments["max_size"]
+        checks.append(lambda o: o.size <= max_size)
+    if arguments.get("storage_class"):
+        # Listings may omit StorageClass for STANDARD objects
+        storage_class = arguments["storage_class"].upper()
+        checks.append(lambda o: (o.storage_class or "STANDARD").upper() == storage_class)
+    if arguments.get("modified_after") or arguments.get("modified_before"):
+        try:
+            after = parse_timestamp(arguments["modified_after"]) if arguments.get("modified_after") else None
+            before = parse_timestamp(arguments["modified_before"]) if arguments.get("modified_before") else None
+        except ValueError:
+            raise ValueError("modified_after and modified_before must be ISO 8601 timestamps, e.g. 2024-05-01T00:00:00Z")
+        
+        def modified_in_range(o: ObjectRecord) -> bool:
+            if not o.last_modified:
+                return False
+            modified = parse_timestamp(o.last_modified)
+            return (after is None or modified >= after) and (before is None or modified < before)
+        checks.append(modified_in_range)
+    try:
+        if arguments.get("key_glob"):
+            glob = re.compile(fnmatch.translate(arguments["key_glob"]))
+            checks.append(lambda o: glob.match(o.key) is not None)
+        if arguments.get("key_regex"):
+            regex = re.compile(arguments["key_regex"])
+            checks.append(lambda o: regex.search(o.key) is not None)
+    except re.error as e:
+        raise ValueError(f"Invalid key pattern: {e}")
+    
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda o: all(check(o) for check in checks)
+
+
+def encode_list_cursor(position: dict) -> str:
+    """Opaque object_list_objects cursor for a listing position"""
+    data = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str) -> dict:
+    """Listing position of a cursor returned by encode_list_cursor"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        position = None
+    if not isinstance(position, dict) or "b" not in position:
+        raise ValueError("Invalid cursor; pass NextCursor from a previous object_list_objects result")
+    return position
+
+
+class _ScanStopped(Exception):
+    """Raised from a scan_objects page callback to end the scan early"""
+
+
+class TopObjects:
+    """The n highest-ranked objects seen so far, kept in a bounded min-heap.
+    
+    Pages from any number of buckets and shards are fed to add(); memory
+    stays O(n) however many objects are scanned. Orders: largest,
+    smallest, oldest and newest (by LastModified; objects without one are
+    skipped for those).
+    """
+    
+    ORDERS = ("largest", "smallest", "oldest", "newest")
+    
+    def __init__(self, n: int, order: str = "largest"):
+        if order not in self.ORDERS:
+            raise ValueError(f"order must be one of {', '.join(self.ORDERS)}")
+        self.n = n
+        self.order = order
+        self._heap = []
+        # Higher rank wins; chosen once so add() does not branch per record
+        sign = 1 if order in ("largest", "newest") else -1
+        if order in ("largest", "smallest"):
+            self._rank = lambda record: sign * record.size
+        else:
+            self._rank = lambda record: (
+                sign * parse_timestamp(record.last_modified).timestamp() if record.last_modified else None
+            )
+    
+    def add(self, bucket_name: str, objects: list):
+        heap = self._heap
+        for record in objects:
+            rank = self._rank(record)
+            if rank is None:
+                continue
+            if len(heap) < self.n:
+                heapq.heappush(heap, (rank, bucket_name, record.key, record))
+            elif rank >= heap[0][0]:
+                # Ties are broken by bucket and key, so results do not depend on page arrival order
+                entry = (rank, bucket_name, record.key, record)
+                if entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+    
+    def results(self) -> list:
+        """(bucket_name, record) pairs, highest rank first"""
+        return [(bucket_name, record) for _, bucket_name, _, record in sorted(self._heap, reverse=True)]
+
+
+def parse_list_objects_xml(xml_content: str) -> dict:
+    """Parse a complete ListObjects/ListObjectsV2 response"""
+    parser = ListObjectsParser()
+    objects = parser.feed(xml_content.encode('utf-8'))
+    objects.extend(parser.close())
+    return parser.page(objects)
+
+
+# Character classes used to derive start-after split points from a known key
+_SHARD_SPLIT_CLASSES = (
+    "0123456789",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "abcdefghijklmnopqrstuvwxyz",
+)
+
+
+def key_split_boundaries(after_key: str, prefix: str = "") -> list:
+    """Return sorted split points greater than after_key for a flat key space.
+    
+    For every position past the prefix, keys sharing after_key's head but with a
+    larger character at that position start a new range (after_key "obj-0042"
+    yields "obj-0043".."obj-0049", "obj-005".."obj-009", ...). The result is a
+    logarithmic ladder that works without knowing how many keys follow.
+    """
+    boundaries = set()
+    for position in range(len(prefix), len(after_key)):
+        char = after_key[position]
+        for chars in _SHARD_SPLIT_CLASSES:
+            if char in chars:
+                head = after_key[:position]
+                boundaries.update(head + c for c in chars if c > char)
+                break
+    return sorted(boundaries)
+
+
+def _spread(items: list, count: int) -> list:
+    """Pick `count` items spread evenly across a sorted list"""
+    if count <= 0:
+        return []
+    if len(items) <= count:
+        return list(items)
+    step = len(items) / count
+    return [items[int(i * step)] for i in range(count)]
+
+
+# An S3 error document (as opposed to a result that contains <Error> entries)
+XML_ERROR_DOCUMENT = re.compile(rb"\s*(<\?xml[^>]*\?>\s*)?<Error>")
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+STREAMING_PAYLOAD = "STREAMING-AWS4-HMAC-SHA256-PAYLOAD"
+
+
+class ChunkSigner:
+    """Signs the chunks of an aws-chunked (STREAMING-AWS4-HMAC-SHA256-PAYLOAD) body.
+    
+    Each chunk's signature chains from the previous one, starting with the
+    seed signature of the request, so the body is hashed as it is sent
+    instead of in a separate pass up front.
+    """
+    
+    def __init__(self, signing_key: bytes, amz_date: str, credential_scope: str, seed_signature: str):
+        self._signing_key = signing_key
+        self._prefix = f"AWS4-HMAC-SHA256-PAYLOAD\n{amz_date}\n{credential_scope}\n"
+        self._previous_signature = seed_signature
+    
+    @staticmethod
+    def encoded_length(decoded_length: int, chunk_size: int) -> int:
+        """Content-Length of the aws-chunked encoding of a body"""
+        def frame(size: int) -> int:
+            # hex(size);chunk-signature=<64 hex>\r\n<data>\r\n
+            return len(f"{size:x}") + len(";chunk-signature=") + 64 + 2 + size + 2
+        
+        full_chunks, remainder = divmod(decoded_length, chunk_size)
+        length = full_chunks * frame(chunk_size) + frame(0)
+        if remainder:
+            length += frame(remainder)
+        return length
+    
+    def encode(self, chunk: bytes) -> bytes:
+        """Frame and sign one chunk; an empty chunk terminates the body"""
+        string_to_sign = (
+            f"{self._prefix}{self._previous_signature}\n{EMPTY_SHA256}\n"
+            f"{hashlib.sha256(chunk).hexdigest()}"
+        )
+        signature = hmac.new(self._signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        self._previous_signature = signature
+        return f"{len(chunk):x};chunk-signature={signature}\r\n".encode() + bytes(chunk) + b"\r\n"
+
+
+class SigV4Signer:
+    """AWS Signature Version 4 signer for S3-compatible Object Storage.
+    
+    The derived signing key only changes with the date, so it is cached per
+    (date, region, service) instead of being re-derived with four HMACs for
+    every request.
+    """
+    
+    ALGORITHM = "AWS4-HMAC-SHA256"
+    
+    def __init__(self, access_key: str, secret_key: str, region: str = "us-east-1", service: str = "s3"):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.service = service
+        self._signing_keys = {}
+    
+    def signing_key(self, date_stamp: str) -> bytes:
+        """Return the (cached) signing key for a YYYYMMDD date"""
+        cache_key = (date_stamp, self.region, self.service)
+        key = self._signing_keys.get(cache_key)
+        if key is None:
+            def sign(key, msg):
+                return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+            
+            k_date = sign(f"AWS4{self.secret_key}".encode(), date_stamp)
+            k_region = sign(k_date, self.region)
+            k_service = sign(k_region, self.service)
+            key = sign(k_service, "aws4_request")
+            
+            # Only the current (and possibly previous) day is ever needed
+            if len(self._signing_keys) >= 4:
+                self._signing_keys.clear()
+            self._signing_keys[cache_key] = key
+        return key
+    
+    @staticmethod
+    def canonical_uri(path: str) -> str:
+        """URI-encode a path once, leaving '/' intact (S3 does not double-encode)"""
+        return quote(unquote(path or "/"), safe="/~")
+    
+    @staticmethod
+    def canonical_query(query: str = "", params: Optional[dict] = None) -> str:
+        """Canonical query string from a URL query and extra params.
+        
+        Subresources without a value (e.g. "?policy") become "policy=".
+        """
+        pairs = parse_qsl(query, keep_blank_values=True)
+        if params:
+            pairs.extend((k, "" if v is None else v) for k, v in params.items())
+        encoded = sorted((quote(str(k), safe="-_.~"), quote(str(v), safe="-_.~")) for k, v in pairs)
+        return "&".join(f"{k}={v}" for k, v in encoded)
+    
+    def sign(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        payload_hash: str,
+        now: Optional[datetime] = None
+    ) -> str:
+        """Add SigV4 headers to `headers` in place and return the signature.
+        
+        The URL must already be in canonical form (see ZadaraClient._object_url).
+        Signed headers are host plus every x-amz-* header present.
+        """
+        parsed = urlparse(url)
+        now = now or datetime.utcnow()
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+        
+        headers["Host"] = parsed.netloc
+        headers["x-amz-date"] = amz_date
+        headers["x-amz-content-sha256"] = payload_hash
+        
+        canonical = sorted(
+            (name.lower(), " ".join(str(value).split()))
+            for name, value in headers.items()
+            if name.lower() == "host" or name.lower().startswith("x-amz-")
+        )
+        canonical_headers = "".join(f"{name}:{value}\n" for name, value in canonical)
+        signed_headers = ";".join(name for name, _ in canonical)
+        
+        canonical_request = (
+            f"{method}\n{parsed.path or '/'}\n{parsed.query}\n"
+            f"{canonical_headers}\n{signed_headers}\n{payload_hash}"
+        )
+        credential_scope = f"{date_stamp}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = (
+            f"{self.ALGORITHM}\n{amz_date}\n{credential_scope}\n"
+            f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+        )
+        signature = hmac.new(
+            self.signing_key(date_stamp), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        
+        headers["Authorization"] = (
+            f"{self.ALGORITHM} Credential={self.access_key}/{credential_scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        return signature
+    
+    def presign(self, method: str, url: str, expires_in: int, now: Optional[datetime] = None) -> str:
+        """Return `url` with a SigV4 query-string signature valid for expires_in seconds.
+        
+        Only the host header is signed and the payload is UNSIGNED-PAYLOAD, so
+        any HTTP client can use the URL without extra headers.
+        """
+        parsed = urlparse(url)
+        now = now or datetime.utcnow()
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+        credential_scope = f"{date_stamp}/{self.region}/{self.service}/aws4_request"
+        
+        query = self.canonical_query(parsed.query, {
+            "X-Amz-Algorithm": self.ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key}/{credential_scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": "host",
+        })
+        canonical_request = (
+            f"{method}\n{parsed.path or '/'}\n{query}\n"
+            f"host:{parsed.netloc}\n\nhost\n{UNSIGNED_PAYLOAD}"
+        )
+        string_to_sign = (
+            f"{self.ALGORITHM}\n{amz_date}\n{credential_scope}\n"
+            f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+        )
+        signature = hmac.new(
+            self.signing_key(date_stamp), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        return urlunparse(parsed._replace(query=f"{query}&X-Amz-Signature={signature}"))
+    
+    def chunk_signer(self, headers: dict, seed_signature: str) -> ChunkSigner:
+        """ChunkSigner for a request signed with STREAMING_PAYLOAD"""
+        amz_date = headers["x-amz-date"]
+        credential_scope = f"{amz_date[:8]}/{self.region}/{self.service}/aws4_request"
+        return ChunkSigner(self.signing_key(amz_date[:8]), amz_date, credential_scope, seed_signature)
+
+
+class ResponseCache:
+    """LRU cache of API responses with a per-entry TTL, grouped by resource family.
+    
+    Entries are kept in an OrderedDict in least-recently-used order; expired
+    entries are dropped when they are looked up, and the oldest entry is
+    evicted once max_entries is reached. invalidate(family) drops every entry
+    of a family, so a write never leaves a stale listing behind.
+    
+    invalidate() also bumps the family's generation. A caller snapshots
+    generation(family) before fetching and passes it to put(); a response
+    fetched before a write finished is then not cached.
+    """
+    
+    def __init__(self, max_entries: int = VPSA_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key: tuple) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+    
+    def generation(self, family: str) -> tuple:
+        """Changes whenever the family (or the whole cache) is invalidated"""
+        return (self._epoch, self._generations.get(family, 0))
+    
+    def put(self, key: tuple, value: Any, ttl: float, generation: Optional[tuple] = None):
+        """Cache value for ttl seconds; key[0] is the resource family.
+        
+        With generation (from generation() before the value was fetched),
+        the value is dropped if the family was invalidated since.
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation(key[0]):
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, family: Optional[str] = None) -> int:
+        """Drop all entries of a family (or everything); returns the number dropped"""
+        if family is None:
+            self._epoch += 1
+            stale = list(self._entries)
+        else:
+            self._generations[family] = self._generations.get(family, 0) + 1
+            stale = [key for key in self._entries if key[0] == family]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the requests in flight to one backend endpoint.
+    
+    Every success raises the limit by 1/limit (about +1 per round of
+    requests); a throttling response halves it. Only requests started after
+    the last decrease can trigger another one, since the responses to one
+    burst all report the same congestion. Callers beyond the limit wait in
+    FIFO order.
+    """
+    
+    def __init__(self, max_limit: int, min_limit: int = ADAPTIVE_MIN_CONCURRENCY):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.throttled = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters = deque()
+    
+    async def acquire(self) -> float:
+        """Wait for a free slot; returns the start time to pass to release()"""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+        return time.monotonic()
+    
+    def release(self, started: float, success: bool = True, throttled: bool = False):
+        """Free a slot and adjust the limit from the request's outcome"""
+        self.in_flight -= 1
+        if throttled:
+            self.throttled += 1
+            if started >= self._last_decrease:
+                self._last_decrease = time.monotonic()
+                self.limit = max(self.min_limit, self.limit / 2)
+                self.decreases += 1
+        elif success and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+    
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+    
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "throttled": self.throttled,
+            "decreases": self.decreases
+        }
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests per second with bursts of up to `burst`.
+    
+    A caller takes a token straight away and, if the bucket is in deficit,
+    sleeps until its token has been earned; callers are therefore spaced
+    1/rate apart in arrival order. A rate of 0 disables the limit.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.delayed = 0
+        self.waited = 0.0
+    
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate) - 1
+        self.updated = now
+        if self.tokens < 0:
+            delay = -self.tokens / self.rate
+            self.delayed += 1
+            self.waited += delay
+            await asyncio.sleep(delay)
+    
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "delayed": self.delayed,
+            "waited_seconds": round(self.waited, 3)
+        }
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an endpoint's circuit is open"""
+
+
+class CircuitBreaker:
+    """Fail fast while a backend endpoint is down.
+    
+    Callers record one outcome per request, after its retries. After
+    `threshold` consecutive failed requests (transport errors or
+    CIRCUIT_FAILURE_STATUS responses) the circuit opens and requests raise
+    CircuitOpenError immediately. Once `reset_timeout` seconds have passed,
+    one probe request is let through (half-open): success closes the
+    circuit, failure opens it again.
+    """
+    
+    def __init__(self, name: str, threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.opened = 0
+        self.rejected = 0
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+    
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        if self.opened_at is None:
+            return
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0 or self.probing:
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"{self.name} unavailable after {self.failures} consecutive failures; "
+                f"failing fast (next probe in {max(0.0, remaining):.0f}s)"
+            )
+        self.probing = True
+    
+    def record(self, failed: bool):
+        if not failed:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+            return
+        self.failures += 1
+        if self.probing or (self.threshold > 0 and self.failures >= self.threshold):
+            if self.opened_at is None or self.probing:
+                self.opened += 1
+            self.opened_at = time.monotonic()
+            self.probing = False
+    
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected
+        }
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before retry number attempt + 1.
+    
+    Honors Retry-After (seconds or an HTTP date) when the response has one;
+    otherwise exponential backoff with full jitter. Capped at RETRY_MAX_DELAY.
+    """
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(RETRY_MAX_DELAY, max(0.0, delay))
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls into one in-flight request.
+    
+    The first caller for a key starts the request as a task; callers that
+    arrive while it is running await the same task and share its result
+    (or exception). The key is forgotten as soon as the task finishes, so
+    nothing is cached beyond the request's own lifetime. Callers await the
+    task through asyncio.shield, so one caller being cancelled does not
+    cancel the request for the others.
+    """
+    
+    def __init__(self):
+        self._inflight = {}
+        self.leaders = 0
+        self.coalesced = 0
+    
+    async def do(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        """Return the result of factory() (a coroutine), shared by concurrent callers with the same key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "requests": self.leaders,
+            "coalesced": self.coalesced
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (LATENCY_BUCKETS), cheap enough to update on every call.
+    
+    Percentiles are estimated by linear interpolation inside the bucket
+    that holds them, as Prometheus' histogram_quantile does, and capped at
+    the largest value observed.
+    """
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+    
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3)
+        }
+    
+    def prometheus(self, name: str, labels: str) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ToolMetrics:
+    """Counters and latency of one tool"""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.in_flight = 0
+
+
+class EndpointMetrics:
+    """Counters and latency of the requests sent to one backend endpoint"""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.responses = {}
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+
+
+class Metrics:
+    """Server-wide tool and backend request metrics.
+    
+    Tool calls are recorded by call_tool and every HTTP request by
+    MeteredTransport, so retries, multipart parts and range reads each count
+    as a request. Reported by the server_stats tool, the zadara://server/stats
+    resource and, when ZADARA_METRICS_PROMETHEUS_FILE is set, a Prometheus
+    text file.
+    """
+    
+    def __init__(self):
+        self.started = time.time()
+        self.tools = {}
+        self.endpoints = {}
+        self.loop_lag = LatencyHistogram()
+        self.loop_lag_last = 0.0
+    
+    def tool(self, name: str) -> ToolMetrics:
+        tool_metrics = self.tools.get(name)
+        if tool_metrics is None:
+            tool_metrics = self.tools[name] = ToolMetrics()
+        return tool_metrics
+    
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        endpoint_metrics = self.endpoints.get(endpoint)
+        if endpoint_metrics is None:
+            endpoint_metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return endpoint_metrics
+    
+    def reset(self):
+        """Drop all counters (gauges of calls still in flight restart at zero)"""
+        self.__init__()
+    
+    def snapshot(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "tools": {
+                name: {**m.latency.summary(), "errors": m.errors, "in_flight": m.in_flight}
+                for name, m in sorted(self.tools.items())
+            },
+            "backends": {
+                endpoint: {
+                    "requests": m.latency.count,
+                    "responses": dict(sorted(m.responses.items())),
+                    "errors": m.errors,
+                    "retries": m.retries,
+                    "bytes_sent": m.bytes_sent,
+                    "bytes_received": m.bytes_received,
+                    "in_flight": m.in_flight,
+                    "latency": m.latency.summary()
+                }
+                for endpoint, m in sorted(self.endpoints.items())
+            },
+            "event_loop": {
+                "lag_last_ms": round(self.loop_lag_last * 1000, 3),
+                "lag": self.loop_lag.summary()
+            },
+            "process": process_memory()
+        }
+    
+    def prometheus(self, client_stats: dict) -> str:
+        """Prometheus text exposition of the metrics and the client's cache and limiter state"""
+        lines = [
+            "# TYPE zadara_uptime_seconds gauge",
+            f"zadara_uptime_seconds {time.time() - self.started:.1f}",
+            "# TYPE zadara_tool_duration_seconds histogram"
+        ]
+        for name, m in sorted(self.tools.items()):
+            lines += m.latency.prometheus("zadara_tool_duration_seconds", f'tool="{name}"')
+        lines.append("# TYPE zadara_tool_errors_total counter")
+        lines += [f'zadara_tool_errors_total{{tool="{name}"}} {m.errors}' for name, m in sorted(self.tools.items())]
+        lines.append("# TYPE zadara_tools_in_flight gauge")
+        lines += [f'zadara_tools_in_flight{{tool="{name}"}} {m.in_flight}' for name, m in sorted(self.tools.items())]
+        
+        lines.append("# TYPE zadara_event_loop_lag_seconds histogram")
+        lines += self.loop_lag.prometheus("zadara_event_loop_lag_seconds", 'loop="main"')
+        memory = process_memory()
+        if memory["rss_bytes"] is not None:
+            lines += [
+                "# TYPE zadara_process_resident_memory_bytes gauge",
+                f"zadara_process_resident_memory_bytes {memory['rss_bytes']}"
+            ]
+        
+        lines.append("# TYPE zadara_backend_request_duration_seconds histogram")
+        for endpoint, m in sorted(self.endpoints.items()):
+            lines += m.latency.prometheus("zadara_backend_request_duration_seconds", f'endpoint="{endpoint}"')
+        lines.append("# TYPE zadara_backend_responses_total counter")
+        for endpoint, m in sorted(self.endpoints.items()):
+            lines += [
+                f'zadara_backend_responses_total{{endpoint="{endpoint}",code="{code}"}} {count}'
+                for code, count in sorted(m.responses.items())
+            ]
+        for metric, kind, attribute in (
+            ("zadara_backend_errors_total", "counter", "errors"),
+            ("zadara_backend_retries_total", "counter", "retries"),
+            ("zadara_backend_sent_bytes_total", "counter", "bytes_sent"),
+            ("zadara_backend_received_bytes_total", "counter", "bytes_received"),
+            ("zadara_backend_in_flight", "gauge", "in_flight")
+        ):
+            lines.append(f"# TYPE {metric} {kind}")
+            lines += [
+                f'{metric}{{endpoint="{endpoint}"}} {getattr(m, attribute)}'
+                for endpoint, m in sorted(self.endpoints.items())
+            ]
+        
+        cache = client_stats["vpsa_cache"]
+        lines += [
+            "# TYPE zadara_vpsa_cache_hits_total counter",
+            f"zadara_vpsa_cache_hits_total {cache['hits']}",
+            "# TYPE zadara_vpsa_cache_misses_total counter",
+            f"zadara_vpsa_cache_misses_total {cache['misses']}",
+            "# TYPE zadara_single_flight_coalesced_total counter",
+            f"zadara_single_flight_coalesced_total {client_stats['single_flight']['coalesced']}"
+        ]
+        for metric, kind, value in (
+            ("zadara_backend_concurrency_limit", "gauge", lambda e: e["concurrency"]["limit"]),
+            ("zadara_backend_throttled_total", "counter", lambda e: e["concurrency"]["throttled"]),
+            ("zadara_rate_limit_delayed_total", "counter", lambda e: e["rate_limit"]["delayed"]),
+            ("zadara_circuit_open", "gauge", lambda e: int(e["circuit"]["state"] != "closed")),
+            ("zadara_circuit_rejected_total", "counter", lambda e: e["circuit"]["rejected"])
+        ):
+            lines.append(f"# TYPE {metric} {kind}")
+            lines += [
+                f'{metric}{{endpoint="{endpoint}"}} {value(controls)}'
+                for endpoint, controls in client_stats["endpoints"].items()
+            ]
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path: str, client_stats: dict):
+        """Write the Prometheus text atomically (for node_exporter's textfile collector)"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.prometheus(client_stats))
+        os.replace(temporary, path)
+
+
+metrics = Metrics()
+
+
+def process_memory() -> dict:
+    """Current and peak resident set size of the server process (None where unavailable)"""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    peak = None
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+async def monitor_event_loop(interval: float = LOOP_LAG_INTERVAL):
+    """Record how late the event loop wakes up a sleeping task, every `interval` seconds.
+    
+    A lag well above zero means something blocks the loop (CPU-bound parsing
+    or encoding, synchronous I/O) and delays every other tool call.
+    """
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - started - interval)
+        metrics.loop_lag_last = lag
+        metrics.loop_lag.observe(lag)
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response body stream that counts bytes and reports once closed"""
+    
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[int], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self.received = 0
+    
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self.received += len(chunk)
+            yield chunk
+    
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close(self.received)
+                self._on_close = None
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper recording every request of one endpoint in Metrics.
+    
+    Latency runs from sending the request until its response body has been
+    read (or the stream closed), so streamed listings and downloads are
+    timed in full. Bytes sent are taken from Content-Length.
+    """
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport, endpoint: str, metrics: Metrics):
+        self._transport = transport
+        self._endpoint = endpoint
+        self._metrics = metrics
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        m = self._metrics.endpoint(self._endpoint)
+        m.bytes_sent += int(request.headers.get("content-length", 0))
+        m.in_flight += 1
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            m.in_flight -= 1
+            m.errors += 1
+            m.latency.observe(time.perf_counter() - started)
+            raise
+        
+        status = response.status_code
+        
+        def done(received: int):
+            m.in_flight -= 1
+            m.bytes_received += received
+            m.responses[status] = m.responses.get(status, 0) + 1
+            if status >= 500:
+                m.errors += 1
+            m.latency.observe(time.perf_counter() - started)
+        
+        return httpx.Response(
+            status_code=status,
+            headers=response.headers,
+            stream=_MeteredStream(response.stream, done),
+            extensions=response.extensions
+        )
+    
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class CallProfile:
+    """Profile one tool call with cProfile and tracemalloc.
+    
+    Used as a context manager around the handler and result encoding in
+    call_tool. On exit the top hotspots (by own time) and the allocation
+    sites that grew the most are written to a text report in PROFILE_DIR,
+    next to the raw cProfile stats (for pstats/snakeviz), and summary()
+    returns the same data as a dict.
+    
+    cProfile sees everything the event loop runs while the call is in
+    progress, including other concurrent tool calls. Only one call is
+    profiled at a time; a call that arrives while another is profiled runs
+    unprofiled and its summary says so.
+    """
+    
+    _active = False
+    
+    def __init__(self, tool_name: str, top_n: int = PROFILE_TOP_N, directory: str = PROFILE_DIR):
+        self.tool_name = tool_name
+        self.top_n = top_n
+        self.directory = directory
+        self.skipped = False
+        self.report = None
+    
+    def __enter__(self):
+        if CallProfile._active:
+            self.skipped = True
+            return self
+        CallProfile._active = True
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._baseline_memory = tracemalloc.get_traced_memory()[0]
+        self._baseline = tracemalloc.take_snapshot()
+        self._profiler = cProfile.Profile()
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.skipped:
+            return False
+        try:
+            self._profiler.disable()
+            elapsed = time.perf_counter() - self._started
+            peak = tracemalloc.get_traced_memory()[1] - self._baseline_memory
+            snapshot = tracemalloc.take_snapshot()
+            if self._started_tracing:
+                tracemalloc.stop()
+            self.report = self._build_report(elapsed, peak, snapshot)
+            self._write_report()
+        except OSError as e:
+            logger.warning("Could not write profile of %s: %s", self.tool_name, e)
+        finally:
+            CallProfile._active = False
+        return False
+    
+    def _build_report(self, elapsed: float, peak: int, snapshot: tracemalloc.Snapshot) -> dict:
+        stats = pstats.Stats(self._profiler)
+        hotspots = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top_n]
+        ignore = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        )
+        growth = snapshot.filter_traces(ignore).compare_to(self._baseline.filter_traces(ignore), "lineno")
+        return {
+            "tool": self.tool_name,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "peak_memory_bytes": max(0, peak),
+            "hotspots": [
+                {
+                    "function": function if file == "~" else f"{os.path.basename(file)}:{line}({function})",
+                    "calls": calls,
+                    "own_ms": round(own * 1000, 3),
+                    "cumulative_ms": round(cumulative * 1000, 3)
+                }
+                for (file, line, function), (_, calls, own, cumulative, _) in hotspots
+            ],
+            "allocations": [
+                {
+                    "location": f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                    "size_bytes": diff.size_diff,
+                    "count": diff.count_diff
+                }
+                for diff in growth[:self.top_n]
+                if diff.size_diff > 0
+            ]
+        }
+    
+    def _write_report(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base = os.path.join(self.directory, f"{stamp}-{self.tool_name}")
+        self._profiler.dump_stats(f"{base}.prof")
+        
+        text = io.StringIO()
+        report = self.report
+        text.write(
+            f"{report['tool']}: {report['elapsed_ms']} ms, "
+            f"peak traced memory {report['peak_memory_bytes']} bytes\n\n"
+        )
+        stats = pstats.Stats(self._profiler, stream=text)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top_n)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        text.write("Allocation growth by line:\n")
+        for allocation in report["allocations"]:
+            text.write(f"  {allocation['size_bytes']:>12} B {allocation['count']:>8} blocks  {allocation['location']}\n")
+        with open(f"{base}.txt", "w") as f:
+            f.write(text.getvalue())
+        report["report_file"] = f"{base}.txt"
+        report["stats_file"] = f"{base}.prof"
+    
+    def summary(self) -> dict:
+        if self.skipped:
+            return {"tool": self.tool_name, "skipped": "another tool call was being profiled"}
+        return self.report or {"tool": self.tool_name, "error": "profile could not be written"}
+
+
+def multipart_layout(size: int, part_size: int = MULTIPART_PART_SIZE) -> tuple:
+    """Return (part_size, part_count) for uploading `size` bytes.
+    
+    The part size grows beyond the requested one when needed to keep the
+    upload within MULTIPART_MAX_PARTS parts.
+    """
+    part_size = max(part_size, -(-size // MULTIPART_MAX_PARTS))
+    return part_size, max(1, -(-size // part_size))
+
+
+def vpsa_resource_family(endpoint: str) -> str:
+    """Resource family of a VPSA endpoint, e.g. "volumes/12.json" -> "volumes"."""
+    return endpoint.strip("/").split("/", 1)[0].split("?", 1)[0].removesuffix(".json")
+
+
+class ZadaraClient:
+    """Client for Zadara Storage APIs"""
+    
+    def __init__(self):
+        self.vpsa_base_url = VPSA_BASE_URL
+        self.vpsa_api_key = VPSA_API_KEY
+        self.object_storage_url = OBJECT_STORAGE_URL
+        self.object_access_key = OBJECT_STORAGE_ACCESS_KEY
+        self.object_secret_key = OBJECT_STORAGE_SECRET_KEY
+        
+        # Long-lived HTTP clients, one per endpoint ("vpsa" / "object").
+        # Reusing them keeps TCP+TLS connections alive between requests.
+        self._http_clients: dict = {}
+        
+        # Per-endpoint request controls applied by _retrying: rate limit,
+        # circuit breaker and adaptive concurrency limit
+        self.rate_limiters = {
+            "vpsa": TokenBucket(VPSA_RATE_LIMIT, VPSA_RATE_BURST),
+            "object": TokenBucket(OBJECT_RATE_LIMIT, OBJECT_RATE_BURST)
+        }
+        self.breakers = {
+            "vpsa": CircuitBreaker("VPSA API"),
+            "object": CircuitBreaker("Object Storage")
+        }
+        self.limiters = {
+            "vpsa": AdaptiveLimiter(HTTP_MAX_CONNECTIONS),
+            "object": AdaptiveLimiter(HTTP_MAX_CONNECTIONS)
+        }
+        
+        # Short-lived cache of read-only VPSA responses (see vpsa_request)
+        self.vpsa_cache = ResponseCache()
+        # Identical concurrent GETs share one backend request
+        self.single_flight = SingleFlight()
+        # Object Storage writes finished per bucket ("" for the service); keys
+        # coalesced GETs so a GET never joins one started before a write finished
+        self.object_write_generations = defaultdict(int)
+        
+        # Request metrics, recorded by each endpoint client's transport
+        self.metrics = metrics
+    
+    def _http_limits(self) -> httpx.Limits:
+        """Connection pool limits shared by all endpoint clients"""
+        return httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    
+    def _http2_available(self) -> bool:
+        """Return True if HTTP/2 is requested and the h2 package is installed"""
+        if not HTTP2_ENABLED:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("ZADARA_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+            return False
+        return True
+    
+    def _http(self, endpoint: str) -> httpx.AsyncClient:
+        """Get (or lazily create) the pooled HTTP client for an endpoint"""
+        http_client = self._http_clients.get(endpoint)
+        if http_client is None or http_client.is_closed:
+            transport = httpx.AsyncHTTPTransport(
+                limits=self._http_limits(),
+                http2=self._http2_available()
+            )
+            http_client = httpx.AsyncClient(transport=MeteredTransport(transport, endpoint, self.metrics))
+            self._http_clients[endpoint] = http_client
+        return http_client
+    
+    async def open(self):
+        """Create the pooled HTTP clients for all configured endpoints"""
+        if self.vpsa_base_url:
+            self._http("vpsa")
+        if self.object_storage_url:
+            self._http("object")
+    
+    async def close(self):
+        """Close all pooled HTTP clients"""
+        http_clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for http_client in http_clients:
+            await http_client.aclose()
+    
+    def stats(self) -> dict:
+        """Cache and per-endpoint request control state"""
+        return {
+            "vpsa_cache": self.vpsa_cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "endpoints": {
+                endpoint: {
+                    "concurrency": self.limiters[endpoint].stats(),
+                    "rate_limit": self.rate_limiters[endpoint].stats(),
+                    "circuit": self.breakers[endpoint].stats()
+                }
+                for endpoint in ("vpsa", "object")
+            }
+        }
+    
+    async def _retrying(
+        self,
+        endpoint: str,
+        method: str,
+        attempt: Callable,
+        idempotent: Optional[bool] = None,
+        attempts: int = RETRY_MAX_ATTEMPTS
+    ) -> Any:
+        """Run `await attempt()` under the endpoint's adaptive limiter, with retries.
+        
+        attempt() sends one request and raises httpx.HTTPStatusError for
+        error responses it does not handle. Transport errors and
+        RETRYABLE_STATUS responses are retried with backoff (honoring
+        Retry-After) when the request is idempotent - by default when the
+        method is. Other requests are only retried when they cannot have
+        been processed: throttled (429/503) or never sent (connect errors).
+        attempt() is called afresh each time, so it can re-sign the request
+        or resume where the previous try stopped.
+        
+        The request first passes the endpoint's circuit breaker (raising
+        CircuitOpenError while the backend is down), which records a single
+        outcome once the request succeeds or retries are exhausted; every
+        attempt passes the rate limiter.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        breaker = self.breakers[endpoint]
+        limiter = self.limiters[endpoint]
+        breaker.before_request()
+        # A request let through a half-open circuit is its probe; if it ends
+        # without an outcome (e.g. cancelled during backoff), release the slot
+        probe = breaker.probing
+        recorded = False
+        try:
+            for number in range(attempts):
+                last = number == attempts - 1
+                response = None
+                await self.rate_limiters[endpoint].acquire()
+                started = await limiter.acquire()
+                try:
+                    result = await attempt()
+                except httpx.HTTPStatusError as e:
+                    status = e.response.status_code
+                    limiter.release(started, throttled=status in THROTTLE_STATUS)
+                    retryable = status in RETRYABLE_STATUS and (idempotent or status in THROTTLE_STATUS)
+                    if last or not retryable:
+                        recorded = True
+                        breaker.record(failed=status in CIRCUIT_FAILURE_STATUS)
+                        raise
+                    response = e.response
+                    reason = f"HTTP {status}"
+                except httpx.TransportError as e:
+                    limiter.release(started, success=False)
+                    retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                    if last or not retryable:
+                        recorded = True
+                        breaker.record(failed=True)
+                        raise
+                    reason = type(e).__name__
+                except BaseException:
+                    limiter.release(started, success=False)
+                    raise
+                else:
+                    limiter.release(started)
+                    recorded = True
+                    breaker.record(failed=False)
+                    return result
+                
+                self.metrics.endpoint(endpoint).retries += 1
+                delay = retry_delay(number, response)
+                logger.warning(
+                    "%s %s request failed (%s); retry %d/%d in %.2fs",
+                    endpoint, method, reason, number + 1, attempts - 1, delay
+                )
+                await asyncio.sleep(delay)
+        finally:
+            if probe and not recorded:
+                breaker.probing = False
+    
+    async def _request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request with retries; error responses that are not retried are returned as-is"""
+        async def attempt() -> httpx.Response:
+            response = await self._http(endpoint).request(method, url, **kwargs)
+            if response.status_code in RETRYABLE_STATUS:
+                response.raise_for_status()
+            return response
+        
+        try:
+            return await self._retrying(endpoint, method, attempt, idempotent)
+        finally:
+            if endpoint == "object" and method.upper() not in ("GET", "HEAD"):
+                self._object_write_finished(url)
+    
+    def _object_write_finished(self, url: str):
+        """Advance the write generation of the bucket a write went to (and of the service for bucket-level writes).
+        
+        Called whether or not the write succeeded, since a failed or timed-out
+        write may still have been applied.
+        """
+        bucket, _, key = unquote(urlparse(url).path).strip("/").partition("/")
+        self.object_write_generations[bucket] += 1
+        if not key:
+            self.object_write_generations[""] += 1
+    
+    @property
+    def signer(self) -> SigV4Signer:
+        """SigV4 signer for the current Object Storage credentials"""
+        signer = getattr(self, "_signer", None)
+        if (
+            signer is None
+            or signer.access_key != self.object_access_key
+            or signer.secret_key != self.object_secret_key
+        ):
+            signer = self._signer = SigV4Signer(
+                self.object_access_key,
+                self.object_secret_key,
+                region=OBJECT_STORAGE_REGION
+            )
+        return signer
+    
+    def _object_url(self, endpoint: str, params: Optional[dict] = None) -> str:
+        """Object Storage URL with a canonical (encoded once) path and sorted query.
+        
+        The request is sent with exactly this URL so the path and query the
+        server sees match what was signed.
+        """
+        parsed = urlparse(urljoin(self.object_storage_url, endpoint))
+        return urlunparse(parsed._replace(
+            path=SigV4Signer.canonical_uri(parsed.path),
+            query=SigV4Signer.canonical_query(parsed.query, params)
+        ))
+    
+    def _object_key_url(self, bucket_name: str, object_key: str, params: Optional[dict] = None) -> str:
+        """URL of an object; the key is quoted so '?', '#' and '%' stay part of it"""
+        return self._object_url(f"/{bucket_name}/{quote(object_key, safe='/~')}", params)
+    
+    def _sign_aws_request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        payload: bytes = b"",
+        payload_hash: Optional[str] = None
+    ) -> dict:
+        """Generate AWS Signature V4 for request.
+        
+        payload_hash may be UNSIGNED_PAYLOAD or STREAMING_PAYLOAD to skip
+        hashing the body up front.
+        """
+        if not self.object_access_key or not self.object_secret_key:
+            return headers
+        
+        if payload_hash is None:
+            payload_hash = hashlib.sha256(payload).hexdigest()
+        self.signer.sign(method, url, headers, payload_hash)
+        return headers
+    
+    def _sign_streaming_upload(self, url: str, headers: dict, content: bytes) -> tuple:
+        """Sign a PUT with aws-chunked encoding; returns (headers, async body iterator)"""
+        chunk_size = S3_STREAMING_CHUNK_SIZE
+        headers["Content-Encoding"] = "aws-chunked"
+        headers["x-amz-decoded-content-length"] = str(len(content))
+        headers["Content-Length"] = str(ChunkSigner.encoded_length(len(content), chunk_size))
+        seed_signature = self.signer.sign("PUT", url, headers, STREAMING_PAYLOAD)
+        chunk_signer = self.signer.chunk_signer(headers, seed_signature)
+        
+        async def body():
+            view = memoryview(content)
+            for offset in range(0, len(content), chunk_size):
+                yield chunk_signer.encode(view[offset:offset + chunk_size])
+            yield chunk_signer.encode(b"")
+        
+        return headers, body()
+    
+    async def vpsa_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[dict] = None,
+        params: Optional[dict] = None
+    ) -> dict:
+        """Make a request to VPSA API.
+        
+        GET responses for families listed in VPSA_CACHE_TTLS are served from
+        the response cache while fresh, and identical concurrent GETs are
+        coalesced into one request. Any other method invalidates the cached
+        responses of the endpoint's family (and related families) once it
+        succeeds. A GET only shares the request of, and only caches, a
+        response fetched entirely after the last such invalidation.
+        """
+        if not self.vpsa_base_url or not self.vpsa_api_key:
+            raise ValueError("VPSA credentials not configured")
+        
+        method = method.upper()
+        family = vpsa_resource_family(endpoint)
+        if method != "GET":
+            result = await self._vpsa_send(method, endpoint, data, params)
+            for stale in (family, *VPSA_CACHE_RELATED.get(family, ())):
+                self.vpsa_cache.invalidate(stale)
+            return result
+        
+        request_key = (
+            family,
+            self.vpsa_base_url,
+            endpoint,
+            json.dumps(params, sort_keys=True, default=str) if params else ""
+        )
+        ttl = VPSA_CACHE_TTLS.get(family, 0)
+        if ttl > 0:
+            cached = self.vpsa_cache.get(request_key)
+            if cached is not None:
+                return cached
+        
+        # Snapshot before sending: a write finishing meanwhile makes this response stale
+        generation = self.vpsa_cache.generation(family)
+        # Concurrent identical GETs (e.g. parallel tool calls) share one request;
+        # keyed by generation, so a GET never joins one started before a write finished
+        result = await self.single_flight.do(
+            ("vpsa", generation, *request_key),
+            lambda: self._vpsa_send(method, endpoint, data, params)
+        )
+        if ttl > 0:
+            self.vpsa_cache.put(request_key, result, ttl, generation)
+        return result
+    
+    async def _vpsa_send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[dict],
+        params: Optional[dict]
+    ) -> dict:
+        """Send one request to the VPSA API and return the decoded JSON"""
+        url = urljoin(self.vpsa_base_url, f"/api/{endpoint}")
+        headers = {
+            "X-Access-Key": self.vpsa_api_key,
+            "Content-Type": "application/json"
+        }
+        
+        response = await self._request(
+            "vpsa",
+            method,
+            url,
+            headers=headers,
+            json=data,
+            params=params,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def _prepare_object_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[dict] = None,
+        content_type: str = "application/json",
+        params: Optional[dict] = None
+    ) -> tuple:
+        """Build the URL, signed headers and body for an Object Storage request"""
+        if not self.object_storage_url:
+            raise ValueError("Object Storage URL not configured")
+        
+        url = self._object_url(endpoint, params)
+        
+        # Prepare request body
+        body = b""
+        if data:
+            body = json.dumps(data).encode('utf-8')
+        
+        # Prepare headers for AWS Signature V4
+        headers = {
+            "Content-Type": content_type
+        }
+        
+        # Add AWS Signature V4 authentication if credentials are provided
+        if self.object_access_key and self.object_secret_key:
+            headers = self._sign_aws_request(method, url, headers, body)
+        
+        return url, headers, body
+    
+    async def object_storage_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[dict] = None,
+        params: Optional[dict] = None,
+        content_type: str = "application/json"
+    ) -> dict:
+        """Make a request to Object Storage API with AWS Signature V4.
+        
+        Identical concurrent GETs are coalesced into a single request, but
+        only with a GET started after the last write to the same bucket
+        finished (see _object_write_finished).
+        """
+        url, headers, body = self._prepare_object_request(method, endpoint, data, content_type, params)
+        if method.upper() == "GET" and not body:
+            bucket = unquote(urlparse(url).path).strip("/").partition("/")[0]
+            return await self.single_flight.do(
+                ("object", self.object_write_generations[bucket], url, content_type),
+                lambda: self._object_send(method, url, headers, body)
+            )
+        return await self._object_send(method, url, headers, body)
+    
+    async def _object_send(self, method: str, url: str, headers: dict, body: bytes) -> dict:
+        """Send one signed Object Storage request and decode the response"""
+        response = await self._request(
+            "object",
+            method,
+            url,
+            headers=headers,
+            content=body if body else None,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        
+        # Handle different response types
+        content_type_header = response.headers.get("content-type", "")
+        if "application/json" in content_type_header:
+            return response.json()
+        elif "application/xml" in content_type_header or "text/xml" in content_type_header:
+            # For XML responses (like S3 ListBucket), return the text
+            return {"xml_content": response.text}
+        else:
+            return {"content": response.text, "status_code": response.status_code}
+    
+    async def list_objects_page(
+        self,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        continuation_token: Optional[str] = None,
+        start_after: Optional[str] = None,
+        max_keys: int = 1000
+    ) -> dict:
+        """Fetch one ListObjectsV2 page, parsing the XML as it streams in"""
+        params = {"list-type": "2", "max-keys": str(max_keys)}
+        if prefix:
+            params["prefix"] = prefix
+        if delimiter:
+            params["delimiter"] = delimiter
+        if continuation_token:
+            params["continuation-token"] = continuation_token
+        elif start_after:
+            params["start-after"] = start_after
+        
+        url, headers, _ = self._prepare_object_request("GET", f"/{bucket_name}", params=params)
+        
+        async def fetch() -> dict:
+            # A retry re-reads the page from the start with a fresh parser
+            parser = ListObjectsParser()
+            objects = []
+            async with self._http("object").stream(
+                "GET",
+                url,
+                headers=headers,
+                timeout=30.0
+            ) as response:
+                response.raise_for_status()
+                content_type_header = response.headers.get("content-type", "")
+                if "xml" not in content_type_header:
+                    return parser.page(objects)
+                async for chunk in response.aiter_bytes():
+                    objects.extend(parser.feed(chunk))
+            
+            objects.extend(parser.close())
+            return parser.page(objects)
+        
+        return await self._retrying("object", "GET", fetch)
+    
+    async def list_objects(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        delimiter: Optional[str] = None,
+        continuation_token: Optional[str] = None,
+        start_after: Optional[str] = None,
+        max_keys: int = 1000,
+        max_bytes: Optional[int] = None,
+        paginate: bool = False,
+        match: Optional[Callable[[ObjectRecord], bool]] = None
+    ) -> dict:
+        """List objects with ListObjectsV2: one page, or with paginate every page in turn.
+        
+        Stops once max_keys entries (objects and common prefixes) or about
+        max_bytes of records (see record_json_size) have been collected.
+        With match, only objects it accepts are collected, as each page
+        arrives, and the listing stops as soon as max_keys of them are
+        found. Returns the objects, common prefixes, page and scanned key
+        counts, plus where to resume: next_token, or start_after when the
+        listing stopped mid-page (both None once the listing is complete).
+        """
+        objects = []
+        common_prefixes = []
+        used_bytes = 0
+        pages = 0
+        scanned = 0
+        while True:
+            remaining = max_keys - len(objects) - len(common_prefixes)
+            page = await self.list_objects_page(
+                bucket_name,
+                prefix=prefix,
+                delimiter=delimiter,
+                continuation_token=continuation_token,
+                start_after=start_after,
+                # Without a filter every key counts, so no page needs more than the budget
+                max_keys=1000 if match else max(1, min(1000, remaining))
+            )
+            pages += 1
+            scanned += len(page["objects"])
+            page_objects = page["objects"] if match is None else [o for o in page["objects"] if match(o)]
+            page_prefixes = page["common_prefixes"]
+            next_token = page["next_token"] if page["is_truncated"] else None
+            
+            if max_bytes is not None or len(page_objects) + len(page_prefixes) > remaining:
+                # Walk the page in key order until the key or byte budget is spent
+                entries = sorted([(o.key, o) for o in page_objects] + [(p, None) for p in page_prefixes])
+                for index, (name, record) in enumerate(entries):
+                    size = record_json_size(record) if record is not None else len(name) + 4
+                    over_bytes = max_bytes is not None and used_bytes + size > max_bytes
+                    if index >= remaining or (over_bytes and (objects or common_prefixes or index)):
+                        kept = entries[:index]
+                        objects.extend(r for _, r in kept if r is not None)
+                        common_prefixes.extend(n for n, r in kept if r is None)
+                        if not kept:
+                            # Nothing of this page fits: resume where the page started
+                            return self._listing(
+                                objects, common_prefixes, pages, scanned, continuation_token, start_after
+                            )
+                        name, record = kept[-1]
+                        # After a common prefix, resume past every key below it
+                        resume = name if record is not None else name + "\U0010ffff"
+                        return self._listing(objects, common_prefixes, pages, scanned, None, resume)
+                    used_bytes += size
+            
+            objects.extend(page_objects)
+            common_prefixes.extend(page_prefixes)
+            full = len(objects) + len(common_prefixes) >= max_keys
+            if next_token is None or full or not paginate:
+                return self._listing(objects, common_prefixes, pages, scanned, next_token, None)
+            continuation_token = next_token
+            start_after = None
+    
+    @staticmethod
+    def _listing(objects: list, common_prefixes: list, pages: int, scanned: int, next_token, start_after) -> dict:
+        return {
+            "objects": objects,
+            "common_prefixes": common_prefixes,
+            "pages": pages,
+            "scanned": scanned,
+            "next_token": next_token,
+            "start_after": start_after
+        }
+    
+    async def list_key_range(
+        self,
+        bucket_name: str,
+        on_page: Callable[[list], Optional[Awaitable[None]]],
+        prefix: str = "",
+        start_after: Optional[str] = None,
+        end_key: Optional[str] = None
+    ):
+        """List keys in the range (start_after, end_key], calling on_page(objects) for each page.
+        
+        If on_page returns a coroutine it is awaited before the next page is
+        requested, so a slow consumer holds the listing back.
+        """
+        continuation_token = None
+        while True:
+            page = await self.list_objects_page(
+                bucket_name,
+                prefix=prefix,
+                continuation_token=continuation_token,
+                start_after=start_after
+            )
+            objects = page["objects"]
+            done = not page["is_truncated"] or not page["next_token"]
+            
+            if end_key is not None and objects and objects[-1].key > end_key:
+                # Reached the next shard's range
+                objects = [o for o in objects if o.key <= end_key]
+                done = True
+            
+            if objects:
+                pending = on_page(objects)
+                if asyncio.iscoroutine(pending):
+                    await pending
+            if done:
+                return
+            continuation_token = page["next_token"]
+    
+    async def discover_shard_boundaries(
+        self,
+        bucket_name: str,
+        after_key: str,
+        prefix: str = "",
+        max_shards: int = LIST_MAX_SHARDS,
+        delimiter: str = "/",
+        max_guesses: int = LIST_SHARD_CONCURRENCY
+    ) -> list:
+        """Split the key space after after_key into at most max_shards ranges.
+        
+        Returns sorted, de-duplicated boundary keys; shard i covers
+        (boundary[i-1], boundary[i]]. CommonPrefixes from a delimiter listing
+        are preferred; up to max_guesses split points derived from after_key
+        fill the remaining slots so flat or single-directory key spaces are
+        still sharded. Those are guesses that may cut empty ranges, each
+        costing a request, so only a few are used.
+        """
+        page = await self.list_objects_page(
+            bucket_name,
+            prefix=prefix,
+            delimiter=delimiter,
+            start_after=after_key
+        )
+        
+        # A common prefix can be repeated across pages or sort before after_key
+        # (the prefix containing after_key itself); both would create empty or
+        # overlapping shards.
+        prefixes = sorted({p for p in page["common_prefixes"] if p > after_key})
+        slots = max_shards - 1
+        if len(prefixes) >= slots:
+            return _spread(prefixes, slots)
+        
+        extra = [b for b in key_split_boundaries(after_key, prefix) if b not in prefixes]
+        return sorted(set(prefixes) | set(_spread(extra, min(slots - len(prefixes), max_guesses))))
+    
+    async def scan_objects(
+        self,
+        bucket_name: str,
+        on_page: Callable[[int, list], Optional[Awaitable[None]]],
+        prefix: str = "",
+        concurrency: int = LIST_SHARD_CONCURRENCY,
+        max_shards: int = LIST_MAX_SHARDS,
+        on_shard_done: Optional[Callable[[int], None]] = None,
+        start_after: Optional[str] = None,
+        serial_pages: int = LIST_SHARD_AFTER_PAGES
+    ) -> int:
+        """List every object under prefix (after start_after), listing key-range shards in parallel.
+        
+        The first serial_pages pages are listed in turn as shard 0; only a
+        listing still truncated after them is split into key-range shards.
+        on_page(shard_index, objects) is called for each page; a coroutine it
+        returns is awaited before that shard lists further. Shards are
+        numbered in key order, so concatenating pages by shard index yields the
+        listing in key order. on_shard_done(shard_index) is called once a
+        shard has delivered its last page. Returns the number of shards used.
+        """
+        page = await self.list_objects_page(bucket_name, prefix=prefix, start_after=start_after)
+        pages = 1
+        while True:
+            if page["objects"]:
+                pending = on_page(0, page["objects"])
+                if asyncio.iscoroutine(pending):
+                    await pending
+            done = not page["is_truncated"] or not page["next_token"] or not page["objects"]
+            if done or pages >= serial_pages:
+                break
+            page = await self.list_objects_page(bucket_name, prefix=prefix, continuation_token=page["next_token"])
+            pages += 1
+        if on_shard_done is not None:
+            on_shard_done(0)
+        if done:
+            return 1
+        
+        after_key = page["objects"][-1].key
+        boundaries = []
+        if max_shards > 1:
+            boundaries = await self.discover_shard_boundaries(
+                bucket_name, after_key, prefix, max_shards, max_guesses=concurrency
+            )
+        ranges = list(zip([after_key] + boundaries, boundaries + [None]))
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def list_shard(index: int, start_after: str, end_key: Optional[str]):
+            async with semaphore:
+                await self.list_key_range(
+                    bucket_name,
+                    lambda objects: on_page(index, objects),
+                    prefix=prefix,
+                    start_after=start_after,
+                    end_key=end_key
+                )
+            if on_shard_done is not None:
+                on_shard_done(index)
+        
+        tasks = [
+            asyncio.ensure_future(list_shard(i + 1, start_after, end_key))
+            for i, (start_after, end_key) in enumerate(ranges)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return len(ranges) + 1
+    
+    async def list_objects_parallel(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        start_after: Optional[str] = None,
+        max_keys: int = LIST_PAGINATE_MAX_KEYS,
+        max_bytes: Optional[int] = None,
+        match: Optional[Callable[[ObjectRecord], bool]] = None
+    ) -> dict:
+        """List objects with scan_objects until max_keys or about max_bytes of records are collected.
+        
+        Each shard's pages arrive in key order, so once the finished shards
+        before some shard plus the pages that shard has delivered so far hold
+        max_keys objects (accepted by match) or more than max_bytes of records
+        (see record_json_size), nothing still being listed can sort before
+        them and the remaining shard scans are cancelled. Returns the objects
+        in key order, the number of shards (when stopped early, those that
+        had returned pages), the scanned key count, and start_after to resume
+        from (None once the listing is complete).
+        """
+        shard_pages = {}
+        shard_totals = {}
+        finished = set()
+        scanned = 0
+        
+        def budget_reached() -> bool:
+            count = used_bytes = 0
+            index = 0
+            while True:
+                shard_count, shard_bytes = shard_totals.get(index, (0, 0))
+                count += shard_count
+                used_bytes += shard_bytes
+                if count >= max_keys or (max_bytes is not None and used_bytes > max_bytes):
+                    return True
+                if index not in finished:
+                    return False
+                index += 1
+        
+        def on_page(shard_index: int, objects: list):
+            nonlocal scanned
+            scanned += len(objects)
+            if match is not None:
+                objects = [o for o in objects if match(o)]
+            shard_pages.setdefault(shard_index, []).append(objects)
+            count, used_bytes = shard_totals.get(shard_index, (0, 0))
+            if max_bytes is not None:
+                used_bytes += sum(record_json_size(o) for o in objects)
+            shard_totals[shard_index] = (count + len(objects), used_bytes)
+            if budget_reached():
+                raise _ScanStopped()
+        
+        try:
+            shards = await self.scan_objects(
+                bucket_name, on_page, prefix=prefix, start_after=start_after, on_shard_done=finished.add
+            )
+            stopped = False
+        except _ScanStopped:
+            shards = len(shard_pages)
+            stopped = True
+        
+        objects = [o for index in sorted(shard_pages) for page in shard_pages[index] for o in page]
+        kept = min(len(objects), max_keys)
+        if max_bytes is not None:
+            used_bytes = 0
+            for index, record in enumerate(objects[:kept]):
+                used_bytes += record_json_size(record)
+                # Like list_objects, always return at least one record
+                if used_bytes > max_bytes and index:
+                    kept = index
+                    break
+        objects = objects[:kept]
+        return {
+            "objects": objects,
+            "shards": shards,
+            "scanned": scanned,
+            "start_after": objects[-1].key if stopped and objects else None
+        }
+    
+    async def calculate_bucket_size(
+        self,
+        bucket_name: str,
+        concurrency: int = LIST_SHARD_CONCURRENCY
+    ) -> tuple:
+        """Return (total_size_bytes, object_count) for a bucket"""
+        totals = [0, 0]
+        
+        def add_page(shard_index: int, objects: list):
+            totals[0] += sum(o.size for o in objects)
+            totals[1] += len(objects)
+        
+        await self.scan_objects(bucket_name, add_page, concurrency=concurrency)
+        return totals[0], totals[1]
+    
+    async def scan_top_objects(
+        self,
+        bucket_name: str,
+        top: TopObjects,
+        prefix: str = "",
+        match: Optional[Callable[[ObjectRecord], bool]] = None,
+        concurrency: int = LIST_SHARD_CONCURRENCY
+    ) -> int:
+        """Feed every object of a bucket (accepted by match) to top; return the number scanned"""
+        scanned = [0]
+        
+        def add_page(shard_index: int, objects: list):
+            scanned[0] += len(objects)
+            top.add(bucket_name, objects if match is None else [o for o in objects if match(o)])
+        
+        await self.scan_objects(bucket_name, add_page, prefix=prefix, concurrency=concurrency)
+        return scanned[0]
+    
+    async def list_bucket_names(self) -> list:
+        """Names of all buckets (ListAllMyBuckets), with or without the S3 namespace"""
+        result = await self.object_storage_request("GET", "/")
+        if "xml_content" not in result:
+            return []
+        root = ET.fromstring(result["xml_content"])
+        bucket_names = []
+        for bucket in root.iter():
+            if bucket.tag.rpartition('}')[2] != 'Bucket':
+                continue
+            for child in bucket:
+                if child.tag.rpartition('}')[2] in ('Name', 'n') and child.text:
+                    bucket_names.append(child.text)
+                    break
+        return bucket_names
+    
+    @staticmethod
+    async def _iter_body(content: bytes):
+        """Yield an upload body in UPLOAD_CHUNK_SIZE pieces.
+        
+        A plain bytes body is copied whole into the HTTP framing buffer;
+        sending it in pieces keeps the extra copy to one chunk.
+        """
+        view = memoryview(content)
+        for offset in range(0, len(content), UPLOAD_CHUNK_SIZE):
+            yield bytes(view[offset:offset + UPLOAD_CHUNK_SIZE])
+    
+    def _sign_upload(self, method: str, url: str, headers: dict, content: bytes) -> tuple:
+        """Sign an upload body using the configured payload mode; returns (headers, body)"""
+        if S3_PAYLOAD_SIGNING == "streaming" and self.object_access_key and self.object_secret_key:
+            return self._sign_streaming_upload(url, headers, content)
+        if S3_PAYLOAD_SIGNING == "unsigned":
+            headers = self._sign_aws_request(method, url, headers, payload_hash=UNSIGNED_PAYLOAD)
+        else:
+            headers = self._sign_aws_request(method, url, headers, content)
+        return headers, self._iter_body(content)
+    
+    async def upload_object(
+        self,
+        bucket_name: str,
+        object_key: str,
+        content: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> dict:
+        """Upload an object to Object Storage (multipart above MULTIPART_THRESHOLD)"""
+        if not self.object_storage_url:
+            raise ValueError("Object Storage URL not configured")
+        
+        if len(content) >= MULTIPART_THRESHOLD:
+            view = memoryview(content)
+            
+            async def read_part(offset: int, length: int) -> bytes:
+                return bytes(view[offset:offset + length])
+            
+            return await self.multipart_upload(
+                bucket_name, object_key, len(content), read_part, content_type
+            )
+        
+        url = self._object_key_url(bucket_name, object_key)
+        headers = {
+            "Content-Type": content_type,
+            "Content-Length": str(len(content))
+        }
+        
+        async def put() -> httpx.Response:
+            # Signed per attempt: the streamed body cannot be replayed
+            signed, body = self._sign_upload("PUT", url, dict(headers), content)
+            response = await self._http("object").put(
+                url=url,
+                content=body,
+                headers=signed,
+                timeout=60.0
+            )
+            response.raise_for_status()
+            return response
+        
+        try:
+            response = await self._retrying("object", "PUT", put)
+        finally:
+            self._object_write_finished(url)
+        return {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "bucket": bucket_name,
+            "key": object_key,
+            "size": len(content)
+        }
+    
+    async def _object_xml_request(
+        self,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        headers: Optional[dict] = None,
+        idempotent: Optional[bool] = None
+    ) -> httpx.Response:
+        """Send a signed Object Storage request whose response is XML.
+        
+        Some S3 operations (CompleteMultipartUpload) report errors in a 200
+        response body, so <Error> documents are raised as well.
+        """
+        headers = self._sign_aws_request(method, url, dict(headers or {}), body)
+        response = await self._request(
+            "object",
+            method,
+            url,
+            idempotent=idempotent,
+            headers=headers,
+            content=body if body else None,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        if XML_ERROR_DOCUMENT.match(response.content[:512]):
+            raise ValueError(f"{method} {url} failed: {response.text}")
+        return response
+    
+    async def create_multipart_upload(
+        self,
+        bucket_name: str,
+        object_key: str,
+        content_type: str = "application/octet-stream"
+    ) -> str:
+        """Start a multipart upload and return its UploadId"""
+        url = self._object_key_url(bucket_name, object_key, {"uploads": ""})
+        response = await self._object_xml_request("POST", url, headers={"Content-Type": content_type})
+        root = ET.fromstring(response.content)
+        for element in root.iter():
+            if element.tag.rpartition('}')[2] == 'UploadId' and element.text:
+                return element.text
+        raise ValueError(f"No UploadId in CreateMultipartUpload response: {response.text}")
+    
+    async def upload_part(
+        self,
+        bucket_name: str,
+        object_key: str,
+        upload_id: str,
+        part_number: int,
+        data: bytes
+    ) -> str:
+        """Upload one part and return its ETag (retried up to MULTIPART_PART_RETRIES times)"""
+        url = self._object_key_url(
+            bucket_name, object_key, {"partNumber": str(part_number), "uploadId": upload_id}
+        )
+        
+        async def put() -> str:
+            headers, body = self._sign_upload("PUT", url, {"Content-Length": str(len(data))}, data)
+            response = await self._http("object").put(
+                url=url,
+                content=body,
+                headers=headers,
+                timeout=60.0
+            )
+            response.raise_for_status()
+            return response.headers.get("etag", "")
+        
+        return await self._retrying("object", "PUT", put, attempts=MULTIPART_PART_RETRIES + 1)
+    
+    async def complete_multipart_upload(
+        self,
+        bucket_name: str,
+        object_key: str,
+        upload_id: str,
+        parts: list
+    ) -> httpx.Response:
+        """Complete a multipart upload from a list of (part_number, etag)"""
+        url = self._object_key_url(bucket_name, object_key, {"uploadId": upload_id})
+        body = "<CompleteMultipartUpload>" + "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+            for number, etag in sorted(parts)
+        ) + "</CompleteMultipartUpload>"
+        return await self._object_xml_request(
+            "POST", url, body.encode("utf-8"), headers={"Content-Type": "application/xml"}
+        )
     
-    def __init__(self):
-        self.vpsa_base_url = VPSA_BASE_URL
-        self.vpsa_api_key = VPSA_API_KEY
-        self.object_storage_url = OBJECT_STORAGE_URL
-        self.object_access_key = OBJECT_STORAGE_ACCESS_KEY
-        self.object_secret_key = OBJECT_STORAGE_SECRET_KEY
+    async def abort_multipart_upload(self, bucket_name: str, object_key: str, upload_id: str):
+        """Abort a multipart upload, discarding uploaded parts"""
+        url = self._object_key_url(bucket_name, object_key, {"uploadId": upload_id})
+        headers = self._sign_aws_request("DELETE", url, {})
+        response = await self._request("object", "DELETE", url, headers=headers, timeout=30.0)
+        response.raise_for_status()
     
-    def _sign_aws_request(
+    async def multipart_upload(
         self,
-        method: str,
-        url: str,
-        headers: dict,
-        payload: bytes = b""
+        bucket_name: str,
+        object_key: str,
+        size: int,
+        read_part: Callable,
+        content_type: str = "application/octet-stream",
+        part_size: int = MULTIPART_PART_SIZE,
+        concurrency: int = MULTIPART_CONCURRENCY
     ) -> dict:
-        """Generate AWS Signature V4 for request"""
-        if not self.object_access_key or not self.object_secret_key:
-            return headers
+        """Upload `size` bytes as a multipart upload with parts sent concurrently.
         
-        parsed = urlparse(url)
-        host = parsed.netloc
-        path = parsed.path or "/"
+        `await read_part(offset, length)` supplies each part's bytes. Parts are
+        read only once a slot is free, so at most `concurrency` parts are held
+        in memory. Failed parts are retried (see upload_part); if a part still
+        fails the upload is aborted. Objects that would need more than
+        MULTIPART_MAX_PARTS parts are sent in larger parts (see multipart_layout).
+        """
+        part_size, part_count = multipart_layout(size, part_size)
+        upload_id = await self.create_multipart_upload(bucket_name, object_key, content_type)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
         
-        # Current timestamp
-        now = datetime.utcnow()
-        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
-        date_stamp = now.strftime("%Y%m%d")
+        async def send_part(part_number: int) -> tuple:
+            offset = (part_number - 1) * part_size
+            async with semaphore:
+                data = await read_part(offset, min(part_size, size - offset))
+                etag = await self.upload_part(bucket_name, object_key, upload_id, part_number, data)
+                return part_number, etag
+        
+        tasks = [asyncio.ensure_future(send_part(n)) for n in range(1, part_count + 1)]
+        try:
+            parts = await asyncio.gather(*tasks)
+            response = await self.complete_multipart_upload(bucket_name, object_key, upload_id, parts)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            try:
+                await self.abort_multipart_upload(bucket_name, object_key, upload_id)
+            except Exception as abort_error:
+                logger.warning("Failed to abort multipart upload %s: %s", upload_id, abort_error)
+            raise
+        
+        return {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "bucket": bucket_name,
+            "key": object_key,
+            "size": size,
+            "multipart": True,
+            "parts": part_count,
+            "part_size": part_size
+        }
+    
+    async def _get_range(
+        self,
+        url: str,
+        start: int,
+        end: int,
+        write: Callable[[int, bytes], Awaitable[None]],
+        etag: Optional[str] = None
+    ):
+        """Stream bytes start..end (inclusive) of an object into await write(offset, data).
+        
+        If the connection fails part-way, the request is resumed from the
+        last byte received rather than restarted. If-Match pins every range
+        to the same object version.
+        """
+        position = start
+        
+        async def fetch():
+            # Each attempt (including retries) resumes at the first missing byte
+            nonlocal position
+            headers = {"Range": f"bytes={position}-{end}"}
+            if etag:
+                headers["If-Match"] = etag
+            headers = self._sign_aws_request("GET", url, headers)
+            async with self._http("object").stream(
+                "GET",
+                url,
+                headers=headers,
+                timeout=60.0
+            ) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise ValueError(f"Server ignored Range request for {url}")
+                async for chunk in response.aiter_bytes():
+                    await write(position, chunk)
+                    position += len(chunk)
+        
+        while position <= end:
+            before = position
+            await self._retrying("object", "GET", fetch, attempts=DOWNLOAD_RANGE_RETRIES + 1)
+            if position == before:
+                raise ValueError(f"Empty range response for {url}")
+    
+    async def download_ranges(
+        self,
+        bucket_name: str,
+        object_key: str,
+        write: Callable[[int, bytes], Awaitable[None]],
+        on_size: Optional[Callable[[int, Optional[str]], None]] = None,
+        part_size: int = DOWNLOAD_PART_SIZE,
+        concurrency: int = DOWNLOAD_CONCURRENCY,
+        etag: Optional[str] = None,
+        skip: frozenset = frozenset(),
+        on_range_done: Optional[Callable[[int, int], None]] = None
+    ) -> dict:
+        """Download an object into await write(offset, data) using concurrent byte ranges.
         
-        # Calculate payload hash
-        payload_hash = hashlib.sha256(payload).hexdigest()
+        The first range doubles as the size probe (Content-Range carries the
+        total size), so small objects still take a single request.
+        on_size(size, etag) is called once the size is known, before any
+        write. The remaining ranges are fetched concurrently over the pooled
+        connections and may arrive in any order; write() places them by offset.
+        Ranges starting at an offset in skip are not fetched (a resumed
+        download already has them) and on_range_done(start, end) is called as
+        each range has been written. Given etag, the probe is pinned to that
+        version too, so a changed object fails with 412.
+        """
+        if not self.object_storage_url:
+            raise ValueError("Object Storage URL not configured")
         
-        # Canonical headers
-        canonical_headers = f"host:{host}\nx-amz-content-sha256:{payload_hash}\nx-amz-date:{amz_date}\n"
-        signed_headers = "host;x-amz-content-sha256;x-amz-date"
+        url = self._object_key_url(bucket_name, object_key)
+        pin = {"If-Match": etag} if etag else {}
+        headers = self._sign_aws_request("GET", url, {"Range": f"bytes=0-{part_size - 1}", **pin})
+        response = await self._request("object", "GET", url, headers=headers, timeout=60.0)
         
-        # Canonical request
-        canonical_request = f"{method}\n{path}\n\n{canonical_headers}\n{signed_headers}\n{payload_hash}"
+        if response.status_code == 416:
+            # Empty objects cannot satisfy any range
+            headers = self._sign_aws_request("GET", url, dict(pin))
+            response = await self._request("object", "GET", url, headers=headers, timeout=60.0)
+        response.raise_for_status()
         
-        # String to sign
-        algorithm = "AWS4-HMAC-SHA256"
-        credential_scope = f"{date_stamp}/us-east-1/s3/aws4_request"
-        string_to_sign = f"{algorithm}\n{amz_date}\n{credential_scope}\n{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+        size = len(response.content)
+        content_range = response.headers.get("content-range", "")
+        if response.status_code == 206 and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            if total.isdigit():
+                size = int(total)
+        etag = response.headers.get("etag")
         
-        # Calculate signature
-        def sign(key, msg):
-            return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+        if on_size:
+            on_size(size, etag)
+        await write(0, response.content)
+        if on_range_done and response.content:
+            on_range_done(0, len(response.content) - 1)
         
-        k_date = sign(f"AWS4{self.object_secret_key}".encode(), date_stamp)
-        k_region = sign(k_date, "us-east-1")
-        k_service = sign(k_region, "s3")
-        k_signing = sign(k_service, "aws4_request")
-        signature = hmac.new(k_signing, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        ranges = [
+            (offset, min(offset + part_size, size) - 1)
+            for offset in range(len(response.content), size, part_size)
+            if offset not in skip
+        ]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
         
-        # Authorization header
-        authorization = f"{algorithm} Credential={self.object_access_key}/{credential_scope}, SignedHeaders={signed_headers}, Signature={signature}"
+        async def fetch(start: int, end: int):
+            async with semaphore:
+                await self._get_range(url, start, end, write, etag)
+            if on_range_done:
+                on_range_done(start, end)
         
-        # Update headers
-        headers["Authorization"] = authorization
-        headers["x-amz-date"] = amz_date
-        headers["x-amz-content-sha256"] = payload_hash
-        headers["Host"] = host
+        tasks = [asyncio.ensure_future(fetch(start, end)) for start, end in ranges]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
         
-        return headers
+        response_headers = dict(response.headers)
+        response_headers.pop("content-range", None)
+        response_headers["content-length"] = str(size)
+        return {
+            "status_code": 200,
+            "headers": response_headers,
+            "content_type": response.headers.get("content-type", ""),
+            "etag": etag,
+            "size": size,
+            "ranges": len(ranges) + 1
+        }
     
-    async def vpsa_request(
+    async def download_object(
         self,
-        method: str,
-        endpoint: str,
-        data: Optional[dict] = None,
-        params: Optional[dict] = None
+        bucket_name: str,
+        object_key: str
     ) -> dict:
-        """Make a request to VPSA API"""
-        if not self.vpsa_base_url or not self.vpsa_api_key:
-            raise ValueError("VPSA credentials not configured")
+        """Download an object from Object Storage (parallel byte ranges for large objects)"""
+        content = None
         
-        url = urljoin(self.vpsa_base_url, f"/api/{endpoint}")
-        headers = {
-            "X-Access-Key": self.vpsa_api_key,
-            "Content-Type": "application/json"
-        }
+        def allocate(size: int, etag: Optional[str]):
+            nonlocal content
+            content = bytearray(size)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        async def write(offset: int, data: bytes):
+            # Ranges are reassembled in place, in offset order
+            content[offset:offset + len(data)] = data
+        
+        result = await self.download_ranges(bucket_name, object_key, write, on_size=allocate)
+        result["content"] = content
+        return result
     
-    async def object_storage_request(
+    async def read_object_range(
         self,
-        method: str,
-        endpoint: str,
-        data: Optional[dict] = None,
-        params: Optional[dict] = None,
-        content_type: str = "application/json"
+        bucket_name: str,
+        object_key: str,
+        offset: int,
+        length: int,
+        etag: Optional[str] = None
     ) -> dict:
-        """Make a request to Object Storage API with AWS Signature V4"""
+        """Read one window of an object (bytes offset..offset+length-1) with a Range GET.
+        
+        Only the requested bytes cross the network. The total size and ETag
+        are taken from the response, so callers can page through an object
+        without a separate HEAD; passing the ETag back pins later windows to
+        the same object version (412 if the object changed).
+        """
         if not self.object_storage_url:
             raise ValueError("Object Storage URL not configured")
+        if offset < 0 or length <= 0:
+            raise ValueError("offset must be >= 0 and length must be > 0")
         
-        url = urljoin(self.object_storage_url, endpoint)
+        url = self._object_key_url(bucket_name, object_key)
+        headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+        if etag:
+            headers["If-Match"] = etag
+        headers = self._sign_aws_request("GET", url, headers)
+        response = await self._request("object", "GET", url, headers=headers, timeout=60.0)
         
-        # Prepare request body
-        body = b""
-        if data:
-            body = json.dumps(data).encode('utf-8')
+        if response.status_code == 416:
+            # Window starts at or past the end (or the object is empty): report size only
+            headers = self._sign_aws_request("HEAD", url, {"If-Match": etag} if etag else {})
+            response = await self._request("object", "HEAD", url, headers=headers, timeout=30.0)
+            response.raise_for_status()
+            size = int(response.headers.get("content-length", "0"))
+            content = b""
+        else:
+            response.raise_for_status()
+            content = response.content
+            size = len(content)
+            content_range = response.headers.get("content-range", "")
+            if response.status_code == 206 and "/" in content_range:
+                total = content_range.rsplit("/", 1)[1]
+                if total.isdigit():
+                    size = int(total)
+            else:
+                # Server ignored Range and sent the whole object
+                content = content[offset:offset + length]
         
-        # Prepare headers for AWS Signature V4
-        headers = {
-            "Content-Type": content_type
+        return {
+            "status_code": response.status_code,
+            "content_type": response.headers.get("content-type", ""),
+            "etag": response.headers.get("etag"),
+            "size": size,
+            "offset": offset,
+            "length": len(content),
+            "content": content
         }
+    
+    def presign_url(
+        self,
+        bucket_name: str,
+        object_key: str,
+        method: str = "GET",
+        expires_in: int = PRESIGN_DEFAULT_EXPIRY
+    ) -> dict:
+        """Create a presigned GET or PUT URL for an object.
         
-        # Add AWS Signature V4 authentication if credentials are provided
-        if self.object_access_key and self.object_secret_key:
-            headers = self._sign_aws_request(method, url, headers, body)
+        The transfer itself then happens outside the MCP channel; the server
+        only signs the URL and never sees the bytes.
+        """
+        if not self.object_storage_url:
+            raise ValueError("Object Storage URL not configured")
+        if not self.object_access_key or not self.object_secret_key:
+            raise ValueError("Object Storage credentials not configured")
+        method = method.upper()
+        if method not in ("GET", "PUT"):
+            raise ValueError(f"Unsupported method for presigned URL: {method}")
+        if not 1 <= expires_in <= PRESIGN_MAX_EXPIRY:
+            raise ValueError(f"expires_in must be between 1 and {PRESIGN_MAX_EXPIRY} seconds")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                content=body if body else None,
-                params=params,
-                timeout=30.0
+        now = datetime.utcnow()
+        url = self.signer.presign(method, self._object_key_url(bucket_name, object_key), expires_in, now)
+        return {
+            "bucket": bucket_name,
+            "key": object_key,
+            "method": method,
+            "url": url,
+            "expires_in": expires_in,
+            "expires_at": (now + timedelta(seconds=expires_in)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+    
+    def resolve_local_path(self, file_path: str) -> str:
+        """Resolve a local path for file transfers; it must be inside FILE_TRANSFER_ROOT.
+        
+        File transfers are refused while no root is configured, so a tool
+        call cannot read or overwrite arbitrary files (credentials, .env).
+        """
+        if not FILE_TRANSFER_ROOT:
+            raise ValueError(
+                "Local file transfers are disabled; set ZADARA_FILE_TRANSFER_ROOT to the directory they may use"
             )
-            response.raise_for_status()
-            
-            # Handle different response types
-            content_type_header = response.headers.get("content-type", "")
-            if "application/json" in content_type_header:
-                return response.json()
-            elif "application/xml" in content_type_header or "text/xml" in content_type_header:
-                # For XML responses (like S3 ListBucket), return the text
-                return {"xml_content": response.text}
-            else:
-                return {"content": response.text, "status_code": response.status_code}
+        root = os.path.realpath(os.path.expanduser(FILE_TRANSFER_ROOT))
+        path = os.path.realpath(os.path.join(root, os.path.expanduser(file_path)))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"Path is outside ZADARA_FILE_TRANSFER_ROOT: {file_path}")
+        return path
     
-    async def upload_object(
+    async def upload_file(
         self,
         bucket_name: str,
         object_key: str,
-        content: bytes,
+        file_path: str,
         content_type: str = "application/octet-stream"
     ) -> dict:
-        """Upload an object to Object Storage"""
-        if not self.object_storage_url:
-            raise ValueError("Object Storage URL not configured")
+        """Upload a local file without loading it into memory.
         
-        url = urljoin(self.object_storage_url, f"/{bucket_name}/{object_key}")
-        headers = {
-            "Content-Type": content_type,
-            "Content-Length": str(len(content))
-        }
+        Files below MULTIPART_THRESHOLD are sent in one PUT; larger files are
+        read part by part (in a worker thread) as multipart upload slots free up.
+        """
+        path = self.resolve_local_path(file_path)
+        size = os.path.getsize(path)
+        loop = asyncio.get_running_loop()
         
-        # Sign the request with AWS Signature V4
-        headers = self._sign_aws_request("PUT", url, headers, content)
+        def read(offset: int, length: int) -> bytes:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                return f.read(length)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                url=url,
-                content=content,
-                headers=headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "bucket": bucket_name,
-                "key": object_key,
-                "size": len(content)
-            }
+        if size < MULTIPART_THRESHOLD:
+            content = await loop.run_in_executor(None, read, 0, size)
+            result = await self.upload_object(bucket_name, object_key, content, content_type)
+        else:
+            async def read_part(offset: int, length: int) -> bytes:
+                return await loop.run_in_executor(None, read, offset, length)
+            
+            result = await self.multipart_upload(bucket_name, object_key, size, read_part, content_type)
+        
+        result["file_path"] = path
+        return result
     
-    async def download_object(
+    async def download_file(
+        self,
+        bucket_name: str,
+        object_key: str,
+        file_path: str,
+        overwrite: bool = False,
+        resume: bool = False
+    ) -> dict:
+        """Download an object straight to a local file.
+        
+        Byte ranges are written at their offsets as they stream in, so memory
+        use does not depend on the object size. Data goes to a temporary
+        file that replaces the target only once the download is complete.
+        
+        With resume, a failed download keeps its temporary file plus a record
+        of the ranges already written (<file>.part.json), and the next resume
+        call fetches only the missing ranges, pinned with If-Match to the
+        same object version. If the object has changed in between, the
+        request fails with 412 and the partial file is discarded.
+        """
+        path = self.resolve_local_path(file_path)
+        if os.path.exists(path) and not overwrite:
+            raise ValueError(f"File already exists: {path} (set overwrite to replace it)")
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.part"
+        progress_path = f"{temp_path}.json"
+        
+        progress = None
+        if resume and os.path.exists(temp_path):
+            try:
+                with open(progress_path) as f:
+                    progress = json.load(f)
+                done = {int(start): int(end) for start, end in progress["done"]}
+                progress = {"etag": str(progress["etag"]), "part_size": int(progress["part_size"]), "done": done}
+            except (OSError, ValueError, KeyError, TypeError):
+                progress = None
+        
+        part_size = progress["part_size"] if progress else DOWNLOAD_PART_SIZE
+        # Ranges already written, start -> end
+        done = dict(progress["done"]) if progress else {}
+        version = {"etag": progress["etag"] if progress else None}
+        
+        loop = asyncio.get_running_loop()
+        with open(temp_path, "r+b" if progress else "wb") as f:
+            # Ranges are written from worker threads; seek + write must not interleave
+            lock = threading.Lock()
+            
+            def allocate(size: int, etag: Optional[str]):
+                version["etag"] = etag
+                f.truncate(size)
+            
+            def write_at(offset: int, data: bytes):
+                with lock:
+                    f.seek(offset)
+                    f.write(data)
+            
+            writes = set()
+            
+            async def write(offset: int, data: bytes):
+                # Disk writes run in a worker thread, as reads do in upload_file.
+                # Shielded: a cancelled range cannot stop a write already running,
+                # so it stays tracked until the thread is done with the file
+                future = loop.run_in_executor(None, write_at, offset, data)
+                writes.add(future)
+                future.add_done_callback(writes.discard)
+                await asyncio.shield(future)
+            
+            try:
+                result = await self.download_ranges(
+                    bucket_name,
+                    object_key,
+                    write,
+                    on_size=allocate,
+                    part_size=part_size,
+                    etag=version["etag"],
+                    skip=frozenset(done),
+                    on_range_done=done.__setitem__
+                )
+            except BaseException as e:
+                # Let queued and running writes finish before the file goes away
+                await asyncio.gather(*writes, return_exceptions=True)
+                f.close()
+                changed = isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 412
+                if resume and version["etag"] and not changed:
+                    with open(progress_path, "w") as progress_file:
+                        json.dump(
+                            {"etag": version["etag"], "part_size": part_size, "done": sorted(done.items())},
+                            progress_file
+                        )
+                else:
+                    os.remove(temp_path)
+                    if os.path.exists(progress_path):
+                        os.remove(progress_path)
+                raise
+        
+        os.replace(temp_path, path)
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
+        return {
+            "bucket": bucket_name,
+            "key": object_key,
+            "file_path": path,
+            "content_type": result["content_type"],
+            "etag": result["etag"],
+            "size": result["size"],
+            "ranges": result["ranges"],
+            "resumed_ranges": len(progress["done"]) if progress else 0
+        }
+    
+    async def delete_object(
         self,
         bucket_name: str,
         object_key: str
     ) -> dict:
-        """Download an object from Object Storage"""
+        """Delete an object from Object Storage"""
         if not self.object_storage_url:
             raise ValueError("Object Storage URL not configured")
         
-        url = urljoin(self.object_storage_url, f"/{bucket_name}/{object_key}")
+        url = self._object_key_url(bucket_name, object_key)
         headers = {}
         
         # Sign the request with AWS Signature V4
-        headers = self._sign_aws_request("GET", url, headers)
+        headers = self._sign_aws_request("DELETE", url, headers)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url=url,
-                headers=headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
+        response = await self._request(
+            "object",
+            "DELETE",
+            url,
+            headers=headers,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        return {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "bucket": bucket_name,
+            "key": object_key
+        }
+
+    
+    async def delete_objects(self, bucket_name: str, keys: list) -> dict:
+        """Delete up to DELETE_BATCH_SIZE keys with one multi-object delete (POST ?delete).
+        
+        Quiet mode is used, so the response only lists the keys that could
+        not be deleted.
+        """
+        if not self.object_storage_url:
+            raise ValueError("Object Storage URL not configured")
+        if len(keys) > DELETE_BATCH_SIZE:
+            raise ValueError(f"At most {DELETE_BATCH_SIZE} keys per delete request")
+        
+        body = (
+            "<Delete><Quiet>true</Quiet>"
+            + "".join(f"<Object><Key>{escape(key)}</Key></Object>" for key in keys)
+            + "</Delete>"
+        ).encode()
+        headers = {
+            "Content-Type": "application/xml",
+            # Required by S3 for multi-object delete
+            "Content-MD5": base64.b64encode(hashlib.md5(body, usedforsecurity=False).digest()).decode()
+        }
+        url = self._object_url(f"/{bucket_name}", {"delete": ""})
+        # Deleting the same keys again is harmless, so the POST can be retried
+        response = await self._object_xml_request("POST", url, body, headers, idempotent=True)
+        
+        errors = []
+        for element in ET.fromstring(response.content):
+            if element.tag.split("}")[-1] == "Error":
+                errors.append({child.tag.split("}")[-1]: child.text for child in element})
+        return {"deleted": len(keys) - len(errors), "errors": errors}
+    
+    async def delete_keys(
+        self,
+        bucket_name: str,
+        keys: list,
+        concurrency: int = DELETE_CONCURRENCY
+    ) -> dict:
+        """Delete any number of keys as parallel multi-object delete requests"""
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def delete_batch(batch: list) -> dict:
+            async with semaphore:
+                return await self.delete_objects(bucket_name, batch)
+        
+        results = await asyncio.gather(*(
+            delete_batch(keys[offset:offset + DELETE_BATCH_SIZE])
+            for offset in range(0, len(keys), DELETE_BATCH_SIZE)
+        ))
+        return self._delete_report(bucket_name, results, time.perf_counter() - started)
+    
+    async def delete_prefix(
+        self,
+        bucket_name: str,
+        prefix: str,
+        dry_run: bool = False,
+        concurrency: int = DELETE_CONCURRENCY
+    ) -> dict:
+        """Delete every object under prefix, deleting while the listing is still running.
+        
+        Keys from the (sharded) listing are collected into batches of
+        DELETE_BATCH_SIZE, and each full batch is handed to one of
+        `concurrency` delete workers as soon as it fills, so listing and
+        deletion overlap. The hand-off queue holds at most `concurrency`
+        batches; when it is full the listing waits, so memory stays bounded
+        however many keys match. With dry_run only the matching objects are
+        counted.
+        """
+        started = time.perf_counter()
+        if dry_run:
+            totals = {"objects": 0, "bytes": 0}
+            
+            def count(shard_index: int, objects: list):
+                totals["objects"] += len(objects)
+                totals["bytes"] += sum(o.size for o in objects)
+            
+            await self.scan_objects(bucket_name, count, prefix=prefix)
             return {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "content": response.content,
-                "content_type": response.headers.get("content-type", ""),
-                "size": len(response.content)
+                "bucket": bucket_name,
+                "prefix": prefix,
+                "dry_run": True,
+                "objects": totals["objects"],
+                "bytes": totals["bytes"],
+                "size_formatted": format_size(totals["bytes"]),
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            }
+        
+        workers = max(1, concurrency)
+        batches = asyncio.Queue(maxsize=workers)
+        pending = []
+        results = []
+        
+        async def delete_worker():
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    return
+                results.append(await self.delete_objects(bucket_name, batch))
+        
+        async def on_page(shard_index: int, objects: list):
+            pending.extend(o.key for o in objects)
+            while len(pending) >= DELETE_BATCH_SIZE:
+                batch = pending[:DELETE_BATCH_SIZE]
+                del pending[:DELETE_BATCH_SIZE]
+                await batches.put(batch)
+        
+        async def list_keys():
+            await self.scan_objects(bucket_name, on_page, prefix=prefix)
+            if pending:
+                await batches.put(list(pending))
+            for _ in range(workers):
+                await batches.put(None)
+        
+        # A failing worker or listing fails the whole operation (gather raises at once)
+        tasks = [asyncio.ensure_future(list_keys())]
+        tasks += [asyncio.ensure_future(delete_worker()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        report = self._delete_report(bucket_name, results, time.perf_counter() - started)
+        report["prefix"] = prefix
+        return report
+    
+    @staticmethod
+    def _delete_report(bucket_name: str, results: list, elapsed: float) -> dict:
+        """Summarise multi-object delete results (errors are capped at 100 entries)"""
+        deleted = sum(r["deleted"] for r in results)
+        errors = [error for r in results for error in r["errors"]]
+        return {
+            "bucket": bucket_name,
+            "deleted": deleted,
+            "failed": len(errors),
+            "errors": errors[:100],
+            "requests": len(results),
+            "elapsed_seconds": round(elapsed, 3),
+            "objects_per_second": round(deleted / elapsed, 1) if elapsed > 0 else None
+        }
+
+
+def format_size(size_bytes: int) -> str:
+    """Format a byte count as a human-readable string (bytes, KB, MB, GB)"""
+    if size_bytes >= 1024**3:
+        return f"{size_bytes / 1024**3:.2f} GB"
+    elif size_bytes >= 1024**2:
+        return f"{size_bytes / 1024**2:.2f} MB"
+    elif size_bytes >= 1024:
+        return f"{size_bytes / 1024:.2f} KB"
+    else:
+        return f"{size_bytes} bytes"
+
+
+def project_fields(result: Any, fields: list) -> Any:
+    """Keep only `fields` in the records of a tool result.
+    
+    Records are the objects inside lists (volumes, pools, Objects, ...);
+    wrapper objects around them are kept as they are. A result without any
+    list of objects is a single record, and its innermost objects holding
+    any of the fields are projected instead.
+    """
+    wanted = set(fields)
+    
+    def has_records(value) -> bool:
+        if isinstance(value, list):
+            return any(isinstance(item, dict) for item in value) or any(has_records(item) for item in value)
+        if isinstance(value, dict):
+            return any(has_records(item) for item in value.values())
+        return False
+    
+    def in_lists(value, in_list: bool = False):
+        if isinstance(value, list):
+            return [in_lists(item, True) for item in value]
+        if isinstance(value, dict):
+            if in_list:
+                return {k: v for k, v in value.items() if k in wanted}
+            return {k: in_lists(v) for k, v in value.items()}
+        return value
+    
+    def single(value):
+        if isinstance(value, dict):
+            if wanted.intersection(value) and not any(isinstance(v, dict) and wanted.intersection(v) for v in value.values()):
+                return {k: v for k, v in value.items() if k in wanted}
+            return {k: single(v) for k, v in value.items()}
+        return value
+    
+    return in_lists(result) if has_records(result) else single(result)
+
+
+def encode_result(result: Any, output: str = OUTPUT_FORMAT) -> str:
+    """Serialise a tool result as pretty (indent=2) or compact JSON.
+    
+    Uses orjson when it is installed; it falls back to the json module for
+    values orjson rejects (e.g. integers beyond 64 bits).
+    """
+    compact = output == "compact"
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+            return orjson.dumps(result, option=option).decode()
+        except TypeError:
+            pass
+    if compact:
+        return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(result, indent=2, ensure_ascii=False)
+
+
+# Initialize client
+client = ZadaraClient()
+
+
+class ToolSpec(NamedTuple):
+    """A registered MCP tool: its (prebuilt) Tool definition, handler and argument validator"""
+    tool: Tool
+    handler: Callable[[dict], Any]
+    validator: Any = None
+
+
+# Arguments accepted by every tool (applied by call_tool, not the handler)
+OUTPUT_PROPERTIES = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only return these attributes of each record (e.g. [\"name\", \"capacity\"] or [\"Key\", \"Size\"])"
+    },
+    "output": {
+        "type": "string",
+        "enum": ["pretty", "compact"],
+        "description": f"JSON formatting of the result (default: {OUTPUT_FORMAT})"
+    },
+    "profile": {
+        "type": "boolean",
+        "description": "Profile this call (cProfile + tracemalloc) and append the top hotspots and peak memory to the response (default: false)"
+    }
+}
+
+
+# Tool registry, filled at import by the @tool declarations below. Each tool
+# is declared once, next to its handler; list_tools returns the prebuilt
+# Tool list and call_tool dispatches with a dict lookup.
+TOOL_REGISTRY: dict = {}
+
+
+def tool(**definition):
+    """Register the decorated coroutine as the handler of a Tool(**definition).
+    
+    Handlers receive the call arguments and return either a JSON-serialisable
+    result or a plain string; call_tool turns that into TextContent. The
+    common `fields` and `output` arguments are added to every schema.
+    """
+    schema = definition["inputSchema"]
+    schema["properties"] = {**schema.get("properties", {}), **OUTPUT_PROPERTIES}
+    
+    # Built once: jsonschema.validate() would re-check the schema itself on every call
+    validator = None
+    if jsonschema is not None:
+        validator = jsonschema.validators.validator_for(schema)(schema)
+    
+    def register(handler):
+        spec = ToolSpec(Tool(**definition), handler, validator)
+        TOOL_REGISTRY[spec.tool.name] = spec
+        return handler
+    return register
+
+
+# VPSA Storage Array Tools
+@tool(
+    name="vpsa_list_volumes",
+    description="List all volumes in the VPSA storage array",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of volumes to return"
+            },
+            "offset": {
+                "type": "integer",
+                "description": "Offset for pagination"
+            }
+        }
+    }
+)
+async def vpsa_list_volumes(arguments: dict) -> Any:
+    params = {}
+    if "limit" in arguments:
+        params["limit"] = arguments["limit"]
+    if "offset" in arguments:
+        params["offset"] = arguments["offset"]
+    
+    result = await client.vpsa_request("GET", "volumes.json", params=params)
+    return result
+
+
+@tool(
+    name="vpsa_create_volume",
+    description="Create a new volume in the VPSA storage array",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "name": {
+                "type": "string",
+                "description": "Name of the volume"
+            },
+            "capacity": {
+                "type": "integer",
+                "description": "Capacity in GB"
+            },
+            "pool": {
+                "type": "string",
+                "description": "Storage pool name or ID"
+            },
+            "block_size": {
+                "type": "integer",
+                "description": "Block size in KB (optional)"
+            }
+        },
+        "required": ["name", "capacity", "pool"]
+    }
+)
+async def vpsa_create_volume(arguments: dict) -> Any:
+    data = {
+        "name": arguments["name"],
+        "capacity": arguments["capacity"],
+        "pool": arguments["pool"]
+    }
+    if "block_size" in arguments:
+        data["block_size"] = arguments["block_size"]
+    
+    result = await client.vpsa_request("POST", "volumes.json", data=data)
+    return result
+
+
+@tool(
+    name="vpsa_get_volume",
+    description="Get details of a specific volume",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "volume_id": {
+                "type": "string",
+                "description": "Volume ID or name"
+            }
+        },
+        "required": ["volume_id"]
+    }
+)
+async def vpsa_get_volume(arguments: dict) -> Any:
+    volume_id = arguments["volume_id"]
+    result = await client.vpsa_request("GET", f"volumes/{volume_id}.json")
+    return result
+
+
+@tool(
+    name="vpsa_delete_volume",
+    description="Delete a volume from the VPSA storage array",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "volume_id": {
+                "type": "string",
+                "description": "Volume ID or name to delete"
+            }
+        },
+        "required": ["volume_id"]
+    }
+)
+async def vpsa_delete_volume(arguments: dict) -> Any:
+    volume_id = arguments["volume_id"]
+    result = await client.vpsa_request("DELETE", f"volumes/{volume_id}.json")
+    return result
+
+
+@tool(
+    name="vpsa_list_pools",
+    description="List all storage pools in the VPSA",
+    inputSchema={
+        "type": "object",
+        "properties": {}
+    }
+)
+async def vpsa_list_pools(arguments: dict) -> Any:
+    result = await client.vpsa_request("GET", "pools.json")
+    return result
+
+
+@tool(
+    name="vpsa_list_servers",
+    description="List all servers connected to the VPSA",
+    inputSchema={
+        "type": "object",
+        "properties": {}
+    }
+)
+async def vpsa_list_servers(arguments: dict) -> Any:
+    result = await client.vpsa_request("GET", "servers.json")
+    return result
+
+
+@tool(
+    name="vpsa_create_snapshot",
+    description="Create a snapshot of a volume",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "volume_id": {
+                "type": "string",
+                "description": "Volume ID to snapshot"
+            },
+            "snapshot_name": {
+                "type": "string",
+                "description": "Name for the snapshot"
+            }
+        },
+        "required": ["volume_id", "snapshot_name"]
+    }
+)
+async def vpsa_create_snapshot(arguments: dict) -> Any:
+    data = {
+        "volume": arguments["volume_id"],
+        "display_name": arguments["snapshot_name"]
+    }
+    result = await client.vpsa_request("POST", "snapshots.json", data=data)
+    return result
+
+
+@tool(
+    name="vpsa_list_snapshots",
+    description="List all snapshots",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "volume_id": {
+                "type": "string",
+                "description": "Filter by volume ID (optional)"
             }
+        }
+    }
+)
+async def vpsa_list_snapshots(arguments: dict) -> Any:
+    params = {}
+    if "volume_id" in arguments:
+        params["volume"] = arguments["volume_id"]
+    
+    result = await client.vpsa_request("GET", "snapshots.json", params=params)
+    return result
+
+
+@tool(
+    name="vpsa_get_performance",
+    description="Get performance metrics for the VPSA",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "interval": {
+                "type": "string",
+                "description": "Time interval (e.g., '1h', '24h', '7d')"
+            }
+        }
+    }
+)
+async def vpsa_get_performance(arguments: dict) -> Any:
+    params = {}
+    if "interval" in arguments:
+        params["interval"] = arguments["interval"]
     
-    async def delete_object(
-        self,
-        bucket_name: str,
-        object_key: str
-    ) -> dict:
-        """Delete an object from Object Storage"""
-        if not self.object_storage_url:
-            raise ValueError("Object Storage URL not configured")
-        
-        url = urljoin(self.object_storage_url, f"/{bucket_name}/{object_key}")
-        headers = {}
-        
-        # Sign the request with AWS Signature V4
-        headers = self._sign_aws_request("DELETE", url, headers)
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                url=url,
-                headers=headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "bucket": bucket_name,
-                "key": object_key
+    result = await client.vpsa_request("GET", "performance.json", params=params)
+    return result
+
+
+@tool(
+    name="vpsa_list_controllers",
+    description="List all controllers in the VPSA",
+    inputSchema={
+        "type": "object",
+        "properties": {}
+    }
+)
+async def vpsa_list_controllers(arguments: dict) -> Any:
+    result = await client.vpsa_request("GET", "vcontrollers.json")
+    return result
+
+
+@tool(
+    name="vpsa_cache_stats",
+    description="Show hit/miss counters of the VPSA response cache, optionally clearing it",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "clear": {
+                "type": "boolean",
+                "description": "Drop all cached responses after reading the counters (default: false)"
             }
+        }
+    }
+)
+async def vpsa_cache_stats(arguments: dict) -> Any:
+    result = client.vpsa_cache.stats()
+    result["ttls"] = VPSA_CACHE_TTLS
+    result["single_flight"] = client.single_flight.stats()
+    if arguments.get("clear"):
+        result["cleared"] = client.vpsa_cache.invalidate()
+    return result
 
 
-# Initialize client
-client = ZadaraClient()
+# Object Storage Tools
+@tool(
+    name="object_list_buckets",
+    description="List all buckets in object storage",
+    inputSchema={
+        "type": "object",
+        "properties": {}
+    }
+)
+async def object_list_buckets(arguments: dict) -> Any:
+    result = await client.object_storage_request("GET", "/")
+    return result
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools"""
-    return [
-        # VPSA Storage Array Tools
-        Tool(
-            name="vpsa_list_volumes",
-            description="List all volumes in the VPSA storage array",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of volumes to return"
-                    },
-                    "offset": {
-                        "type": "integer",
-                        "description": "Offset for pagination"
-                    }
-                }
+@tool(
+    name="object_create_bucket",
+    description="Create a new bucket in object storage",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket to create"
+            },
+            "region": {
+                "type": "string",
+                "description": "Region for the bucket (optional)"
             }
-        ),
-        Tool(
-            name="vpsa_create_volume",
-            description="Create a new volume in the VPSA storage array",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the volume"
-                    },
-                    "capacity": {
-                        "type": "integer",
-                        "description": "Capacity in GB"
-                    },
-                    "pool": {
-                        "type": "string",
-                        "description": "Storage pool name or ID"
-                    },
-                    "block_size": {
-                        "type": "integer",
-                        "description": "Block size in KB (optional)"
-                    }
-                },
-                "required": ["name", "capacity", "pool"]
+        },
+        "required": ["bucket_name"]
+    }
+)
+async def object_create_bucket(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    data = {}
+    if "region" in arguments:
+        data["CreateBucketConfiguration"] = {
+            "LocationConstraint": arguments["region"]
+        }
+    
+    result = await client.object_storage_request("PUT", f"/{bucket_name}", data=data)
+    return result
+
+
+@tool(
+    name="object_delete_bucket",
+    description="Delete a bucket from object storage",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket to delete"
             }
-        ),
-        Tool(
-            name="vpsa_get_volume",
-            description="Get details of a specific volume",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "volume_id": {
-                        "type": "string",
-                        "description": "Volume ID or name"
-                    }
-                },
-                "required": ["volume_id"]
+        },
+        "required": ["bucket_name"]
+    }
+)
+async def object_delete_bucket(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    result = await client.object_storage_request("DELETE", f"/{bucket_name}")
+    return result
+
+
+@tool(
+    name="object_list_objects",
+    description="List objects in a bucket",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "prefix": {
+                "type": "string",
+                "description": "Prefix filter for object keys (optional)"
+            },
+            "delimiter": {
+                "type": "string",
+                "description": "Group keys sharing a prefix up to this delimiter into CommonPrefixes (e.g. '/')"
+            },
+            "max_keys": {
+                "type": "integer",
+                "minimum": 1,
+                "description": (
+                    "Maximum number of keys to return (default 1000, at most 1000 per page; "
+                    f"with auto_paginate or parallel default {LIST_PAGINATE_MAX_KEYS} across pages)"
+                )
+            },
+            "max_bytes": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Stop once about this many bytes of object records have been collected (optional)"
+            },
+            "cursor": {
+                "type": "string",
+                "description": "NextCursor from a previous result, to continue that listing"
+            },
+            "auto_paginate": {
+                "type": "boolean",
+                "description": "Fetch pages in turn until max_keys or max_bytes is reached or the listing ends"
+            },
+            "parallel": {
+                "type": "boolean",
+                "description": "List keys under the prefix using parallel prefix-sharded listing, until max_keys, max_bytes or limit is reached (no delimiter)"
+            },
+            **OBJECT_FILTER_PROPERTIES,
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Stop as soon as this many matching objects are found, fetching pages as needed"
             }
-        ),
-        Tool(
-            name="vpsa_delete_volume",
-            description="Delete a volume from the VPSA storage array",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "volume_id": {
-                        "type": "string",
-                        "description": "Volume ID or name to delete"
-                    }
-                },
-                "required": ["volume_id"]
+        },
+        "required": ["bucket_name"]
+    }
+)
+async def object_list_objects(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    
+    match = build_object_filter(arguments)
+    
+    position = decode_list_cursor(arguments["cursor"]) if arguments.get("cursor") else {"b": bucket_name}
+    if position["b"] != bucket_name:
+        raise ValueError(f"Cursor belongs to a listing of bucket {position['b']}, not {bucket_name}")
+    prefix = arguments.get("prefix", position.get("p", ""))
+    delimiter = arguments.get("delimiter", position.get("d"))
+    if arguments.get("cursor") and (prefix != position.get("p", "") or delimiter != position.get("d")):
+        raise ValueError("prefix and delimiter must match the listing the cursor came from")
+    
+    if "limit" in arguments:
+        if "max_keys" in arguments:
+            raise ValueError("Pass either limit or max_keys, not both")
+        paginate, max_keys = True, arguments["limit"]
+    elif arguments.get("parallel"):
+        paginate, max_keys = True, arguments.get("max_keys", LIST_PAGINATE_MAX_KEYS)
+    else:
+        paginate = bool(arguments.get("auto_paginate"))
+        max_keys = arguments.get("max_keys", LIST_PAGINATE_MAX_KEYS if paginate else 1000)
+        if not paginate:
+            max_keys = min(max_keys, 1000)
+    
+    if arguments.get("parallel"):
+        if delimiter:
+            raise ValueError("parallel listing does not support delimiter")
+        if "t" in position:
+            raise ValueError("This cursor continues a page-by-page listing; pass it without parallel")
+        listing = await client.list_objects_parallel(
+            bucket_name,
+            prefix=prefix,
+            start_after=position.get("a"),
+            max_keys=max_keys,
+            max_bytes=arguments.get("max_bytes"),
+            match=match
+        )
+        next_cursor = None
+        if listing["start_after"] is not None:
+            next_cursor = encode_list_cursor({"b": bucket_name, "p": prefix, "d": None, "a": listing["start_after"]})
+        formatted_result = {
+            "Bucket": bucket_name,
+            "Objects": [o.to_dict() for o in listing["objects"]],
+            "Count": len(listing["objects"]),
+            "IsTruncated": next_cursor is not None,
+            "NextCursor": next_cursor,
+            "Shards": listing["shards"]
+        }
+        if match is not None:
+            formatted_result["Scanned"] = listing["scanned"]
+        return formatted_result
+    
+    listing = await client.list_objects(
+        bucket_name,
+        prefix=prefix,
+        delimiter=delimiter,
+        continuation_token=position.get("t"),
+        start_after=position.get("a"),
+        max_keys=max_keys,
+        max_bytes=arguments.get("max_bytes"),
+        paginate=paginate,
+        match=match
+    )
+    
+    next_cursor = None
+    if listing["next_token"] is not None:
+        next_cursor = encode_list_cursor({"b": bucket_name, "p": prefix, "d": delimiter, "t": listing["next_token"]})
+    elif listing["start_after"] is not None:
+        next_cursor = encode_list_cursor({"b": bucket_name, "p": prefix, "d": delimiter, "a": listing["start_after"]})
+    
+    formatted_result = {
+        "Bucket": bucket_name,
+        "Objects": [o.to_dict() for o in listing["objects"]],
+        "Count": len(listing["objects"])
+    }
+    if delimiter:
+        formatted_result["CommonPrefixes"] = listing["common_prefixes"]
+    formatted_result["IsTruncated"] = next_cursor is not None
+    formatted_result["NextCursor"] = next_cursor
+    formatted_result["Pages"] = listing["pages"]
+    if match is not None:
+        formatted_result["Scanned"] = listing["scanned"]
+    return formatted_result
+
+
+@tool(
+    name="object_get_bucket_policy",
+    description="Get the policy of a bucket",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
             }
-        ),
-        Tool(
-            name="vpsa_list_pools",
-            description="List all storage pools in the VPSA",
-            inputSchema={
+        },
+        "required": ["bucket_name"]
+    }
+)
+async def object_get_bucket_policy(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    result = await client.object_storage_request("GET", f"/{bucket_name}?policy")
+    return result
+
+
+@tool(
+    name="object_set_bucket_policy",
+    description="Set the policy of a bucket",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "policy": {
                 "type": "object",
-                "properties": {}
+                "description": "Bucket policy JSON"
             }
-        ),
-        Tool(
-            name="vpsa_list_servers",
-            description="List all servers connected to the VPSA",
-            inputSchema={
-                "type": "object",
-                "properties": {}
+        },
+        "required": ["bucket_name", "policy"]
+    }
+)
+async def object_set_bucket_policy(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    policy = arguments["policy"]
+    result = await client.object_storage_request("PUT", f"/{bucket_name}?policy", data=policy)
+    return result
+
+
+@tool(
+    name="object_get_bucket_versioning",
+    description="Get versioning configuration of a bucket",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
             }
-        ),
-        Tool(
-            name="vpsa_create_snapshot",
-            description="Create a snapshot of a volume",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "volume_id": {
-                        "type": "string",
-                        "description": "Volume ID to snapshot"
-                    },
-                    "snapshot_name": {
-                        "type": "string",
-                        "description": "Name for the snapshot"
-                    }
-                },
-                "required": ["volume_id", "snapshot_name"]
+        },
+        "required": ["bucket_name"]
+    }
+)
+async def object_get_bucket_versioning(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    result = await client.object_storage_request("GET", f"/{bucket_name}?versioning")
+    return result
+
+
+@tool(
+    name="object_set_bucket_versioning",
+    description="Set versioning configuration of a bucket",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "status": {
+                "type": "string",
+                "enum": ["Enabled", "Suspended"],
+                "description": "Versioning status"
             }
-        ),
-        Tool(
-            name="vpsa_list_snapshots",
-            description="List all snapshots",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "volume_id": {
-                        "type": "string",
-                        "description": "Filter by volume ID (optional)"
-                    }
-                }
+        },
+        "required": ["bucket_name", "status"]
+    }
+)
+async def object_set_bucket_versioning(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    data = {
+        "VersioningConfiguration": {
+            "Status": arguments["status"]
+        }
+    }
+    result = await client.object_storage_request("PUT", f"/{bucket_name}?versioning", data=data)
+    return result
+
+
+@tool(
+    name="object_upload",
+    description="Upload an object to object storage. Provide file content as base64-encoded string. Large objects are uploaded automatically as parallel multipart uploads.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path (e.g., 'document.pdf' or 'folder/file.txt')"
+            },
+            "content_base64": {
+                "type": "string",
+                "description": "Base64-encoded file content"
+            },
+            "content_type": {
+                "type": "string",
+                "description": "MIME type (default: application/octet-stream)"
             }
-        ),
-        Tool(
-            name="vpsa_get_performance",
-            description="Get performance metrics for the VPSA",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "interval": {
-                        "type": "string",
-                        "description": "Time interval (e.g., '1h', '24h', '7d')"
-                    }
-                }
+        },
+        "required": ["bucket_name", "object_key", "content_base64"]
+    }
+)
+async def object_upload(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    object_key = arguments["object_key"]
+    content_base64 = arguments["content_base64"]
+    content_type = arguments.get("content_type", "application/octet-stream")
+    
+    # Decode base64 content
+    content = base64.b64decode(content_base64)
+    
+    result = await client.upload_object(bucket_name, object_key, content, content_type)
+    return result
+
+
+@tool(
+    name="object_download",
+    description="Download an object from object storage. Returns base64-encoded content. Large objects are fetched as parallel byte ranges.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path"
             }
-        ),
-        Tool(
-            name="vpsa_list_controllers",
-            description="List all controllers in the VPSA",
-            inputSchema={
-                "type": "object",
-                "properties": {}
+        },
+        "required": ["bucket_name", "object_key"]
+    }
+)
+async def object_download(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    object_key = arguments["object_key"]
+    
+    result = await client.download_object(bucket_name, object_key)
+    
+    # Encode content as base64 for transport
+    content_base64 = base64.b64encode(result["content"]).decode()
+    
+    response = {
+        "bucket": bucket_name,
+        "key": object_key,
+        "content_type": result["content_type"],
+        "size": result["size"],
+        "content_base64": content_base64
+    }
+    return response
+
+
+@tool(
+    name="object_read_range",
+    description="Read one window of an object using an HTTP Range request. Returns base64-encoded bytes plus the total size and ETag, so large objects can be paged through chunk by chunk.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path"
+            },
+            "offset": {
+                "type": "integer",
+                "description": "Byte offset to start reading from (default: 0)"
+            },
+            "length": {
+                "type": "integer",
+                "description": f"Number of bytes to read (default: {READ_WINDOW_SIZE}, maximum: {READ_WINDOW_MAX_SIZE})"
+            },
+            "chunk_index": {
+                "type": "integer",
+                "description": "Read the chunk_index-th window of `length` bytes instead of giving an offset"
+            },
+            "etag": {
+                "type": "string",
+                "description": "ETag from a previous window; the read fails if the object has changed since"
             }
-        ),
-        
-        # Object Storage Tools
-        Tool(
-            name="object_list_buckets",
-            description="List all buckets in object storage",
-            inputSchema={
-                "type": "object",
-                "properties": {}
+        },
+        "required": ["bucket_name", "object_key"]
+    }
+)
+async def object_read_range(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    object_key = arguments["object_key"]
+    length = min(int(arguments.get("length") or READ_WINDOW_SIZE), READ_WINDOW_MAX_SIZE)
+    if "chunk_index" in arguments:
+        offset = int(arguments["chunk_index"]) * length
+    else:
+        offset = int(arguments.get("offset", 0))
+    
+    result = await client.read_object_range(
+        bucket_name, object_key, offset, length, etag=arguments.get("etag")
+    )
+    end = result["offset"] + result["length"]
+    
+    response = {
+        "bucket": bucket_name,
+        "key": object_key,
+        "content_type": result["content_type"],
+        "etag": result["etag"],
+        "size": result["size"],
+        "offset": result["offset"],
+        "length": result["length"],
+        "chunk_index": offset // length,
+        "total_chunks": -(-result["size"] // length),
+        "next_offset": end if end < result["size"] else None,
+        "eof": end >= result["size"],
+        "content_base64": base64.b64encode(result["content"]).decode()
+    }
+    return response
+
+
+@tool(
+    name="object_presign_url",
+    description="Create a presigned (SigV4 query-string) GET or PUT URL for an object, so large transfers can be done by an external tool instead of through this server.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path"
+            },
+            "method": {
+                "type": "string",
+                "enum": ["GET", "PUT"],
+                "description": "HTTP method the URL is valid for (default: GET)"
+            },
+            "expires_in": {
+                "type": "integer",
+                "description": f"Lifetime in seconds (default: {PRESIGN_DEFAULT_EXPIRY}, maximum: {PRESIGN_MAX_EXPIRY})"
             }
-        ),
-        Tool(
-            name="object_create_bucket",
-            description="Create a new bucket in object storage",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket to create"
-                    },
-                    "region": {
-                        "type": "string",
-                        "description": "Region for the bucket (optional)"
-                    }
-                },
-                "required": ["bucket_name"]
+        },
+        "required": ["bucket_name", "object_key"]
+    }
+)
+async def object_presign_url(arguments: dict) -> Any:
+    result = client.presign_url(
+        arguments["bucket_name"],
+        arguments["object_key"],
+        arguments.get("method", "GET"),
+        int(arguments.get("expires_in", PRESIGN_DEFAULT_EXPIRY))
+    )
+    return result
+
+
+@tool(
+    name="object_upload_file",
+    description="Upload a local file to object storage. The file is streamed from disk (multipart for large files), so any size works.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path (e.g., 'document.pdf' or 'folder/file.txt')"
+            },
+            "file_path": {
+                "type": "string",
+                "description": "Path of the file to upload, relative to ZADARA_FILE_TRANSFER_ROOT"
+            },
+            "content_type": {
+                "type": "string",
+                "description": "MIME type (default: application/octet-stream)"
             }
-        ),
-        Tool(
-            name="object_delete_bucket",
-            description="Delete a bucket from object storage",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket to delete"
-                    }
-                },
-                "required": ["bucket_name"]
+        },
+        "required": ["bucket_name", "object_key", "file_path"]
+    }
+)
+async def object_upload_file(arguments: dict) -> Any:
+    result = await client.upload_file(
+        arguments["bucket_name"],
+        arguments["object_key"],
+        arguments["file_path"],
+        arguments.get("content_type", "application/octet-stream")
+    )
+    return result
+
+
+@tool(
+    name="object_download_file",
+    description="Download an object from object storage to a local file. The object is streamed to disk, so any size works.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path"
+            },
+            "file_path": {
+                "type": "string",
+                "description": "Path to write the object to, relative to ZADARA_FILE_TRANSFER_ROOT"
+            },
+            "overwrite": {
+                "type": "boolean",
+                "description": "Replace the file if it already exists (default: false)"
+            },
+            "resume": {
+                "type": "boolean",
+                "description": "Keep a failed download's partial file and continue it on the next call with resume (default: false)"
             }
-        ),
-        Tool(
-            name="object_list_objects",
-            description="List objects in a bucket",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    },
-                    "prefix": {
-                        "type": "string",
-                        "description": "Prefix filter for object keys (optional)"
-                    },
-                    "max_keys": {
-                        "type": "integer",
-                        "description": "Maximum number of keys to return"
-                    }
-                },
-                "required": ["bucket_name"]
+        },
+        "required": ["bucket_name", "object_key", "file_path"]
+    }
+)
+async def object_download_file(arguments: dict) -> Any:
+    result = await client.download_file(
+        arguments["bucket_name"],
+        arguments["object_key"],
+        arguments["file_path"],
+        overwrite=arguments.get("overwrite", False),
+        resume=arguments.get("resume", False)
+    )
+    return result
+
+
+@tool(
+    name="object_delete",
+    description="Delete an object from object storage",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "object_key": {
+                "type": "string",
+                "description": "Object key/path to delete"
             }
-        ),
-        Tool(
-            name="object_get_bucket_policy",
-            description="Get the policy of a bucket",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    }
-                },
-                "required": ["bucket_name"]
+        },
+        "required": ["bucket_name", "object_key"]
+    }
+)
+async def object_delete(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    object_key = arguments["object_key"]
+    
+    result = await client.delete_object(bucket_name, object_key)
+    return result
+
+
+@tool(
+    name="object_bulk_delete",
+    description="Delete many objects with S3 multi-object delete (up to 1000 keys per request, requests sent in parallel). Give either a list of keys or a prefix; use dry_run with a prefix to count what would be deleted.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_name": {
+                "type": "string",
+                "description": "Name of the bucket"
+            },
+            "keys": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Object keys to delete"
+            },
+            "prefix": {
+                "type": "string",
+                "description": "Delete every object whose key starts with this prefix"
+            },
+            "all_objects": {
+                "type": "boolean",
+                "description": "Required to delete with an empty prefix (every object in the bucket)"
+            },
+            "dry_run": {
+                "type": "boolean",
+                "description": "With a prefix: only count the matching objects and bytes (default: false)"
+            },
+            "concurrency": {
+                "type": "integer",
+                "description": f"Delete requests in flight (default: {DELETE_CONCURRENCY})"
             }
-        ),
-        Tool(
-            name="object_set_bucket_policy",
-            description="Set the policy of a bucket",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    },
-                    "policy": {
-                        "type": "object",
-                        "description": "Bucket policy JSON"
-                    }
-                },
-                "required": ["bucket_name", "policy"]
+        },
+        "required": ["bucket_name"]
+    }
+)
+async def object_bulk_delete(arguments: dict) -> Any:
+    bucket_name = arguments["bucket_name"]
+    concurrency = int(arguments.get("concurrency", DELETE_CONCURRENCY))
+    
+    if "keys" in arguments:
+        if "prefix" in arguments:
+            raise ValueError("Give either keys or prefix, not both")
+        return await client.delete_keys(bucket_name, arguments["keys"], concurrency)
+    
+    if "prefix" not in arguments:
+        raise ValueError("Either keys or prefix is required")
+    prefix = arguments["prefix"]
+    if not prefix and not arguments.get("all_objects"):
+        raise ValueError("An empty prefix matches every object; set all_objects to confirm")
+    return await client.delete_prefix(
+        bucket_name, prefix, dry_run=arguments.get("dry_run", False), concurrency=concurrency
+    )
+
+
+@tool(
+    name="object_get_bucket_sizes",
+    description="Calculate the total size of all buckets or specific buckets. Returns bucket names, object counts, total sizes, and formatted size strings.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Optional list of specific bucket names to calculate sizes for. If omitted, calculates sizes for all buckets."
+            },
+            "concurrency": {
+                "type": "integer",
+                "description": "Maximum number of buckets to scan in parallel (default: 8)"
             }
-        ),
-        Tool(
-            name="object_get_bucket_versioning",
-            description="Get versioning configuration of a bucket",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    }
-                },
-                "required": ["bucket_name"]
+        }
+    }
+)
+async def object_get_bucket_sizes(arguments: dict) -> Any:
+    # Get list of buckets to process
+    bucket_names = arguments.get("bucket_names")
+    
+    if not bucket_names:
+        # Get all buckets
+        bucket_names = await client.list_bucket_names()
+    
+    if not bucket_names:
+        return "No buckets found"
+    
+    # Calculate size for each bucket, scanning up to `concurrency` buckets at once
+    concurrency = max(1, int(arguments.get("concurrency", BUCKET_SCAN_CONCURRENCY)))
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def scan_bucket(bucket_name: str) -> dict:
+        total_size = 0
+        total_objects = 0
+        error = None
+        
+        async with semaphore:
+            try:
+                total_size, total_objects = await client.calculate_bucket_size(bucket_name)
+            except Exception as e:
+                error = str(e)
+        
+        return {
+            "bucket": bucket_name,
+            "total_size_bytes": total_size,
+            "size_formatted": "Error" if error else format_size(total_size),
+            "object_count": total_objects,
+            "error": error
+        }
+    
+    # gather() keeps results in the same order as bucket_names
+    bucket_stats = await asyncio.gather(*(scan_bucket(b) for b in bucket_names))
+    
+    total_all_size = sum(b["total_size_bytes"] for b in bucket_stats if not b["error"])
+    total_all_objects = sum(b["object_count"] for b in bucket_stats if not b["error"])
+    total_str = format_size(total_all_size)
+    
+    result = {
+        "buckets": bucket_stats,
+        "summary": {
+            "total_size_bytes": total_all_size,
+            "size_formatted": total_str,
+            "total_objects": total_all_objects,
+            "bucket_count": len([b for b in bucket_stats if not b["error"]])
+        }
+    }
+    
+    return result
+
+
+@tool(
+    name="object_top_n",
+    description=(
+        "Find the N largest, smallest, oldest or newest objects across one or more buckets "
+        "without returning the full listings. Buckets are scanned in parallel."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Buckets to scan. If omitted, scans all buckets."
+            },
+            "n": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": TOP_N_MAX,
+                "description": f"Number of objects to return (default: 100, at most {TOP_N_MAX})"
+            },
+            "order": {
+                "type": "string",
+                "enum": list(TopObjects.ORDERS),
+                "description": "Rank objects by size (largest/smallest) or LastModified (oldest/newest); default largest"
+            },
+            "prefix": {
+                "type": "string",
+                "description": "Only scan keys under this prefix (optional)"
+            },
+            **OBJECT_FILTER_PROPERTIES,
+            "concurrency": {
+                "type": "integer",
+                "description": f"Maximum number of buckets to scan in parallel (default: {BUCKET_SCAN_CONCURRENCY})"
             }
-        ),
-        Tool(
-            name="object_set_bucket_versioning",
-            description="Set versioning configuration of a bucket",
-            inputSchema={
+        }
+    }
+)
+async def object_top_n(arguments: dict) -> Any:
+    bucket_names = arguments.get("bucket_names") or await client.list_bucket_names()
+    if not bucket_names:
+        return "No buckets found"
+    
+    top = TopObjects(arguments.get("n", 100), arguments.get("order", "largest"))
+    match = build_object_filter(arguments)
+    prefix = arguments.get("prefix", "")
+    concurrency = max(1, int(arguments.get("concurrency", BUCKET_SCAN_CONCURRENCY)))
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def scan_bucket(bucket_name: str) -> dict:
+        scanned = 0
+        error = None
+        async with semaphore:
+            try:
+                scanned = await client.scan_top_objects(bucket_name, top, prefix=prefix, match=match)
+            except Exception as e:
+                error = str(e)
+        return {"bucket": bucket_name, "scanned": scanned, "error": error}
+    
+    # All buckets feed the same heap, so memory is O(n) in total
+    bucket_stats = await asyncio.gather(*(scan_bucket(b) for b in bucket_names))
+    
+    objects = [{"Bucket": bucket_name, **record.to_dict()} for bucket_name, record in top.results()]
+    return {
+        "order": top.order,
+        "objects": objects,
+        "count": len(objects),
+        "buckets": bucket_stats,
+        "scanned": sum(b["scanned"] for b in bucket_stats)
+    }
+
+
+# Custom Request Tools
+@tool(
+    name="vpsa_custom_request",
+    description="Make a custom API request to VPSA Storage Array. Use this for endpoints not covered by other tools.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "method": {
+                "type": "string",
+                "enum": ["GET", "POST", "PUT", "DELETE"],
+                "description": "HTTP method"
+            },
+            "endpoint": {
+                "type": "string",
+                "description": "API endpoint path (without /api/ prefix)"
+            },
+            "data": {
                 "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    },
-                    "status": {
-                        "type": "string",
-                        "enum": ["Enabled", "Suspended"],
-                        "description": "Versioning status"
-                    }
-                },
-                "required": ["bucket_name", "status"]
-            }
-        ),
-        Tool(
-            name="object_upload",
-            description="Upload an object to object storage. Provide file content as base64-encoded string.",
-            inputSchema={
+                "description": "Request body data (optional)"
+            },
+            "params": {
                 "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    },
-                    "object_key": {
-                        "type": "string",
-                        "description": "Object key/path (e.g., 'document.pdf' or 'folder/file.txt')"
-                    },
-                    "content_base64": {
-                        "type": "string",
-                        "description": "Base64-encoded file content"
-                    },
-                    "content_type": {
-                        "type": "string",
-                        "description": "MIME type (default: application/octet-stream)"
-                    }
-                },
-                "required": ["bucket_name", "object_key", "content_base64"]
+                "description": "Query parameters (optional)"
             }
-        ),
-        Tool(
-            name="object_download",
-            description="Download an object from object storage. Returns base64-encoded content.",
-            inputSchema={
+        },
+        "required": ["method", "endpoint"]
+    }
+)
+async def vpsa_custom_request(arguments: dict) -> Any:
+    method = arguments["method"]
+    endpoint = arguments["endpoint"]
+    data = arguments.get("data")
+    params = arguments.get("params")
+    
+    result = await client.vpsa_request(method, endpoint, data=data, params=params)
+    return result
+
+
+@tool(
+    name="object_custom_request",
+    description="Make a custom API request to Object Storage. Use this for endpoints not covered by other tools.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "method": {
+                "type": "string",
+                "enum": ["GET", "POST", "PUT", "DELETE"],
+                "description": "HTTP method"
+            },
+            "endpoint": {
+                "type": "string",
+                "description": "API endpoint path"
+            },
+            "data": {
                 "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    },
-                    "object_key": {
-                        "type": "string",
-                        "description": "Object key/path"
-                    }
-                },
-                "required": ["bucket_name", "object_key"]
-            }
-        ),
-        Tool(
-            name="object_delete",
-            description="Delete an object from object storage",
-            inputSchema={
+                "description": "Request body data (optional)"
+            },
+            "params": {
                 "type": "object",
-                "properties": {
-                    "bucket_name": {
-                        "type": "string",
-                        "description": "Name of the bucket"
-                    },
-                    "object_key": {
-                        "type": "string",
-                        "description": "Object key/path to delete"
-                    }
-                },
-                "required": ["bucket_name", "object_key"]
+                "description": "Query parameters (optional)"
             }
-        ),
-        Tool(
-            name="object_get_bucket_sizes",
-            description="Calculate the total size of all buckets or specific buckets. Returns bucket names, object counts, total sizes, and formatted size strings.",
-            inputSchema={
+        },
+        "required": ["method", "endpoint"]
+    }
+)
+async def object_custom_request(arguments: dict) -> Any:
+    method = arguments["method"]
+    endpoint = arguments["endpoint"]
+    data = arguments.get("data")
+    params = arguments.get("params")
+    
+    result = await client.object_storage_request(method, endpoint, data=data, params=params)
+    return result
+
+
+# Batch Tools
+async def run_batch(prefix: str, operations: list, concurrency: int = BATCH_CONCURRENCY) -> dict:
+    """Run tool operations concurrently and collect per-item results.
+    
+    Each operation is {"tool": name, "arguments": {...}}; the name may omit
+    the prefix ("get_volume" for "vpsa_get_volume"). Arguments are checked
+    against the tool's input schema as in call_tool, then operations run
+    through the registered handlers, at most `concurrency` at a time; an
+    invalid or failing operation is reported in its own entry without
+    affecting the others. Results are returned in the order of the operations.
+    """
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise ValueError(f"A batch can hold at most {BATCH_MAX_OPERATIONS} operations")
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, BATCH_MAX_CONCURRENCY)))
+    
+    async def run(index: int, operation: dict) -> dict:
+        name = operation.get("tool", "")
+        if not name.startswith(prefix):
+            name = prefix + name
+        spec = TOOL_REGISTRY.get(name)
+        if spec is None or name.endswith("_batch"):
+            return {"index": index, "tool": name, "ok": False, "error": f"Unknown tool: {name}"}
+        
+        arguments = dict(operation.get("arguments") or {})
+        error = validate_arguments(spec, arguments)
+        if error is not None:
+            return {"index": index, "tool": name, "ok": False, "error": error}
+        fields = arguments.pop("fields", None)
+        arguments.pop("output", None)
+        arguments.pop("profile", None)
+        async with semaphore:
+            try:
+                result = await spec.handler(arguments)
+            except Exception as e:
+                return {"index": index, "tool": name, "ok": False, "error": str(e)}
+        
+        if fields and not isinstance(result, str):
+            result = project_fields(result, fields)
+        return {"index": index, "tool": name, "ok": True, "result": result}
+    
+    results = await asyncio.gather(*(run(i, op) for i, op in enumerate(operations)))
+    failed = sum(1 for item in results if not item["ok"])
+    return {
+        "count": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results
+    }
+
+
+BATCH_OPERATIONS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "tool": {
+                "type": "string",
+                "description": "Tool to run"
+            },
+            "arguments": {
                 "type": "object",
-                "properties": {
-                    "bucket_names": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional list of specific bucket names to calculate sizes for. If omitted, calculates sizes for all buckets."
-                    }
-                }
+                "description": "Arguments for the tool (may include `fields`)"
             }
-        ),
-        Tool(
-            name="vpsa_custom_request",
-            description="Make a custom API request to VPSA Storage Array. Use this for endpoints not covered by other tools.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "method": {
-                        "type": "string",
-                        "enum": ["GET", "POST", "PUT", "DELETE"],
-                        "description": "HTTP method"
-                    },
-                    "endpoint": {
-                        "type": "string",
-                        "description": "API endpoint path (without /api/ prefix)"
-                    },
-                    "data": {
-                        "type": "object",
-                        "description": "Request body data (optional)"
-                    },
-                    "params": {
-                        "type": "object",
-                        "description": "Query parameters (optional)"
-                    }
-                },
-                "required": ["method", "endpoint"]
+        },
+        "required": ["tool"]
+    }
+}
+
+
+@tool(
+    name="vpsa_batch",
+    description="Run many VPSA operations (e.g. vpsa_get_volume for 50 volumes) concurrently in one call. Returns a result or error per operation, in order.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "operations": {
+                **BATCH_OPERATIONS_SCHEMA,
+                "description": "Operations such as {\"tool\": \"vpsa_get_volume\", \"arguments\": {\"volume_id\": \"volume-00000001\"}}"
+            },
+            "concurrency": {
+                "type": "integer",
+                "description": f"Operations run at the same time (default: {BATCH_CONCURRENCY}, maximum: {BATCH_MAX_CONCURRENCY})"
             }
-        ),
-        Tool(
-            name="object_custom_request",
-            description="Make a custom API request to Object Storage. Use this for endpoints not covered by other tools.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "method": {
-                        "type": "string",
-                        "enum": ["GET", "POST", "PUT", "DELETE"],
-                        "description": "HTTP method"
-                    },
-                    "endpoint": {
-                        "type": "string",
-                        "description": "API endpoint path"
-                    },
-                    "data": {
-                        "type": "object",
-                        "description": "Request body data (optional)"
-                    },
-                    "params": {
-                        "type": "object",
-                        "description": "Query parameters (optional)"
-                    }
-                },
-                "required": ["method", "endpoint"]
+        },
+        "required": ["operations"]
+    }
+)
+async def vpsa_batch(arguments: dict) -> Any:
+    return await run_batch(
+        "vpsa_",
+        arguments["operations"],
+        int(arguments.get("concurrency", BATCH_CONCURRENCY))
+    )
+
+
+@tool(
+    name="object_batch",
+    description="Run many object storage operations (e.g. object_delete for 200 keys) concurrently in one call. Returns a result or error per operation, in order.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "operations": {
+                **BATCH_OPERATIONS_SCHEMA,
+                "description": "Operations such as {\"tool\": \"object_delete\", \"arguments\": {\"bucket_name\": \"b\", \"object_key\": \"k\"}}"
+            },
+            "concurrency": {
+                "type": "integer",
+                "description": f"Operations run at the same time (default: {BATCH_CONCURRENCY}, maximum: {BATCH_MAX_CONCURRENCY})"
+            }
+        },
+        "required": ["operations"]
+    }
+)
+async def object_batch(arguments: dict) -> Any:
+    return await run_batch(
+        "object_",
+        arguments["operations"],
+        int(arguments.get("concurrency", BATCH_CONCURRENCY))
+    )
+
+
+# Server Tools
+def server_stats_snapshot() -> dict:
+    """Tool and backend metrics together with the client's cache and request control state"""
+    return {**metrics.snapshot(), **client.stats()}
+
+
+@tool(
+    name="server_stats",
+    description="Show server metrics: per-tool and per-backend latency percentiles, request and error counts, retries, bytes sent/received, cache hits and in-flight requests",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "format": {
+                "type": "string",
+                "enum": ["json", "prometheus"],
+                "description": "Return the metrics as JSON (default) or Prometheus text"
+            },
+            "reset": {
+                "type": "boolean",
+                "description": "Reset the counters after reading them (default: false)"
             }
+        }
+    }
+)
+async def server_stats(arguments: dict) -> Any:
+    if arguments.get("format") == "prometheus":
+        result = metrics.prometheus(client.stats())
+    else:
+        result = server_stats_snapshot()
+    if arguments.get("reset"):
+        metrics.reset()
+    return result
+
+
+STATS_RESOURCE_URI = "zadara://server/stats"
+
+
+@app.list_resources()
+async def list_resources() -> list[Resource]:
+    """List available resources"""
+    return [
+        Resource(
+            uri=STATS_RESOURCE_URI,
+            name="Server statistics",
+            description="Tool and backend metrics, as returned by the server_stats tool",
+            mimeType="application/json"
         )
     ]
 
 
-@app.call_tool()
+@app.read_resource()
+async def read_resource(uri: Any) -> str:
+    """Read a resource"""
+    if str(uri) != STATS_RESOURCE_URI:
+        raise ValueError(f"Unknown resource: {uri}")
+    return encode_result(server_stats_snapshot(), "pretty")
+
+
+# Built once: list_tools is called by every client on connect (and often again)
+TOOLS = [spec.tool for spec in TOOL_REGISTRY.values()]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools"""
+    return TOOLS
+
+
+def validate_arguments(spec: ToolSpec, arguments: dict) -> Optional[str]:
+    """Check arguments against the tool's input schema; return the error message, or None if valid"""
+    if spec.validator is None:
+        return None
+    error = jsonschema.exceptions.best_match(spec.validator.iter_errors(arguments))
+    return f"Input validation error: {error.message}" if error is not None else None
+
+
+def call_tool_decorator():
+    """app.call_tool(), with the SDK's per-call input validation replaced by the prebuilt validators"""
+    try:
+        return app.call_tool(validate_input=False)
+    except TypeError:  # mcp < 1.10 does not validate input
+        return app.call_tool()
+
+
+@call_tool_decorator()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls"""
+    spec = TOOL_REGISTRY.get(name)
+    if spec is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
     
+    arguments = dict(arguments or {})
+    error = validate_arguments(spec, arguments)
+    if error is not None:
+        metrics.tool(name).errors += 1
+        return [TextContent(type="text", text=error)]
+    fields = arguments.pop("fields", None)
+    output = arguments.pop("output", None) or OUTPUT_FORMAT
+    summarize_profile = bool(arguments.pop("profile", False))
+    profile = None
+    if summarize_profile or (PROFILE_TOOLS and ("all" in PROFILE_TOOLS or name in PROFILE_TOOLS)):
+        profile = CallProfile(name)
+    
+    tool_metrics = metrics.tool(name)
+    tool_metrics.in_flight += 1
+    started = time.perf_counter()
     try:
-        # VPSA Storage Array Tools
-        if name == "vpsa_list_volumes":
-            params = {}
-            if "limit" in arguments:
-                params["limit"] = arguments["limit"]
-            if "offset" in arguments:
-                params["offset"] = arguments["offset"]
-            
-            result = await client.vpsa_request("GET", "volumes.json", params=params)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_create_volume":
-            data = {
-                "name": arguments["name"],
-                "capacity": arguments["capacity"],
-                "pool": arguments["pool"]
-            }
-            if "block_size" in arguments:
-                data["block_size"] = arguments["block_size"]
-            
-            result = await client.vpsa_request("POST", "volumes.json", data=data)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_get_volume":
-            volume_id = arguments["volume_id"]
-            result = await client.vpsa_request("GET", f"volumes/{volume_id}.json")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_delete_volume":
-            volume_id = arguments["volume_id"]
-            result = await client.vpsa_request("DELETE", f"volumes/{volume_id}.json")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_list_pools":
-            result = await client.vpsa_request("GET", "pools.json")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_list_servers":
-            result = await client.vpsa_request("GET", "servers.json")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_create_snapshot":
-            data = {
-                "volume": arguments["volume_id"],
-                "display_name": arguments["snapshot_name"]
-            }
-            result = await client.vpsa_request("POST", "snapshots.json", data=data)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_list_snapshots":
-            params = {}
-            if "volume_id" in arguments:
-                params["volume"] = arguments["volume_id"]
-            
-            result = await client.vpsa_request("GET", "snapshots.json", params=params)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_get_performance":
-            params = {}
-            if "interval" in arguments:
-                params["interval"] = arguments["interval"]
-            
-            result = await client.vpsa_request("GET", "performance.json", params=params)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "vpsa_list_controllers":
-            result = await client.vpsa_request("GET", "vcontrollers.json")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        # Object Storage Tools
-        elif name == "object_list_buckets":
-            result = await client.object_storage_request("GET", "/")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_create_bucket":
-            bucket_name = arguments["bucket_name"]
-            data = {}
-            if "region" in arguments:
-                data["CreateBucketConfiguration"] = {
-                    "LocationConstraint": arguments["region"]
-                }
-            
-            result = await client.object_storage_request("PUT", f"/{bucket_name}", data=data)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_delete_bucket":
-            bucket_name = arguments["bucket_name"]
-            result = await client.object_storage_request("DELETE", f"/{bucket_name}")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_list_objects":
-            bucket_name = arguments["bucket_name"]
-            params = {}
-            if "prefix" in arguments:
-                params["prefix"] = arguments["prefix"]
-            if "max_keys" in arguments:
-                params["max-keys"] = arguments["max_keys"]
-            
-            result = await client.object_storage_request("GET", f"/{bucket_name}", params=params)
-            
-            # Parse XML response if present
-            if "xml_content" in result:
-                try:
-                    import xml.etree.ElementTree as ET
-                    root = ET.fromstring(result["xml_content"])
-                    
-                    # Parse S3 ListBucket response
-                    objects = []
-                    
-                    # Try different XML structures
-                    # First try with namespace
-                    namespace = {'s3': 'http://s3.amazonaws.com/doc/2006-03-01/'}
-                    contents = root.findall('.//s3:Contents', namespace)
-                    
-                    # If not found, try without namespace
-                    if not contents:
-                        contents = root.findall('.//Contents')
-                    
-                    # If still not found, try root level Contents
-                    if not contents:
-                        for child in root:
-                            if child.tag.endswith('Contents') or child.tag == 'Contents':
-                                contents.append(child)
-                    
-                    for content in contents:
-                        # Try to find Key
-                        key_elem = None
-                        size_elem = None
-                        modified_elem = None
-                        
-                        for child in content:
-                            tag = child.tag.split('}')[-1]  # Remove namespace if present
-                            if tag == 'Key':
-                                key_elem = child
-                            elif tag == 'Size':
-                                size_elem = child
-                            elif tag == 'LastModified':
-                                modified_elem = child
-                        
-                        # Only add if we found a Key
-                        if key_elem is not None and key_elem.text:
-                            obj = {
-                                "Key": key_elem.text,
-                                "Size": int(size_elem.text) if size_elem is not None and size_elem.text else 0,
-                                "LastModified": modified_elem.text if modified_elem is not None and modified_elem.text else ""
-                            }
-                            objects.append(obj)
-                    
-                    formatted_result = {
-                        "Bucket": bucket_name,
-                        "Objects": objects,
-                        "Count": len(objects)
-                    }
-                    
-                    # If no objects found, show raw XML for debugging
-                    if len(objects) == 0:
-                        return [TextContent(type="text", text=f"No objects found. Raw XML for debugging:\n\n{result['xml_content']}")]
-                    
-                    return [TextContent(type="text", text=json.dumps(formatted_result, indent=2))]
-                except Exception as e:
-                    return [TextContent(type="text", text=f"XML parsing error: {str(e)}\n\nRaw XML response:\n{result['xml_content']}")]
-            
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_get_bucket_policy":
-            bucket_name = arguments["bucket_name"]
-            result = await client.object_storage_request("GET", f"/{bucket_name}?policy")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_set_bucket_policy":
-            bucket_name = arguments["bucket_name"]
-            policy = arguments["policy"]
-            result = await client.object_storage_request("PUT", f"/{bucket_name}?policy", data=policy)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_get_bucket_versioning":
-            bucket_name = arguments["bucket_name"]
-            result = await client.object_storage_request("GET", f"/{bucket_name}?versioning")
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_set_bucket_versioning":
-            bucket_name = arguments["bucket_name"]
-            data = {
-                "VersioningConfiguration": {
-                    "Status": arguments["status"]
-                }
-            }
-            result = await client.object_storage_request("PUT", f"/{bucket_name}?versioning", data=data)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_upload":
-            bucket_name = arguments["bucket_name"]
-            object_key = arguments["object_key"]
-            content_base64 = arguments["content_base64"]
-            content_type = arguments.get("content_type", "application/octet-stream")
-            
-            # Decode base64 content
-            content = base64.b64decode(content_base64)
-            
-            result = await client.upload_object(bucket_name, object_key, content, content_type)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_download":
-            bucket_name = arguments["bucket_name"]
-            object_key = arguments["object_key"]
-            
-            result = await client.download_object(bucket_name, object_key)
-            
-            # Encode content as base64 for transport
-            content_base64 = base64.b64encode(result["content"]).decode()
-            
-            response = {
-                "bucket": bucket_name,
-                "key": object_key,
-                "content_type": result["content_type"],
-                "size": result["size"],
-                "content_base64": content_base64
-            }
-            return [TextContent(type="text", text=json.dumps(response, indent=2))]
-        
-        elif name == "object_delete":
-            bucket_name = arguments["bucket_name"]
-            object_key = arguments["object_key"]
-            
-            result = await client.delete_object(bucket_name, object_key)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_get_bucket_sizes":
-            # Get list of buckets to process
-            bucket_names = arguments.get("bucket_names")
-            
-            if not bucket_names:
-                # Get all buckets
-                buckets_result = await client.object_storage_request("GET", "/")
-                
-                # Parse bucket names from XML
-                if "xml_content" in buckets_result:
-                    import xml.etree.ElementTree as ET
-                    root = ET.fromstring(buckets_result["xml_content"])
-                    namespace = {'s3': 'http://s3.amazonaws.com/doc/2006-03-01/'}
-                    
-                    bucket_names = []
-                    for bucket in root.findall('.//s3:Bucket', namespace):
-                        name_elem = bucket.find('s3:n', namespace)
-                        if name_elem is None:
-                            name_elem = bucket.find('.//n')
-                        if name_elem is not None and name_elem.text:
-                            bucket_names.append(name_elem.text)
-                    
-                    if not bucket_names:
-                        # Try without namespace
-                        for bucket in root.findall('.//Bucket'):
-                            for child in bucket:
-                                tag = child.tag.split('}')[-1]
-                                if tag in ['Name', 'n'] and child.text:
-                                    bucket_names.append(child.text)
-                                    break
-            
-            if not bucket_names:
-                return [TextContent(type="text", text="No buckets found")]
-            
-            # Calculate size for each bucket
-            bucket_stats = []
-            total_all_size = 0
-            total_all_objects = 0
-            
-            for bucket_name in bucket_names:
-                total_size = 0
-                total_objects = 0
-                continuation_token = None
-                error = None
-                
-                try:
-                    while True:
-                        params = {"list-type": "2", "max-keys": "1000"}
-                        if continuation_token:
-                            params["continuation-token"] = continuation_token
-                        
-                        result = await client.object_storage_request("GET", f"/{bucket_name}", params=params)
-                        
-                        if "xml_content" in result:
-                            import xml.etree.ElementTree as ET
-                            root = ET.fromstring(result["xml_content"])
-                            namespace = {'s3': 'http://s3.amazonaws.com/doc/2006-03-01/'}
-                            
-                            # Parse objects
-                            contents = root.findall('.//s3:Contents', namespace)
-                            if not contents:
-                                contents = root.findall('.//Contents')
-                            
-                            for content in contents:
-                                size_elem = None
-                                for child in content:
-                                    tag = child.tag.split('}')[-1]
-                                    if tag == 'Size' and child.text:
-                                        size_elem = child
-                                        break
-                                
-                                if size_elem is not None:
-                                    total_size += int(size_elem.text)
-                                    total_objects += 1
-                            
-                            # Check for pagination
-                            is_truncated = root.find('.//s3:IsTruncated', namespace)
-                            if is_truncated is None:
-                                is_truncated = root.find('.//IsTruncated')
-                            
-                            if is_truncated is not None and is_truncated.text == 'true':
-                                next_token = root.find('.//s3:NextContinuationToken', namespace)
-                                if next_token is None:
-                                    next_token = root.find('.//NextContinuationToken')
-                                
-                                if next_token is not None and next_token.text:
-                                    continuation_token = next_token.text
-                                else:
-                                    break
-                            else:
-                                break
-                        else:
-                            break
-                
-                except Exception as e:
-                    error = str(e)
-                
-                # Format size
-                if error:
-                    size_str = "Error"
-                elif total_size >= 1024**3:
-                    size_str = f"{total_size / 1024**3:.2f} GB"
-                elif total_size >= 1024**2:
-                    size_str = f"{total_size / 1024**2:.2f} MB"
-                elif total_size >= 1024:
-                    size_str = f"{total_size / 1024:.2f} KB"
-                else:
-                    size_str = f"{total_size} bytes"
-                
-                bucket_stats.append({
-                    "bucket": bucket_name,
-                    "total_size_bytes": total_size,
-                    "size_formatted": size_str,
-                    "object_count": total_objects,
-                    "error": error
-                })
-                
-                if not error:
-                    total_all_size += total_size
-                    total_all_objects += total_objects
-            
-            # Format total
-            if total_all_size >= 1024**3:
-                total_str = f"{total_all_size / 1024**3:.2f} GB"
-            elif total_all_size >= 1024**2:
-                total_str = f"{total_all_size / 1024**2:.2f} MB"
-            elif total_all_size >= 1024:
-                total_str = f"{total_all_size / 1024:.2f} KB"
-            else:
-                total_str = f"{total_all_size} bytes"
-            
-            result = {
-                "buckets": bucket_stats,
-                "summary": {
-                    "total_size_bytes": total_all_size,
-                    "size_formatted": total_str,
-                    "total_objects": total_all_objects,
-                    "bucket_count": len([b for b in bucket_stats if not b["error"]])
-                }
-            }
-            
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        # Custom Request Tools
-        elif name == "vpsa_custom_request":
-            method = arguments["method"]
-            endpoint = arguments["endpoint"]
-            data = arguments.get("data")
-            params = arguments.get("params")
-            
-            result = await client.vpsa_request(method, endpoint, data=data, params=params)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "object_custom_request":
-            method = arguments["method"]
-            endpoint = arguments["endpoint"]
-            data = arguments.get("data")
-            params = arguments.get("params")
-            
-            result = await client.object_storage_request(method, endpoint, data=data, params=params)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
+        if profile is None:
+            result = await run_tool(spec, arguments, fields, output)
         else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
-    
+            with profile:
+                result = await run_tool(spec, arguments, fields, output)
     except Exception as e:
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+        tool_metrics.errors += 1
+        result = f"Error: {str(e)}"
+    finally:
+        tool_metrics.in_flight -= 1
+        tool_metrics.latency.observe(time.perf_counter() - started)
+    
+    content = [TextContent(type="text", text=result)]
+    if summarize_profile:
+        content.append(TextContent(type="text", text=encode_result({"profile": profile.summary()}, output)))
+    return content
+
+
+async def run_tool(spec: ToolSpec, arguments: dict, fields: Optional[list], output: str) -> str:
+    """Run a tool handler and encode its result"""
+    result = await spec.handler(arguments)
+    if not isinstance(result, str):
+        if fields:
+            result = project_fields(result, fields)
+        result = encode_result(result, output)
+    return result
+
+
+async def export_metrics(path: str, interval: float):
+    """Rewrite the Prometheus metrics file every `interval` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            metrics.write_prometheus(path, client.stats())
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, e)
 
 
 async def main():
     """Run the server"""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    await client.open()
+    loop_monitor = asyncio.ensure_future(monitor_event_loop())
+    exporter = None
+    if METRICS_PROMETHEUS_FILE:
+        exporter = asyncio.ensure_future(export_metrics(METRICS_PROMETHEUS_FILE, METRICS_EXPORT_INTERVAL))
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        loop_monitor.cancel()
+        if exporter is not None:
+            exporter.cancel()
+            try:
+                metrics.write_prometheus(METRICS_PROMETHEUS_FILE, client.stats())
+            except OSError as e:
+                logger.warning("Could not write metrics to %s: %s", METRICS_PROMETHEUS_FILE, e)
+        await client.close()
 
 
 if __name__ == "__main__":
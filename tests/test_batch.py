@@ -0,0 +1,30 @@
+"""Batch tools: each operation is validated like a direct tool call"""
+
+import asyncio
+
+import server
+
+
+def test_batch_operations_are_validated(monkeypatch):
+    calls = []
+
+    async def handler(arguments):
+        calls.append(arguments)
+        return {"deleted": arguments["object_key"]}
+
+    spec = server.TOOL_REGISTRY["object_delete"]
+    monkeypatch.setitem(server.TOOL_REGISTRY, "object_delete", spec._replace(handler=handler))
+
+    result = asyncio.run(server.run_batch("object_", [
+        {"tool": "delete", "arguments": {"bucket_name": "logs", "object_key": "a.log"}},
+        {"tool": "delete", "arguments": {"bucket_name": "logs"}},
+        {"tool": "delete", "arguments": {"bucket_name": "logs", "object_key": 7}},
+        {"tool": "delete", "arguments": {"bucket_name": "logs", "object_key": "b.log", "fields": ["deleted"]}}
+    ]))
+
+    assert [item["ok"] for item in result["results"]] == [True, False, False, True]
+    assert result["failed"] == 2
+    for item in result["results"][1:3]:
+        assert item["error"].startswith("Input validation error:")
+    # Invalid operations never reach the handler
+    assert [c["object_key"] for c in calls] == ["a.log", "b.log"]
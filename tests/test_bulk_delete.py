@@ -0,0 +1,73 @@
+"""Prefix delete: listing and deleting overlap with a bounded number of batches in memory"""
+
+import asyncio
+
+import server
+from fake_backends import FakeBackend
+
+
+def test_delete_prefix_holds_back_listing_while_deletes_are_slow():
+    keys = 100000
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("bulk", keys)
+            client = server.ZadaraClient()
+            client.object_storage_url = backend.url
+            client.object_access_key = "test-access"
+            client.object_secret_key = "test-secret"
+            counts = {"listed": 0, "deleted": 0, "outstanding": 0}
+            scan_objects = client.scan_objects
+
+            async def counting_scan(bucket_name, on_page, **kwargs):
+                # Count keys as the listing hands them to delete_prefix
+                def counting_on_page(shard_index, objects):
+                    counts["listed"] += len(objects)
+                    counts["outstanding"] = max(counts["outstanding"], counts["listed"] - counts["deleted"])
+                    return on_page(shard_index, objects)
+
+                return await scan_objects(bucket_name, counting_on_page, **kwargs)
+
+            async def slow_delete(bucket_name, batch):
+                await asyncio.sleep(0.2)
+                counts["deleted"] += len(batch)
+                return {"deleted": len(batch), "errors": []}
+
+            client.scan_objects = counting_scan
+            client.delete_objects = slow_delete
+            try:
+                result = await client.delete_prefix("bulk", "", concurrency=4)
+            finally:
+                await client.close()
+            return result, counts
+
+    result, counts = asyncio.run(scenario())
+    assert result["deleted"] == keys
+    assert result["requests"] == keys // server.DELETE_BATCH_SIZE
+    # Queue + workers (2 x concurrency batches) plus a page per listing shard, not the whole prefix
+    assert counts["outstanding"] <= (2 * 4 + server.LIST_SHARD_CONCURRENCY + 1) * 1000
+
+
+def test_delete_prefix_failure_stops_listing():
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("bulk", 50000)
+            client = server.ZadaraClient()
+            client.object_storage_url = backend.url
+            client.object_access_key = "test-access"
+            client.object_secret_key = "test-secret"
+
+            async def failing_delete(bucket_name, batch):
+                raise ValueError("delete failed")
+
+            client.delete_objects = failing_delete
+            try:
+                await client.delete_prefix("bulk", "", concurrency=2)
+            except ValueError as e:
+                return str(e), backend.state.requests
+            finally:
+                await client.close()
+
+    error, requests = asyncio.run(scenario())
+    assert error == "delete failed"
+    assert requests < 50
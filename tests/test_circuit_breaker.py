@@ -0,0 +1,123 @@
+"""Circuit breaker: one outcome per request, recorded after its retries"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import server
+from fake_backends import FakeBackend
+
+
+def make_client(backend: FakeBackend) -> server.ZadaraClient:
+    client = server.ZadaraClient()
+    client.object_storage_url = backend.url
+    client.object_access_key = "test-access"
+    client.object_secret_key = "test-secret"
+    return client
+
+
+def test_retried_request_that_succeeds_does_not_open_the_circuit(monkeypatch):
+    monkeypatch.setattr(server, "RETRY_BASE_DELAY", 0)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            breaker = client.breakers["object"]
+            breaker.threshold = 3
+            backend.state.inject_faults(500, 502, 504)
+            try:
+                page = await client.list_objects_page("b")
+            finally:
+                await client.close()
+            return page, breaker
+
+    page, breaker = asyncio.run(scenario())
+    assert len(page["objects"]) == 10
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_failures_counted_once_per_request(monkeypatch):
+    monkeypatch.setattr(server, "RETRY_BASE_DELAY", 0)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            breaker = client.breakers["object"]
+            breaker.threshold = 3
+            failures = []
+            try:
+                for _ in range(3):
+                    backend.state.inject_faults(*[500] * server.RETRY_MAX_ATTEMPTS)
+                    with pytest.raises(httpx.HTTPStatusError):
+                        await client.list_objects_page("b")
+                    failures.append(breaker.failures)
+                with pytest.raises(server.CircuitOpenError):
+                    await client.list_objects_page("b")
+            finally:
+                await client.close()
+            return failures, breaker
+
+    failures, breaker = asyncio.run(scenario())
+    assert failures == [1, 2, 3]
+    assert breaker.state == "open"
+
+
+def test_throttled_request_is_not_a_failure(monkeypatch):
+    monkeypatch.setattr(server, "RETRY_BASE_DELAY", 0)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            breaker = client.breakers["object"]
+            breaker.threshold = 1
+            backend.state.inject_faults(*[503] * server.RETRY_MAX_ATTEMPTS)
+            try:
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.list_objects_page("b")
+            finally:
+                await client.close()
+            return breaker
+
+    assert asyncio.run(scenario()).state == "closed"
+
+
+def test_probe_cancelled_during_backoff_releases_the_half_open_slot(monkeypatch):
+    monkeypatch.setattr(server, "retry_delay", lambda attempt, response=None: 5.0)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            breaker = client.breakers["object"]
+            breaker.threshold = 1
+            breaker.reset_timeout = 0.1
+            try:
+                breaker.record(failed=True)
+                assert breaker.state == "open"
+                await asyncio.sleep(0.15)
+
+                # The probe gets a 500 and is cancelled while backing off before its retry
+                backend.state.inject_faults(500)
+                sent = backend.state.requests
+                probe = asyncio.ensure_future(client.list_objects_page("b"))
+                while backend.state.requests == sent:
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(0.05)
+                assert breaker.probing
+                probe.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await probe
+
+                page = await client.list_objects_page("b")
+            finally:
+                await client.close()
+            return page, breaker
+
+    page, breaker = asyncio.run(scenario())
+    assert len(page["objects"]) == 10
+    assert breaker.state == "closed"
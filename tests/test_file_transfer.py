@@ -0,0 +1,208 @@
+"""Local file transfer tools: root enforcement and round trips through the stand-in backend"""
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+import httpx
+import pytest
+
+import server
+from fake_backends import FakeBackend
+
+
+def make_client(backend: FakeBackend) -> server.ZadaraClient:
+    client = server.ZadaraClient()
+    client.object_storage_url = backend.url
+    client.object_access_key = "test-access"
+    client.object_secret_key = "test-secret"
+    return client
+
+
+def test_file_transfers_refused_without_root(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "FILE_TRANSFER_ROOT", "")
+    secret = tmp_path / "credentials"
+    secret.write_text("aws_secret_access_key = x")
+    with pytest.raises(ValueError, match="ZADARA_FILE_TRANSFER_ROOT"):
+        server.client.resolve_local_path(str(secret))
+
+
+def test_paths_outside_root_refused(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "FILE_TRANSFER_ROOT", str(tmp_path / "transfers"))
+    (tmp_path / "transfers").mkdir()
+    client = server.ZadaraClient()
+    assert client.resolve_local_path("a/b.bin") == str(tmp_path / "transfers" / "a" / "b.bin")
+    for path in ("../outside.bin", str(tmp_path / "outside.bin"), "~/.aws/credentials"):
+        with pytest.raises(ValueError, match="outside"):
+            client.resolve_local_path(path)
+
+
+def test_download_file_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "FILE_TRANSFER_ROOT", str(tmp_path))
+    # Small ranges, so several are written concurrently from worker threads
+    monkeypatch.setattr(server, "DOWNLOAD_PART_SIZE", 256 * 1024)
+    data = os.urandom(3 * 1024 * 1024 + 123)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_bucket("files")
+            backend.state.buckets["files"].put("blob.bin", data)
+            client = make_client(backend)
+            try:
+                result = await client.download_file("files", "blob.bin", "out/blob.bin")
+                assert result["ranges"] > 1
+                assert (tmp_path / "out" / "blob.bin").read_bytes() == data
+                assert not (tmp_path / "out" / "blob.bin.part").exists()
+
+                await client.upload_file("files", "copy.bin", "out/blob.bin")
+                result = await client.download_object("files", "copy.bin")
+                assert bytes(result["content"]) == data
+            finally:
+                await client.close()
+
+    asyncio.run(scenario())
+
+
+class SlowWriteExecutor(concurrent.futures.ThreadPoolExecutor):
+    """Default executor whose jobs take a while, counting those still running"""
+
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.running = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        def slow():
+            with self.lock:
+                self.running += 1
+            try:
+                time.sleep(0.05)
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        return super().submit(slow)
+
+
+def test_failed_download_waits_for_writes_and_removes_part_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "FILE_TRANSFER_ROOT", str(tmp_path))
+    monkeypatch.setattr(server, "DOWNLOAD_PART_SIZE", 256 * 1024)
+    data = os.urandom(4 * 1024 * 1024)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        executor = SlowWriteExecutor()
+        loop.set_default_executor(executor)
+        errors = []
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        with FakeBackend() as backend:
+            backend.state.add_bucket("files")
+            backend.state.buckets["files"].put("blob.bin", data)
+            client = make_client(backend)
+            original_range = client._get_range
+
+            async def get_range(url, start, end, write, etag=None):
+                if start == 8 * 256 * 1024:
+                    # Fail one range once others have started writing
+                    await asyncio.sleep(0.02)
+                    raise ValueError("range failed")
+                return await original_range(url, start, end, write, etag)
+
+            client._get_range = get_range
+            try:
+                with pytest.raises(ValueError, match="range failed"):
+                    await client.download_file("files", "blob.bin", "blob.bin")
+                running = executor.running
+                await asyncio.sleep(0.3)
+            finally:
+                await client.close()
+        return running, errors
+
+    running, errors = asyncio.run(scenario())
+    assert running == 0
+    assert errors == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+
+def test_download_resumes_from_part_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "FILE_TRANSFER_ROOT", str(tmp_path))
+    monkeypatch.setattr(server, "DOWNLOAD_PART_SIZE", 256 * 1024)
+    data = os.urandom(16 * 256 * 1024 + 77)
+    failing = 10 * 256 * 1024
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_bucket("files")
+            backend.state.buckets["files"].put("blob.bin", data)
+            client = make_client(backend)
+            original_range = client._get_range
+            fetched = []
+
+            async def get_range(url, start, end, write, etag=None):
+                fetched.append(start)
+                if start == failing and fail:
+                    raise ValueError("range failed")
+                return await original_range(url, start, end, write, etag)
+
+            client._get_range = get_range
+            try:
+                fail = True
+                with pytest.raises(ValueError, match="range failed"):
+                    await client.download_file("files", "blob.bin", "blob.bin", resume=True)
+                assert (tmp_path / "blob.bin.part").exists()
+                progress = json.loads((tmp_path / "blob.bin.part.json").read_text())
+                first = list(fetched)
+
+                fail = False
+                fetched.clear()
+                result = await client.download_file("files", "blob.bin", "blob.bin", resume=True)
+            finally:
+                await client.close()
+            return first, progress, fetched, result
+
+    first, progress, fetched, result = asyncio.run(scenario())
+    assert (tmp_path / "blob.bin").read_bytes() == data
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["blob.bin"]
+    written = {start for start, _ in progress["done"]}
+    assert failing not in written
+    # Only the ranges missing from the partial file are fetched again
+    assert failing in fetched
+    assert not written & set(fetched)
+    assert result["resumed_ranges"] == len(written)
+
+
+def test_download_aborts_when_object_changes_between_ranges(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "FILE_TRANSFER_ROOT", str(tmp_path))
+    monkeypatch.setattr(server, "DOWNLOAD_PART_SIZE", 256 * 1024)
+    data = os.urandom(8 * 256 * 1024)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_bucket("files")
+            bucket = backend.state.buckets["files"]
+            bucket.put("blob.bin", data)
+            client = make_client(backend)
+            original_range = client._get_range
+
+            async def get_range(url, start, end, write, etag=None):
+                if start == 4 * 256 * 1024:
+                    # A new version is written while the download is under way
+                    bucket.put("blob.bin", os.urandom(len(data)))
+                return await original_range(url, start, end, write, etag)
+
+            client._get_range = get_range
+            try:
+                with pytest.raises(httpx.HTTPStatusError) as failure:
+                    await client.download_file("files", "blob.bin", "blob.bin", resume=True)
+            finally:
+                await client.close()
+            return failure.value
+
+    error = asyncio.run(scenario())
+    assert error.response.status_code == 412
+    # Nothing stitched together from two versions is left behind, not even for resuming
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,227 @@
+"""Object listing: parallel sharded listing against the stand-in S3 backend"""
+
+import asyncio
+import random
+
+import pytest
+
+import server
+from fake_backends import FakeBackend
+
+
+def make_client(backend: FakeBackend) -> server.ZadaraClient:
+    client = server.ZadaraClient()
+    client.object_storage_url = backend.url
+    client.object_access_key = "test-access"
+    client.object_secret_key = "test-secret"
+    return client
+
+
+def synthetic_keys(count: int, keys_per_dir: int = 10000) -> list:
+    return [f"d{i // keys_per_dir:05d}/obj-{i:09d}" for i in range(count)]
+
+
+def test_parallel_limit_stops_the_shard_scans_early():
+    keys = 200000
+    match = server.build_object_filter({"key_regex": "000$"})
+    expected = [k for k in synthetic_keys(keys) if k.endswith("000")][:5]
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("big", keys)
+            client = make_client(backend)
+            try:
+                limited = await client.list_objects_parallel("big", max_keys=5, match=match)
+                limited_requests = backend.state.requests
+                backend.state.requests = 0
+                full = await client.list_objects_parallel("big", match=match)
+                full_requests = backend.state.requests
+            finally:
+                await client.close()
+            return limited, limited_requests, full, full_requests
+
+    limited, limited_requests, full, full_requests = asyncio.run(scenario())
+    assert [o.key for o in limited["objects"]] == expected
+    assert limited["start_after"] == expected[-1]
+    assert len(full["objects"]) == keys // 1000
+    assert full["start_after"] is None
+    # The first 5 matches lie in the first 5000 keys; the other shards listed
+    # concurrently until then are cancelled
+    assert limited["scanned"] < keys / 2
+    assert limited_requests < full_requests / 2
+
+
+def test_parallel_listing_keeps_to_the_budget_and_resumes(monkeypatch):
+    keys = 30000
+    monkeypatch.setattr(server, "LIST_PAGINATE_MAX_KEYS", 4000)
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("big", keys)
+            monkeypatch.setattr(server, "client", make_client(backend))
+            try:
+                first = await server.object_list_objects({"bucket_name": "big", "parallel": True})
+                pages = []
+                arguments = {"bucket_name": "big", "parallel": True, "max_bytes": 200000}
+                while True:
+                    page = await server.object_list_objects(arguments)
+                    pages.append(page)
+                    if not page["IsTruncated"]:
+                        break
+                    arguments["cursor"] = page["NextCursor"]
+            finally:
+                await server.client.close()
+            return first, pages
+
+    first, pages = asyncio.run(scenario())
+    expected = synthetic_keys(keys)
+    assert [o["Key"] for o in first["Objects"]] == expected[:4000]
+    assert first["IsTruncated"]
+
+    listed = [o["Key"] for page in pages for o in page["Objects"]]
+    assert listed == expected
+    for page in pages:
+        records = [server.ObjectRecord(*o.values()) for o in page["Objects"]]
+        assert sum(server.record_json_size(r) for r in records) <= 200000
+    assert len(pages) > 1
+
+
+def test_parallel_listing_rejects_page_cursors_and_delimiter():
+    cursor = server.encode_list_cursor({"b": "big", "p": "", "d": None, "t": "token"})
+    with pytest.raises(ValueError, match="without parallel"):
+        asyncio.run(server.object_list_objects({"bucket_name": "big", "parallel": True, "cursor": cursor}))
+    with pytest.raises(ValueError, match="delimiter"):
+        asyncio.run(server.object_list_objects({"bucket_name": "big", "parallel": True, "delimiter": "/"}))
+
+
+def random_keys(count: int, seed: int) -> list:
+    # Short keys over an alphabet with delimiters, sort-order edge cases and non-ASCII
+    rng = random.Random(seed)
+    alphabet = ["a", "b", "z", "0", "9", "/", "//", "-", "~", " ", "é", "日"]
+    return sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))) for _ in range(count)})
+
+
+@pytest.mark.parametrize("layout", ["many-dirs", "few-dirs", "flat", "random", "random-prefix"])
+def test_scan_covers_every_key_exactly_once(layout):
+    async def scenario():
+        with FakeBackend() as backend:
+            prefix = ""
+            if layout == "many-dirs":
+                backend.state.add_synthetic_bucket("b", 5000, keys_per_dir=1)
+                expected = synthetic_keys(5000, keys_per_dir=1)
+            elif layout == "few-dirs":
+                backend.state.add_synthetic_bucket("b", 25000)
+                expected = synthetic_keys(25000)
+            else:
+                backend.state.add_bucket("b")
+                if layout == "flat":
+                    keys = [f"{i:06d}" for i in range(5000)]
+                elif layout == "random":
+                    keys = random_keys(8000, seed=1)
+                else:
+                    prefix = "a/"
+                    keys = sorted(set(random_keys(4000, seed=2)) | {prefix + k for k in random_keys(4000, seed=3)})
+                for key in keys:
+                    backend.state.buckets["b"].put(key, b"")
+                expected = [k for k in keys if k.startswith(prefix)]
+
+            client = make_client(backend)
+            pages = []
+            try:
+                # Shard straight after the first page, to put as many shard boundaries to the test as possible
+                shards = await client.scan_objects(
+                    "b",
+                    lambda index, objects: pages.append((index, [o.key for o in objects])),
+                    prefix=prefix,
+                    serial_pages=1
+                )
+            finally:
+                await client.close()
+            return expected, pages, shards
+
+    expected, pages, shards = asyncio.run(scenario())
+    assert len(expected) > 1000
+    assert shards > 2
+    listed = [key for _, page in sorted(pages, key=lambda item: item[0]) for key in page]
+    assert len(listed) == len(set(listed))
+    assert listed == expected
+
+
+@pytest.mark.parametrize("keys, requests", [(1500, 2), (3000, 3), (20000, 30)])
+def test_scan_request_count_scales_with_bucket_size(keys, requests):
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", keys)
+            client = make_client(backend)
+            try:
+                size = await client.calculate_bucket_size("b")
+            finally:
+                await client.close()
+            return size, backend.state.requests
+
+    size, sent = asyncio.run(scenario())
+    assert size[1] == keys
+    # The first ZADARA_LIST_SHARD_AFTER_PAGES pages are listed serially, so small
+    # buckets cost no more than a serial listing and medium ones only a few extra pages
+    assert sent <= requests
+
+
+def nested_keys() -> list:
+    # Top-level files between directories of varying size, some with nested subdirectories
+    keys = [f"file-{i:04d}" for i in range(0, 3000, 3)]
+    for d in range(300):
+        keys += [f"dir-{d:03d}/obj-{j}" for j in range(d % 7 + 1)]
+        if d % 5 == 0:
+            keys += [f"dir-{d:03d}/sub/obj-{j}" for j in range(3)]
+    return sorted(keys)
+
+
+def delimiter_listing(keys: list) -> list:
+    """What a complete listing with delimiter "/" holds, in key order"""
+    entries = {k.split("/")[0] + "/" if "/" in k else k for k in keys}
+    return sorted(entries)
+
+
+@pytest.mark.parametrize("budget", [
+    {"max_bytes": 2000},
+    {"max_bytes": 9000, "auto_paginate": True},
+    {"max_keys": 7},
+    {"max_keys": 250, "max_bytes": 30000, "auto_paginate": True}
+])
+def test_cursor_resumes_delimited_listing_under_budget(monkeypatch, budget):
+    keys = nested_keys()
+
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_bucket("b")
+            for key in keys:
+                backend.state.buckets["b"].put(key, b"x")
+            monkeypatch.setattr(server, "client", make_client(backend))
+            pages = []
+            arguments = {"bucket_name": "b", "delimiter": "/", **budget}
+            try:
+                while True:
+                    page = await server.object_list_objects(arguments)
+                    pages.append(page)
+                    if not page["IsTruncated"]:
+                        break
+                    arguments["cursor"] = page["NextCursor"]
+                    assert len(pages) < 5000
+            finally:
+                await server.client.close()
+            return pages
+
+    pages = asyncio.run(scenario())
+    assert len(pages) > 2
+    listed = []
+    for page in pages:
+        entries = sorted([o["Key"] for o in page["Objects"]] + page["CommonPrefixes"])
+        listed += entries
+        if "max_keys" in budget:
+            assert len(entries) <= budget["max_keys"]
+        if "max_bytes" in budget:
+            records = [server.ObjectRecord(*o.values()) for o in page["Objects"]]
+            used = sum(server.record_json_size(r) for r in records) + sum(len(p) + 4 for p in page["CommonPrefixes"])
+            assert used <= budget["max_bytes"] or len(entries) == 1
+    # Every file and directory once, in order, across pages and mid-page cuts
+    assert listed == delimiter_listing(keys)
@@ -0,0 +1,61 @@
+"""Multipart upload part layout"""
+
+import asyncio
+
+from server import MULTIPART_MAX_PARTS, MULTIPART_PART_SIZE, ZadaraClient, multipart_layout
+
+GiB = 1024 ** 3
+
+
+def test_layout_keeps_requested_part_size_when_it_fits():
+    assert multipart_layout(20 * 1024 * 1024, 8 * 1024 * 1024) == (8 * 1024 * 1024, 3)
+    assert multipart_layout(0, MULTIPART_PART_SIZE) == (MULTIPART_PART_SIZE, 1)
+
+
+def test_layout_grows_part_size_above_max_parts():
+    # 8 MB parts would need 12,800 parts for 100 GiB
+    size = 100 * GiB
+    part_size, part_count = multipart_layout(size, 8 * 1024 * 1024)
+    assert part_count <= MULTIPART_MAX_PARTS
+    assert part_size * part_count >= size
+    assert part_size * (part_count - 1) < size
+
+
+def test_multipart_upload_of_large_object_stays_within_part_limit():
+    async def scenario():
+        client = ZadaraClient()
+        size = 5 * 1024 * GiB  # the S3 object size limit
+        parts = []
+
+        async def create(bucket_name, object_key, content_type):
+            return "upload-1"
+
+        async def upload_part(bucket_name, object_key, upload_id, part_number, data):
+            parts.append((part_number, data))
+            return f"etag-{part_number}"
+
+        async def complete(bucket_name, object_key, upload_id, etags):
+            class Response:
+                status_code = 200
+                headers = {}
+            return Response()
+
+        async def read_part(offset, length):
+            # Only the layout matters here: stand in a (offset, length) pair for the bytes
+            return offset, length
+
+        client.create_multipart_upload = create
+        client.upload_part = upload_part
+        client.complete_multipart_upload = complete
+        result = await client.multipart_upload("bucket", "huge.bin", size, read_part, concurrency=64)
+
+        parts.sort()
+        assert result["parts"] == len(parts) <= MULTIPART_MAX_PARTS
+        assert [number for number, _ in parts] == list(range(1, len(parts) + 1))
+        offset = 0
+        for _, (part_offset, length) in parts:
+            assert part_offset == offset and length > 0
+            offset += length
+        assert offset == size
+
+    asyncio.run(scenario())
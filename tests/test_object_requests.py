@@ -0,0 +1,70 @@
+"""Object Storage single-flight GETs around writes"""
+
+import asyncio
+import json
+
+import httpx
+
+from server import ZadaraClient
+
+
+class FakeObjectHTTP:
+    """Stands in for the Object Storage HTTP client: a bucket policy, with GETs held until released"""
+
+    def __init__(self):
+        self.policy = {"Statement": []}
+        self.gets = 0
+        self.release = asyncio.Event()
+
+    async def request(self, method, url, **kwargs):
+        if method == "GET":
+            self.gets += 1
+            snapshot = json.loads(json.dumps(self.policy))
+            await self.release.wait()
+            return httpx.Response(200, json=snapshot, request=httpx.Request(method, url))
+        self.policy = json.loads(kwargs["content"])
+        return httpx.Response(204, request=httpx.Request(method, url))
+
+
+def make_client(http: FakeObjectHTTP) -> ZadaraClient:
+    client = ZadaraClient()
+    client.object_storage_url = "http://s3.test"
+    client._http = lambda endpoint: http
+    return client
+
+
+def test_get_after_write_does_not_join_earlier_get():
+    async def scenario():
+        http = FakeObjectHTTP()
+        client = make_client(http)
+        before = asyncio.ensure_future(client.object_storage_request("GET", "/b", params={"policy": None}))
+        while http.gets == 0:
+            await asyncio.sleep(0)
+        await client.object_storage_request("PUT", "/b", data={"Statement": ["allow"]}, params={"policy": None})
+        after = asyncio.ensure_future(client.object_storage_request("GET", "/b", params={"policy": None}))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        http.release.set()
+        assert (await before)["Statement"] == []
+        assert (await after)["Statement"] == ["allow"]
+        assert http.gets == 2
+
+    asyncio.run(scenario())
+
+
+def test_write_to_another_bucket_keeps_gets_coalesced():
+    async def scenario():
+        http = FakeObjectHTTP()
+        client = make_client(http)
+        first = asyncio.ensure_future(client.object_storage_request("GET", "/b", params={"policy": None}))
+        while http.gets == 0:
+            await asyncio.sleep(0)
+        await client.object_storage_request("PUT", "/other/key", data={"Statement": ["x"]})
+        second = asyncio.ensure_future(client.object_storage_request("GET", "/b", params={"policy": None}))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        http.release.set()
+        await asyncio.gather(first, second)
+        assert http.gets == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+"""Retry classification and the adaptive (AIMD) concurrency limit against the stand-in backend"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import server
+from fake_backends import FakeBackend
+
+
+def make_client(backend: FakeBackend, limit: int = 8) -> server.ZadaraClient:
+    client = server.ZadaraClient()
+    client.object_storage_url = backend.url
+    client.object_access_key = "test-access"
+    client.object_secret_key = "test-secret"
+    client.limiters["object"] = server.AdaptiveLimiter(limit, min_limit=1)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(server, "RETRY_BASE_DELAY", 0)
+
+
+def test_slowdown_halves_the_limit_and_successes_restore_it():
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            limiter = client.limiters["object"]
+            try:
+                backend.state.inject_faults(503)
+                page = await client.list_objects_page("b")
+                after_throttle = (limiter.limit, limiter.decreases, backend.state.requests)
+                successes = 0
+                while limiter.limit < limiter.max_limit:
+                    await client.list_objects_page("b")
+                    successes += 1
+                    assert successes < 100
+            finally:
+                await client.close()
+            return page, after_throttle, successes, limiter
+
+    page, (limit, decreases, requests), successes, limiter = asyncio.run(scenario())
+    # The SlowDown was retried and the listing succeeded
+    assert len(page["objects"]) == 10
+    assert requests == 2
+    # Halved by the 503 (the retry's success then adds 1/limit)
+    assert decreases == 1
+    assert 4 <= limit < 5
+    # Additive increase: about one step per round of `limit` successes back to 8
+    assert 15 <= successes <= 30
+    assert limiter.limit == limiter.max_limit
+
+
+def test_one_burst_of_throttling_halves_the_limit_once():
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            limiter = client.limiters["object"]
+            try:
+                # Four concurrent requests all started before the first 503 arrived
+                backend.state.inject_faults(503, 503, 503, 503)
+                await asyncio.gather(*(client.list_objects_page("b") for _ in range(4)))
+            finally:
+                await client.close()
+            return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.throttled == 4
+    assert limiter.decreases == 1
+
+
+@pytest.mark.parametrize("status", [400, 403, 404, 409])
+def test_client_errors_are_not_retried(status):
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            try:
+                backend.state.inject_faults(status)
+                with pytest.raises(httpx.HTTPStatusError) as failure:
+                    await client.list_objects_page("b")
+            finally:
+                await client.close()
+            return failure.value, backend.state.requests, client.limiters["object"]
+
+    error, requests, limiter = asyncio.run(scenario())
+    assert error.response.status_code == status
+    assert requests == 1
+    assert limiter.decreases == 0
+
+
+@pytest.mark.parametrize("status, attempts", [(500, 1), (502, 1), (503, 2), (429, 2)])
+def test_non_idempotent_requests_retry_only_throttling(status, attempts):
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            url = client._object_url("/b", {"delete": None})
+            try:
+                backend.state.inject_faults(status)
+                try:
+                    await client._request("object", "POST", url, content=b"")
+                except httpx.HTTPStatusError as e:
+                    assert e.response.status_code == status
+            finally:
+                await client.close()
+            return backend.state.requests
+
+    # A POST that failed with a 5xx may have been applied, so only "slow down" is retried
+    assert asyncio.run(scenario()) == attempts
+
+
+def test_idempotent_requests_retry_server_errors_up_to_the_attempt_limit():
+    async def scenario():
+        with FakeBackend() as backend:
+            backend.state.add_synthetic_bucket("b", 10)
+            client = make_client(backend)
+            try:
+                backend.state.inject_faults(*[500] * server.RETRY_MAX_ATTEMPTS, 500)
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.list_objects_page("b")
+            finally:
+                await client.close()
+            return backend.state.requests
+
+    assert asyncio.run(scenario()) == server.RETRY_MAX_ATTEMPTS
@@ -0,0 +1,100 @@
+"""VPSA response cache and single-flight behaviour around writes"""
+
+import asyncio
+
+from server import ResponseCache, ZadaraClient
+
+
+class FakeVPSA:
+    """Stands in for ZadaraClient._vpsa_send: a volume list, with GETs held until released"""
+
+    def __init__(self):
+        self.volumes = ["v1"]
+        self.gets = 0
+        self.release = asyncio.Event()
+
+    async def send(self, method, endpoint, data, params):
+        if method == "GET":
+            self.gets += 1
+            snapshot = list(self.volumes)
+            await self.release.wait()
+            return {"volumes": snapshot}
+        self.volumes.append(data["name"])
+        return {"status": "ok"}
+
+
+def make_client(vpsa: FakeVPSA) -> ZadaraClient:
+    client = ZadaraClient()
+    client.vpsa_base_url = "http://vpsa.test"
+    client.vpsa_api_key = "test"
+    client._vpsa_send = vpsa.send
+    return client
+
+
+def test_get_in_flight_during_write_is_not_cached():
+    async def scenario():
+        vpsa = FakeVPSA()
+        client = make_client(vpsa)
+        before = asyncio.ensure_future(client.vpsa_request("GET", "volumes.json"))
+        while vpsa.gets == 0:
+            await asyncio.sleep(0)
+        await client.vpsa_request("POST", "volumes.json", data={"name": "v2"})
+        vpsa.release.set()
+        assert (await before)["volumes"] == ["v1"]
+        # The pre-write response must not be served for the rest of the TTL
+        assert (await client.vpsa_request("GET", "volumes.json"))["volumes"] == ["v1", "v2"]
+        assert (await client.vpsa_request("GET", "volumes.json"))["volumes"] == ["v1", "v2"]
+        assert vpsa.gets == 2
+
+    asyncio.run(scenario())
+
+
+def test_get_after_write_does_not_join_earlier_get():
+    async def scenario():
+        vpsa = FakeVPSA()
+        client = make_client(vpsa)
+        before = asyncio.ensure_future(client.vpsa_request("GET", "volumes.json"))
+        while vpsa.gets == 0:
+            await asyncio.sleep(0)
+        await client.vpsa_request("POST", "volumes.json", data={"name": "v2"})
+        after = asyncio.ensure_future(client.vpsa_request("GET", "volumes.json"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        vpsa.release.set()
+        assert (await before)["volumes"] == ["v1"]
+        assert (await after)["volumes"] == ["v1", "v2"]
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_gets_are_coalesced():
+    async def scenario():
+        vpsa = FakeVPSA()
+        client = make_client(vpsa)
+        calls = [asyncio.ensure_future(client.vpsa_request("GET", "volumes.json")) for _ in range(5)]
+        while vpsa.gets == 0:
+            await asyncio.sleep(0)
+        vpsa.release.set()
+        results = await asyncio.gather(*calls)
+        assert all(result["volumes"] == ["v1"] for result in results)
+        assert vpsa.gets == 1
+
+    asyncio.run(scenario())
+
+
+def test_cache_put_skipped_after_invalidation():
+    cache = ResponseCache(max_entries=8)
+    generation = cache.generation("volumes")
+    cache.invalidate("volumes")
+    cache.put(("volumes", "a"), "stale", ttl=60, generation=generation)
+    assert cache.get(("volumes", "a")) is None
+
+    generation = cache.generation("pools")
+    cache.invalidate("volumes")
+    cache.put(("pools", "a"), "fresh", ttl=60, generation=generation)
+    assert cache.get(("pools", "a")) == "fresh"
+
+    generation = cache.generation("pools")
+    cache.invalidate()
+    cache.put(("pools", "b"), "stale", ttl=60, generation=generation)
+    assert cache.get(("pools", "b")) is None